@@ -1,15 +1,43 @@
 import os
 import logging
+import math
 import re
 import time
+import random
 import secrets
+import threading
 import hashlib
+import hmac
+import functools
+import base64
+import binascii
+import json
+import csv
+import gzip
+import io
 from datetime import datetime, timedelta
+from urllib.parse import quote
 import pytz
-from flask import Flask, render_template, request, jsonify, session
+import click
+from flask import Blueprint, Flask, Response, current_app, render_template, request, jsonify, session, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from markupsafe import Markup
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
+from session_store import create_session_store
+from leaderboard_cache import LeaderboardCache
+from practice_texts import PracticeTextCorpus
+from rate_limit import RateLimiter, create_rate_limit_storage, too_many_requests
+from metrics import Metrics
+from write_behind import RecordSpool, WriteBehindWriter
+from leaderboard_stream import CLOSED, LeaderboardBroadcaster, format_event
+from typing_replay import KeylogError, score_keylog
+from db_routing import READ_BIND, ReadRouter, RoutingSession, pool_stats, read_only, reading
+from api_encoding import ResponseCompressor, columnar, json_response
+from assets import ASSETS, AssetPipeline, asset_url, build_assets
+from fragment_cache import FragmentCache
+import typing_anomaly
+import synthetic_records
 
 # 디버그 로깅 설정
 logging.basicConfig(level=logging.DEBUG)
@@ -17,52 +45,46 @@ logging.basicConfig(level=logging.DEBUG)
 class Base(DeclarativeBase):
     pass
 
-# 데이터베이스 초기화
-db = SQLAlchemy(model_class=Base)
+# 데이터베이스 초기화 (읽기 전용 라우트의 SELECT는 DATABASE_READ_URL이 있으면 읽기 엔진으로)
+db = SQLAlchemy(model_class=Base, session_options={'class_': RoutingSession})
 
-# Flask 앱 초기화
-app = Flask(__name__)
-app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-for-development")
-app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
-
-# 데이터베이스 설정
-database_url = os.environ.get("DATABASE_URL")
-
-# DB URL 처리 및 연결 최적화
-if database_url:
-    # postgres://를 postgresql://로 변경
-    if database_url.startswith("postgres://"):
-        database_url = database_url.replace("postgres://", "postgresql://", 1)
-    elif database_url.startswith("https://"):
-        logging.warning("DATABASE_URL이 HTTPS 형식입니다. PostgreSQL 연결 문자열이 필요합니다.")
-        logging.warning("Supabase에서 올바른 Database URL을 복사해주세요.")
-
-app.config["SQLALCHEMY_DATABASE_URI"] = database_url
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-    "pool_timeout": 10,
-    "pool_size": 5,
-    "max_overflow": 0,
-    "connect_args": {
-        "connect_timeout": 10,
-        "options": "-c statement_timeout=30000"
-    }
-}
-
-# 데이터베이스 초기화
-db.init_app(app)
+# 라우트 (create_app()에서 앱에 등록)
+bp = Blueprint('main', __name__)
 
 # 관리자 계정 설정
 ADMIN_USER = os.environ.get("ADMIN_USER", "admin")
-ADMIN_PASS = os.environ.get("ADMIN_PASS", "admin")
+ADMIN_PASS = os.environ.get("ADMIN_PASS")  # 설정하지 않으면 관리 API를 모두 막음
 
 # 보안 설정
 RATE_LIMIT_WINDOW = 300  # 5분 창
 MAX_SUBMISSIONS_PER_WINDOW = 3  # 5분당 최대 3번 제출
-submission_log = {}  # {student_id: [(timestamp, ip), ...]}
-typing_sessions = {}  # {session_id: {'keystrokes': [], 'start_time': timestamp}}
+KEYSTROKE_RATE_LIMIT = (1200, 60)  # 단건 키 입력: 분당 1200회 (초당 20타)
+KEYSTROKE_BATCH_RATE_LIMIT = (120, 60)  # 키 입력 배치: 분당 120회
+PRACTICE_TEXT_RATE_LIMIT = (60, 60)  # 연습 텍스트: 분당 60회
+# 요청 빈도 제한 카운터 저장소 (지정하지 않으면 세션 저장소와 같은 곳을 사용)
+rate_limiter = RateLimiter(
+    create_rate_limit_storage(os.environ.get("RATE_LIMIT_STORAGE_URL") or os.environ.get("SESSION_STORE_URL")),
+    enabled=os.environ.get("RATE_LIMIT_ENABLED", "1") == "1"
+)
+# 타이핑 세션 저장소 (여러 워커가 공유하려면 sqlite:/// 또는 redis:// 지정)
+session_store = create_session_store(
+    os.environ.get("SESSION_STORE_URL"),
+    ttl=int(os.environ.get("SESSION_TTL", 3600)),  # 마지막 사용 후 1시간 뒤 만료
+    max_entries=int(os.environ.get("SESSION_MAX_ENTRIES", 10000)),
+    max_bytes=int(os.environ.get("SESSION_MAX_BYTES", 64 * 1024 * 1024))
+)
+# 요청 중 분할 정리 외에 백그라운드 정리 스레드 사용 (선택)
+if os.environ.get("SESSION_SWEEPER") == "1":
+    session_store.start_sweeper()
+
 MIN_KEYSTROKES = 100  # 최소 키 입력 수
+MAX_KEYSTROKE_BATCH = 500  # 배치 1회당 최대 키 입력 수
+MAX_KEYSTROKE_GAP_MS = 600000  # 연속 키 입력 간 최대 간격 (10분)
+KEYSTROKE_CLOCK_SLACK = 2.0  # 세션 시작 시각 이전 타임스탬프 허용 오차 (초)
+PRACTICE_DURATION_SEC = 300  # 연습 시간 (클라이언트 타이머, 재생 채점의 WPM 기준)
+REQUIRE_KEYLOG = os.environ.get("REQUIRE_KEYLOG") == "1"  # 키 입력 기록 없는 제출 거부
+# 제출 시 입력 간격 이상 패턴 검사 (log: 경고 로그만, reject: 저장 거부, 지정하지 않으면 검사 안 함 - numpy 필요)
+TYPING_ANOMALY_CHECK = os.environ.get("TYPING_ANOMALY_CHECK", "")
 
 # 학생 ID 검증용 정규식
 ID_PATTERN = re.compile(r"^\d{5}\s[가-힣]{2,4}$")
@@ -89,6 +111,17 @@ class Record(db.Model):
     duration_sec = db.Column(db.Integer, nullable=False)
     created_at = db.Column(db.DateTime, default=get_kst_now)
     
+    # 랭킹 정렬 순서와 같은 복합 인덱스 (PostgreSQL은 나머지 표시 열까지 포함하는 커버링 인덱스)
+    __table_args__ = (
+        db.Index(
+            'ix_records_mode_ranking',
+            mode, score.desc(), accuracy.desc(), wpm.desc(), created_at.asc(), id.asc(),
+            postgresql_include=['student_id', 'duration_sec']
+        ),
+        # 학생별 기록 이력 (최신순)
+        db.Index('ix_records_student_mode_created', student_id, mode, created_at),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -101,6 +134,430 @@ class Record(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+# Record.to_dict()와 같은 열 순서 (행 튜플로 직접 조회할 때 사용)
+RECORD_COLUMNS = ('id', 'student_id', 'mode', 'wpm', 'accuracy', 'score', 'duration_sec', 'created_at')
+
+class CacheVersion(db.Model):
+    """워커 간 캐시 일관성을 위한 버전 번호 (이름별로 데이터가 바뀔 때마다 증가)"""
+    __tablename__ = 'cache_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+def bump_cache_version(name):
+    """현재 트랜잭션 안에서 버전 번호를 올리고 새 번호 반환 (커밋은 호출자가 수행)"""
+    result = db.session.execute(
+        db.update(CacheVersion).where(CacheVersion.name == name).values(version=CacheVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.session.add(CacheVersion(name=name, version=1))
+        db.session.flush()
+        return 1
+    return db.session.execute(
+        db.select(CacheVersion.version).where(CacheVersion.name == name)
+    ).scalar_one()
+
+class RecordStats(db.Model):
+    """기록 통계 요약 (scope: 'all' 또는 연습 모드) - 기록 저장과 같은 트랜잭션에서 갱신"""
+    __tablename__ = 'record_stats'
+    
+    scope = db.Column(db.String(10), primary_key=True)
+    total_records = db.Column(db.Integer, nullable=False, default=0)
+    total_students = db.Column(db.Integer, nullable=False, default=0)
+    sum_wpm = db.Column(db.BigInteger, nullable=False, default=0)
+    sum_accuracy = db.Column(db.Float, nullable=False, default=0)
+
+class RecordWpmHistogram(db.Model):
+    """scope별 WPM 분포 (WPM 값마다 기록 수) - 백분위수 계산용"""
+    __tablename__ = 'record_wpm_histogram'
+    
+    scope = db.Column(db.String(10), primary_key=True)
+    wpm = db.Column(db.Integer, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class RecordArchive(db.Model):
+    """보관된 기록 (records에서 옮긴 원본 행, id 유지)"""
+    __tablename__ = 'records_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    student_id = db.Column(db.String(20), nullable=False)
+    mode = db.Column(db.String(10), nullable=False)
+    wpm = db.Column(db.Integer, nullable=False)
+    accuracy = db.Column(db.Float, nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+    duration_sec = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=get_kst_now)
+    
+    __table_args__ = (
+        db.Index('ix_records_archive_student_mode_created', student_id, mode, created_at),
+    )
+
+class RecordArchiveRollup(db.Model):
+    """학생별/모드별 보관 기록 요약 - 보관 후에도 전체 기간 통계와 최고 기록 재계산에 사용"""
+    __tablename__ = 'record_archive_rollups'
+    
+    student_id = db.Column(db.String(20), primary_key=True)
+    mode = db.Column(db.String(10), primary_key=True)
+    record_count = db.Column(db.Integer, nullable=False, default=0)
+    sum_wpm = db.Column(db.BigInteger, nullable=False, default=0)
+    sum_accuracy = db.Column(db.Float, nullable=False, default=0)
+    best_record_id = db.Column(db.Integer, nullable=False)
+    best_wpm = db.Column(db.Integer, nullable=False)
+    best_accuracy = db.Column(db.Float, nullable=False)
+    best_score = db.Column(db.Integer, nullable=False)
+    best_created_at = db.Column(db.DateTime)
+    first_created_at = db.Column(db.DateTime)
+    last_created_at = db.Column(db.DateTime)
+
+class RecordArchiveWpmHistogram(db.Model):
+    """모드별 보관 기록의 WPM 분포"""
+    __tablename__ = 'record_archive_wpm_histogram'
+    
+    mode = db.Column(db.String(10), primary_key=True)
+    wpm = db.Column(db.Integer, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+STATS_SCOPE_ALL = 'all'
+
+def increment_row(model, keys, **increments):
+    """keys로 찾은 행의 열을 더하고, 행이 없으면 새로 만듦"""
+    conditions = [getattr(model, name) == value for name, value in keys.items()]
+    result = db.session.execute(
+        db.update(model).where(*conditions).values(
+            **{name: getattr(model, name) + amount for name, amount in increments.items()}
+        )
+    )
+    if result.rowcount == 0:
+        db.session.add(model(**keys, **increments))
+        db.session.flush()
+
+def update_record_stats(record):
+    """새 기록을 통계 요약에 반영 (update_personal_best보다 먼저, 커밋은 호출자가 수행)"""
+    # 처음 기록을 남긴 학생인지 확인 (전체 / 모드별) - 최고 기록 테이블에는 보관된 기록의 학생도 남아 있음
+    best_modes = db.session.execute(
+        db.select(PersonalBest.mode).where(PersonalBest.student_id == record.student_id)
+    ).scalars().all()
+    new_student = {
+        STATS_SCOPE_ALL: not best_modes,
+        record.mode: record.mode not in best_modes
+    }
+    
+    for scope, is_new_student in new_student.items():
+        increment_row(
+            RecordStats, {'scope': scope},
+            total_records=1,
+            total_students=1 if is_new_student else 0,
+            sum_wpm=record.wpm,
+            sum_accuracy=record.accuracy
+        )
+        increment_row(RecordWpmHistogram, {'scope': scope, 'wpm': record.wpm}, count=1)
+
+def rebuild_record_stats():
+    """records 테이블과 보관 기록 요약에서 통계 요약을 다시 계산 (커밋은 호출자가 수행)"""
+    RecordWpmHistogram.query.delete()
+    RecordStats.query.delete()
+    
+    # 모드별 기록 수/합계 = 남아 있는 기록 + 보관된 기록 요약
+    live = db.session.query(
+        Record.mode, db.func.count(Record.id),
+        db.func.coalesce(db.func.sum(Record.wpm), 0), db.func.coalesce(db.func.sum(Record.accuracy), 0)
+    ).group_by(Record.mode).all()
+    archived = db.session.query(
+        RecordArchiveRollup.mode, db.func.sum(RecordArchiveRollup.record_count),
+        db.func.sum(RecordArchiveRollup.sum_wpm), db.func.sum(RecordArchiveRollup.sum_accuracy)
+    ).group_by(RecordArchiveRollup.mode).all()
+    totals = {STATS_SCOPE_ALL: [0, 0, 0.0]}
+    for mode, total_records, sum_wpm, sum_accuracy in live + archived:
+        for scope in (STATS_SCOPE_ALL, mode):
+            entry = totals.setdefault(scope, [0, 0, 0.0])
+            entry[0] += total_records
+            entry[1] += int(sum_wpm)
+            entry[2] += float(sum_accuracy)
+    
+    # 학생 수 - 두 곳에 모두 있는 학생은 한 번만
+    students = db.union(
+        db.select(Record.student_id, Record.mode),
+        db.select(RecordArchiveRollup.student_id, RecordArchiveRollup.mode)
+    ).subquery()
+    total_students = dict(db.session.query(students.c.mode, db.func.count()).group_by(students.c.mode).all())
+    total_students[STATS_SCOPE_ALL] = db.session.query(db.func.count(db.distinct(students.c.student_id))).scalar()
+    
+    for scope, (total_records, sum_wpm, sum_accuracy) in totals.items():
+        db.session.add(RecordStats(
+            scope=scope, total_records=total_records, total_students=total_students.get(scope, 0),
+            sum_wpm=sum_wpm, sum_accuracy=sum_accuracy
+        ))
+    
+    histogram = {}
+    rows = db.session.query(Record.mode, Record.wpm, db.func.count(Record.id)).group_by(Record.mode, Record.wpm).all()
+    rows += db.session.query(
+        RecordArchiveWpmHistogram.mode, RecordArchiveWpmHistogram.wpm, RecordArchiveWpmHistogram.count
+    ).all()
+    for mode, wpm, count in rows:
+        for scope in (STATS_SCOPE_ALL, mode):
+            histogram[(scope, wpm)] = histogram.get((scope, wpm), 0) + count
+    for (scope, wpm), count in histogram.items():
+        db.session.add(RecordWpmHistogram(scope=scope, wpm=wpm, count=count))
+    db.session.flush()
+
+def histogram_percentile(histogram, total, percent):
+    """정렬된 (wpm, count) 분포에서 백분위수 계산 (nearest-rank)"""
+    if total == 0:
+        return 0
+    rank = max(1, -(-total * percent // 100))
+    cumulative = 0
+    for wpm, count in histogram:
+        cumulative += count
+        if cumulative >= rank:
+            return wpm
+    return histogram[-1][0]
+
+def read_leaderboard_versions():
+    """모드별 랭킹 데이터 버전 조회"""
+    rows = db.session.execute(
+        db.select(CacheVersion.name, CacheVersion.version).where(CacheVersion.name.like('leaderboard:%'))
+    ).all()
+    return {name.split(':', 1)[1]: version for name, version in rows}
+
+# 랭킹 정렬 순서 (점수 desc, 정확도 desc, WPM desc, 날짜 asc, 동점 시 id asc)
+# 날짜가 없는 기록은 DB와 무관하게 맨 뒤 (SQLite는 NULL을 앞에, PostgreSQL은 뒤에 두므로 명시,
+# PostgreSQL 기본 인덱스 순서와 같음)
+LEADERBOARD_ORDER = (
+    Record.score.desc(), Record.accuracy.desc(), Record.wpm.desc(),
+    Record.created_at.asc().nulls_last(), Record.id.asc()
+)
+
+def leaderboard_query(mode):
+    """모드별 랭킹 정렬 쿼리 (ix_records_mode_ranking 인덱스 순서와 동일)"""
+    return Record.query.filter_by(mode=mode).order_by(*LEADERBOARD_ORDER)
+
+def encode_cursor(record):
+    """랭킹 위치를 불투명한 커서 문자열로 변환"""
+    key = [record.score, record.accuracy, record.wpm,
+           record.created_at.isoformat() if record.created_at else None, record.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """커서 문자열을 랭킹 정렬 키로 복원 (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        score, accuracy, wpm, created_at, record_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (int(score), float(accuracy), int(wpm),
+                datetime.fromisoformat(created_at) if created_at else None, int(record_id))
+    except Exception:
+        raise ValueError('잘못된 커서입니다.')
+
+def after_cursor(cursor):
+    """커서 다음 순위의 기록만 고르는 조건 (키셋 페이지네이션)"""
+    score, accuracy, wpm, created_at, record_id = decode_cursor(cursor)
+    same_wpm = db.and_(Record.score == score, Record.accuracy == accuracy, Record.wpm == wpm)
+    # 날짜가 없는 기록은 같은 점수 안에서 맨 뒤 (LEADERBOARD_ORDER의 nulls_last와 같게)
+    if created_at is None:
+        tail = db.and_(same_wpm, Record.created_at.is_(None), Record.id > record_id)
+    else:
+        tail = db.and_(same_wpm, db.or_(
+            Record.created_at > created_at,
+            db.and_(Record.created_at == created_at, Record.id > record_id),
+            Record.created_at.is_(None)
+        ))
+    # score <= 조건은 중복이지만 인덱스 범위 탐색의 시작점이 되어 앞 순위를 건너뛰게 함
+    return db.and_(
+        Record.score <= score,
+        db.or_(
+            Record.score < score,
+            db.and_(Record.score == score, Record.accuracy < accuracy),
+            db.and_(Record.score == score, Record.accuracy == accuracy, Record.wpm < wpm),
+            tail
+        )
+    )
+
+def load_top_records(mode, size):
+    """모드별 상위 기록을 DB에서 조회"""
+    return [record.to_dict() for record in leaderboard_query(mode).limit(size).all()]
+
+class PersonalBest(db.Model):
+    """학생별/모드별 최고 기록 (랭킹 정렬 기준) - 기록 저장과 같은 트랜잭션에서 갱신"""
+    __tablename__ = 'personal_bests'
+    
+    student_id = db.Column(db.String(20), primary_key=True)
+    mode = db.Column(db.String(10), primary_key=True)
+    record_id = db.Column(db.Integer, nullable=False)
+    wpm = db.Column(db.Integer, nullable=False)
+    accuracy = db.Column(db.Float, nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime)
+    record_count = db.Column(db.Integer, nullable=False, default=0)  # 이 모드의 전체 기록 수
+    
+    # 모드별 학생 순위 계산용 (랭킹 정렬 순서와 동일)
+    __table_args__ = (
+        db.Index(
+            'ix_personal_bests_mode_ranking',
+            mode, score.desc(), accuracy.desc(), wpm.desc(), created_at.asc(), record_id.asc()
+        ),
+    )
+    
+    def to_dict(self):
+        return {
+            'mode': self.mode,
+            'record_id': self.record_id,
+            'wpm': self.wpm,
+            'accuracy': self.accuracy,
+            'score': self.score,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'record_count': self.record_count
+        }
+
+PERSONAL_BEST_ORDER = (
+    PersonalBest.score.desc(), PersonalBest.accuracy.desc(), PersonalBest.wpm.desc(),
+    PersonalBest.created_at.asc().nulls_last(), PersonalBest.record_id.asc()
+)
+
+def ranking_key(score, accuracy, wpm, created_at, record_id):
+    """랭킹 정렬 키 (작을수록 높은 순위, 날짜가 없으면 같은 점수 안에서 맨 뒤)"""
+    return (-score, -accuracy, -wpm, created_at is None, created_at or datetime.min, record_id)
+
+def update_personal_best(record):
+    """새 기록을 학생의 모드별 최고 기록에 반영 (커밋은 호출자가 수행)"""
+    best = db.session.get(PersonalBest, (record.student_id, record.mode))
+    if best is None:
+        db.session.add(PersonalBest(
+            student_id=record.student_id, mode=record.mode, record_id=record.id,
+            wpm=record.wpm, accuracy=record.accuracy, score=record.score,
+            created_at=record.created_at, record_count=1
+        ))
+        db.session.flush()
+        return
+    
+    best.record_count += 1
+    if ranking_key(record.score, record.accuracy, record.wpm, record.created_at, record.id) < \
+            ranking_key(best.score, best.accuracy, best.wpm, best.created_at, best.record_id):
+        best.record_id = record.id
+        best.wpm = record.wpm
+        best.accuracy = record.accuracy
+        best.score = record.score
+        best.created_at = record.created_at
+
+def rebuild_personal_bests():
+    """records 테이블과 보관 기록 요약에서 최고 기록을 다시 계산 - INSERT ... SELECT 한 번 (커밋은 호출자가 수행)"""
+    PersonalBest.query.delete()
+    # 남아 있는 기록은 한 건씩, 보관된 기록은 요약의 최고 기록과 기록 수로 후보에 넣음
+    candidates = db.union_all(
+        db.select(
+            Record.student_id, Record.mode, Record.id.label('record_id'), Record.wpm, Record.accuracy,
+            Record.score, Record.created_at, db.literal(1).label('record_count')
+        ),
+        db.select(
+            RecordArchiveRollup.student_id, RecordArchiveRollup.mode, RecordArchiveRollup.best_record_id,
+            RecordArchiveRollup.best_wpm, RecordArchiveRollup.best_accuracy, RecordArchiveRollup.best_score,
+            RecordArchiveRollup.best_created_at, RecordArchiveRollup.record_count
+        )
+    ).subquery()
+    columns = candidates.c
+    partition = (columns.student_id, columns.mode)
+    ranked = db.select(
+        columns.student_id, columns.mode, columns.record_id, columns.wpm, columns.accuracy,
+        columns.score, columns.created_at,
+        db.func.row_number().over(partition_by=partition, order_by=(
+            columns.score.desc(), columns.accuracy.desc(), columns.wpm.desc(),
+            columns.created_at.asc().nulls_last(), columns.record_id.asc()
+        )).label('position'),
+        db.func.sum(columns.record_count).over(partition_by=partition).label('record_count')
+    ).subquery()
+    db.session.execute(db.insert(PersonalBest).from_select(
+        ['student_id', 'mode', 'record_id', 'wpm', 'accuracy', 'score', 'created_at', 'record_count'],
+        db.select(
+            ranked.c.student_id, ranked.c.mode, ranked.c.record_id, ranked.c.wpm, ranked.c.accuracy,
+            ranked.c.score, ranked.c.created_at, ranked.c.record_count
+        ).where(ranked.c.position == 1)
+    ))
+    db.session.flush()
+
+def load_student_ranks(student_id, modes):
+    """모드별 학생 순위 (최고 기록 기준, 윈도 함수) - {모드: (순위, 순위에 든 학생 수)}"""
+    ranked = db.select(
+        PersonalBest.student_id, PersonalBest.mode,
+        db.func.rank().over(partition_by=PersonalBest.mode, order_by=PERSONAL_BEST_ORDER).label('rank'),
+        db.func.count().over(partition_by=PersonalBest.mode).label('ranked_students')
+    ).where(PersonalBest.mode.in_(modes)).subquery()
+    rows = db.session.execute(
+        db.select(ranked.c.mode, ranked.c.rank, ranked.c.ranked_students).where(ranked.c.student_id == student_id)
+    ).all()
+    return {mode: (rank, ranked_students) for mode, rank, ranked_students in rows}
+
+# 모드별 상위 10개 랭킹 캐시 (저장 시 갱신, 다른 워커의 변경은 DB 버전으로 감지)
+leaderboard_cache = LeaderboardCache(
+    load_top_records, read_leaderboard_versions,
+    size=10, version_ttl=float(os.environ.get("LEADERBOARD_VERSION_TTL", 1.0))
+)
+
+class RecordSubmission(db.Model):
+    """write-behind로 저장된 기록의 스풀 티켓 (재시도 시 중복 저장 방지)"""
+    __tablename__ = 'record_submissions'
+    
+    ticket = db.Column(db.String(32), primary_key=True)
+    record_id = db.Column(db.Integer, nullable=False)
+
+def persist_records(records, tickets=None):
+    """검증된 기록 저장 - 통계 요약, 랭킹 버전, 랭킹 캐시까지 함께 갱신 후 커밋
+
+    tickets를 넘기면 기록과 같은 트랜잭션에 티켓을 남긴다.
+    """
+    for index, record in enumerate(records):
+        db.session.add(record)
+        db.session.flush()
+        # 통계 요약, 최고 기록, 랭킹 버전을 같은 트랜잭션에서 갱신 (다른 워커의 캐시도 무효화)
+        update_record_stats(record)
+        update_personal_best(record)
+        if tickets is not None:
+            db.session.add(RecordSubmission(ticket=tickets[index], record_id=record.id))
+    
+    by_mode = {}
+    for record in records:
+        by_mode.setdefault(record.mode, []).append(record)
+    versions = {mode: bump_cache_version(f'leaderboard:{mode}') for mode in by_mode}
+    db.session.commit()
+    
+    # 이 워커의 랭킹 캐시에 새 기록 반영
+    for mode, mode_records in by_mode.items():
+        leaderboard_cache.records_inserted(mode, [record.to_dict() for record in mode_records], versions[mode])
+    
+    # 랭킹 스트림 구독자에게 바로 알림 (다른 워커는 버전 폴링으로 감지)
+    broadcaster = current_app.extensions.get('leaderboard_stream')
+    if broadcaster is not None:
+        broadcaster.notify()
+
+def flush_spooled_records(items):
+    """스풀에서 꺼낸 기록 일괄 저장 (write-behind 작성기 스레드, 앱 컨텍스트 안에서) - {티켓: 기록 id} 반환"""
+    try:
+        tickets = [ticket for ticket, _ in items]
+        # 이전 시도에서 이미 저장된 티켓은 건너뜀
+        saved = dict(db.session.execute(
+            db.select(RecordSubmission.ticket, RecordSubmission.record_id)
+            .where(RecordSubmission.ticket.in_(tickets))
+        ).all())
+        pending = [(ticket, payload) for ticket, payload in items if ticket not in saved]
+        records = [
+            Record(
+                student_id=payload['student_id'],
+                mode=payload['mode'],
+                wpm=payload['wpm'],
+                accuracy=payload['accuracy'],
+                score=payload['score'],
+                duration_sec=payload['duration_sec'],
+                created_at=datetime.fromisoformat(payload['created_at'])
+            )
+            for _, payload in pending
+        ]
+        if records:
+            persist_records(records, [ticket for ticket, _ in pending])
+            logging.info(f'write-behind 저장 완료: {len(records)}건')
+        saved.update({ticket: record.id for (ticket, _), record in zip(pending, records)})
+        return saved
+    except Exception:
+        db.session.rollback()
+        raise
+
 # 연습 모드별 데이터
 PRACTICE_MODES = {
     '자리': {
@@ -129,23 +586,99 @@ PRACTICE_MODES = {
     }
 }
 
-@app.route('/')
+def make_etag(*parts):
+    """응답 ETag 생성 (헤더는 latin-1만 허용하므로 한글 모드명/사용자 입력은 해시로 변환)"""
+    return hashlib.sha1('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:20]
+
+# 연습 텍스트 코퍼스 (시작 시 한 번 로드)
+PRACTICE_TEXTS_PATH = os.environ.get(
+    "PRACTICE_TEXTS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'practice_texts.json')
+)
+MAX_PRACTICE_TEXT_COUNT = 20  # 한 요청에서 받을 수 있는 최대 텍스트 수
+PRACTICE_TEXT_MAX_AGE = 86400  # seed 지정 응답의 캐시 유지 시간 (초)
+practice_texts = PracticeTextCorpus.load(PRACTICE_TEXTS_PATH)
+
+# 홈 화면 조각 캐시 - 모드 카드는 한 번, 명예의 전당 Top10은 모드별 랭킹 버전이 바뀔 때만 렌더링
+home_fragments = FragmentCache()
+HOME_TEMPLATES = ('index.html', 'fragments/mode_cards.html', 'fragments/leaderboard_pane.html')
+
+def home_page_fingerprint():
+    """홈 화면 템플릿, 정적 파일 URL, 실시간 랭킹 설정이 같으면 같은 값 (워커 간에도 같음)"""
+    fingerprint = current_app.extensions.get('home_page_fingerprint')
+    if fingerprint is None:
+        env = current_app.jinja_env
+        fingerprint = make_etag(
+            *(env.loader.get_source(env, name)[0] for name in HOME_TEMPLATES),
+            *(asset_url(name) for name in ASSETS),
+            'leaderboard_stream' in current_app.extensions
+        )
+        current_app.extensions['home_page_fingerprint'] = fingerprint
+    return fingerprint
+
+def cached_fragment(name, key, render):
+    """홈 화면 조각 (디버그 모드는 템플릿 수정이 바로 보이도록 매번 렌더링)"""
+    if current_app.debug:
+        return Markup(render())
+    return home_fragments.get(name, key, render)
+
+def leaderboard_rows(records):
+    """Top10 표 행 - leaderboard.js의 calculateRanks()와 같은 동점 등수, formatDate()와 같은 날짜 형식"""
+    rows = []
+    rank = 1
+    for index, record in enumerate(records):
+        if index and (record['score'], record['accuracy'], record['wpm']) != (
+                records[index - 1]['score'], records[index - 1]['accuracy'], records[index - 1]['wpm']):
+            rank = index + 1
+        created_at = datetime.fromisoformat(record['created_at']) if record['created_at'] else None
+        rows.append({**record, 'rank': rank,
+                     'created_label': created_at.strftime('%m/%d %H:%M') if created_at else ''})
+    return rows
+
+def render_home(leaderboards, key=None):
+    """홈 화면 조립 - leaderboards: {모드: (버전, 상위 기록)}, None이면 브라우저가 API로 불러옴"""
+    fragment_key = (key, request.script_root)
+    mode_cards = cached_fragment('mode_cards', fragment_key, lambda: render_template(
+        'fragments/mode_cards.html', modes=PRACTICE_MODES))
+    panes = {}
+    for mode, mode_data in PRACTICE_MODES.items():
+        if leaderboards is None:
+            panes[mode] = Markup(render_template('fragments/leaderboard_pane.html',
+                                                 mode_key=mode, mode_data=mode_data, rows=None))
+            continue
+        version, records = leaderboards[mode]
+        panes[mode] = cached_fragment(f'leaderboard:{mode}', (fragment_key, version), lambda: render_template(
+            'fragments/leaderboard_pane.html', mode_key=mode, mode_data=mode_data, rows=leaderboard_rows(records)))
+    return render_template(
+        'index.html', modes=PRACTICE_MODES, mode_cards=mode_cards, leaderboard_panes=panes,
+        leaderboard_counts={mode: len(records) for mode, (_, records) in (leaderboards or {}).items()},
+        leaderboard_stream='leaderboard_stream' in current_app.extensions
+    )
+
+@bp.route('/')
+@read_only
 def index():
-    """홈페이지 - 연습 모드 선택"""
+    """홈페이지 - 연습 모드 선택
+
+    조립한 페이지를 모드별 랭킹 버전으로 캐시하고, 버전이 같으면 304 응답 (If-None-Match).
+    랭킹 버전과 Top10은 leaderboard_cache에서 읽으므로 DB 조회는 버전이 바뀔 때만 일어난다.
+    """
     try:
-        # 자리 연습 모드의 상위 10개 기록 조회
-        top_records = Record.query.filter_by(mode='자리')\
-            .order_by(Record.score.desc(), Record.accuracy.desc(), Record.wpm.desc(), Record.created_at.asc())\
-            .limit(10)\
-            .all()
-        
-        return render_template('index.html', modes=PRACTICE_MODES, top_records=top_records)
+        # 모든 모드의 상위 10개 기록 (캐시 사용)
+        leaderboards = {mode: leaderboard_cache.get(mode) for mode in PRACTICE_MODES}
     except Exception as e:
         logging.error(f"홈페이지 로딩 실패: {e}")
-        # 에러 발생 시에도 페이지는 표시되도록
-        return render_template('index.html', modes=PRACTICE_MODES, top_records=[])
+        # 에러 발생 시에도 페이지는 표시되도록 (캐시하지 않음)
+        return render_home(None)
+    
+    etag = make_etag('index', home_page_fingerprint(), request.script_root,
+                     *(version for version, _ in leaderboards.values()))
+    page = cached_fragment('index', etag, lambda: render_home(leaderboards, home_page_fingerprint()))
+    response = current_app.make_response(str(page))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
-@app.route('/practice/<mode>')
+@bp.route('/practice/<mode>')
 def practice(mode):
     """연습 화면"""
     if mode not in PRACTICE_MODES:
@@ -158,20 +691,20 @@ def practice(mode):
     session['session_id'] = session_id
     session['practice_start_time'] = time.time()
     session['practice_mode'] = mode
+    # 이 연습에서 발급할 텍스트의 seed (재생 채점 때 같은 텍스트를 다시 만듦)
+    text_seed = secrets.token_urlsafe(8)
+    session['text_seed'] = text_seed
     
     # 타이핑 세션 초기화
-    typing_sessions[session_id] = {
-        'keystrokes': [],
-        'start_time': time.time(),
-        'token': practice_token
-    }
+    session_store.create_session(session_id, time.time(), practice_token)
     
     mode_info = PRACTICE_MODES[mode]
-    return render_template('practice.html', mode=mode, mode_info=mode_info, practice_token=practice_token)
+    return render_template('practice.html', mode=mode, mode_info=mode_info, practice_token=practice_token,
+                           text_seed=text_seed)
 
 
 
-@app.route('/health')
+@bp.route('/health')
 def health():
     """헬스체크 엔드포인트"""
     try:
@@ -184,54 +717,106 @@ def health():
     
     status = {
         'status': 'healthy' if db_status else 'unhealthy',
-        'database_connected': db_status
+        'database_connected': db_status,
+        'pools': db_pool_stats()
     }
     return jsonify(status)
 
+def db_pool_stats():
+    """커넥션 풀별 사용량 - write(기본 DB), read(읽기 엔진이 있을 때)"""
+    stats = {'write': pool_stats(db.engine)}
+    router = current_app.extensions.get('db_routing')
+    if router is not None:
+        stats['read'] = dict(pool_stats(router.engine), down=router.is_down(), fallbacks=router.fallbacks)
+    return stats
+
 # 보안 헬퍼 함수
-def check_rate_limit(student_id, client_ip):
-    """학생별 제출 빈도 제한 검사"""
-    current_time = time.time()
-    
-    # 오래된 로그 정리
-    if student_id in submission_log:
-        submission_log[student_id] = [
-            (timestamp, ip) for timestamp, ip in submission_log[student_id]
-            if current_time - timestamp < RATE_LIMIT_WINDOW
-        ]
+def client_key():
+    """빈도 제한 키 - 타이핑 세션 (없으면 IP)
+
+    한 교실이 같은 공인 IP를 쓰는 경우가 많아 학생별로 세려면 세션 기준이 낫다.
+    """
+    session_id = session.get('session_id')
+    if session_id:
+        return f'session:{session_id}'
+    forwarded = request.headers.get('X-Forwarded-For', '')
+    return f"ip:{forwarded.split(',')[0].strip() or request.remote_addr or 'unknown'}"
+
+def admin_required(view):
+    """관리 API 보호 - ADMIN_USER/ADMIN_PASS HTTP Basic 인증 (틀리면 401, ADMIN_PASS가 없으면 503)"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_PASS:
+            return jsonify({'error': '관리자 계정이 설정되지 않았습니다 (ADMIN_PASS).'}), 503
+        auth = request.authorization
+        # 길이와 무관하게 비교 시간이 같도록 compare_digest 사용
+        if (auth is None or auth.type != 'basic'
+                or not hmac.compare_digest((auth.username or '').encode(), ADMIN_USER.encode())
+                or not hmac.compare_digest((auth.password or '').encode(), ADMIN_PASS.encode())):
+            response = jsonify({'error': '관리자 인증이 필요합니다.'})
+            response.status_code = 401
+            response.headers['WWW-Authenticate'] = 'Basic realm="admin"'
+            return response
+        return view(*args, **kwargs)
+    return wrapper
+
+def decode_keystroke_batch(base_ms, deltas, sent_at_ms, server_now):
+    """델타 인코딩된 클라이언트 키 입력 시각을 서버 시각(초)으로 복원"""
+    if not isinstance(deltas, list) or not deltas:
+        return None, '키 입력 데이터가 비어 있습니다.'
+    if len(deltas) > MAX_KEYSTROKE_BATCH:
+        return None, f'한 번에 최대 {MAX_KEYSTROKE_BATCH}개의 키 입력만 전송할 수 있습니다.'
+    # JSON 파서가 NaN/Infinity를 허용하므로 직접 거부 (NaN 시각은 최소 타이핑 시간 검사를 통과시킴)
+    if not (math.isfinite(base_ms) and math.isfinite(sent_at_ms)):
+        return None, '키 입력 시각이 올바르지 않습니다.'
     
-    # 현재 제출 횟수 확인
-    if student_id in submission_log:
-        if len(submission_log[student_id]) >= MAX_SUBMISSIONS_PER_WINDOW:
-            return False
+    # 클라이언트 시각 복원 (첫 델타는 base 기준)
+    client_times = []
+    current = base_ms
+    for delta in deltas:
+        if not isinstance(delta, int) or isinstance(delta, bool) or not (0 <= delta <= MAX_KEYSTROKE_GAP_MS):
+            return None, '키 입력 간격이 올바르지 않습니다.'
+        current += delta
+        client_times.append(current)
     
-    # 새 제출 기록
-    if student_id not in submission_log:
-        submission_log[student_id] = []
-    submission_log[student_id].append((current_time, client_ip))
+    # 전송 시각보다 나중에 입력된 키는 있을 수 없음
+    if client_times[-1] > sent_at_ms:
+        return None, '키 입력 시각이 전송 시각보다 늦습니다.'
     
-    return True
+    # 클라이언트 시계 오차를 무시하고 전송 시각을 서버 수신 시각에 맞춰 변환
+    offset = server_now - sent_at_ms / 1000
+    return [t / 1000 + offset for t in client_times], 'OK'
 
 def validate_typing_activity(session_id, duration_sec):
     """실제 타이핑 활동 검증"""
-    if session_id not in typing_sessions:
+    session_data = session_store.get_session(session_id)
+    if session_data is None:
         return False, '타이핑 세션을 찾을 수 없습니다.'
     
-    session_data = typing_sessions[session_id]
-    keystrokes = session_data['keystrokes']
+    # 키 입력마다 갱신된 타임라인 통계 사용 (첫/마지막 입력 시각, 입력 수)
+    timeline = session_data['timeline']
     
     # 최소 키 입력 수 검사
-    if len(keystrokes) < MIN_KEYSTROKES:
+    if timeline.count < MIN_KEYSTROKES:
         return False, f'연습이 부족합니다. 최소 {MIN_KEYSTROKES}번 이상 타이핑해주세요.'
     
     # 타이핑 시간 분산 검사 (5분 연습 완료 후 추가 시간 고려)
-    if len(keystrokes) > 0:
-        time_span = keystrokes[-1] - keystrokes[0] if len(keystrokes) > 1 else duration_sec
+    if timeline.count > 0:
+        time_span = timeline.span if timeline.count > 1 else duration_sec
         # 실제 타이핑 시간은 최소 4분(240초) 이상이어야 함 (5분 연습 기준)
         min_typing_time = 240  # 4분
         if time_span < min_typing_time:
             return False, '타이핑 패턴이 비정상입니다.'
     
+    # 입력 간격 리듬 검사 (일정한 간격으로 자동 입력한 세션)
+    if TYPING_ANOMALY_CHECK in ('log', 'reject'):
+        anomaly = typing_anomaly.score_timeline(timeline)
+        if anomaly['suspicious']:
+            logging.warning(f"입력 간격 이상 패턴: 세션 {session_id}, 사유 {', '.join(anomaly['reasons'])}, "
+                            f"cv {anomaly['cv']}, entropy {anomaly['entropy']}")
+            if TYPING_ANOMALY_CHECK == 'reject':
+                return False, '타이핑 패턴이 비정상입니다.'
+    
     return True, 'OK'
 
 def validate_data_integrity(wpm, accuracy, score, duration_sec):
@@ -263,8 +848,39 @@ def validate_data_integrity(wpm, accuracy, score, duration_sec):
     
     return True, 'OK'
 
+def issued_text_loader(mode, text_seed):
+    """연습 세션에 발급된 텍스트를 번호로 다시 만드는 함수
+
+    클라이언트는 `seed={text_seed}:{묶음 번호}&count=MAX_PRACTICE_TEXT_COUNT`로 텍스트를 묶음 단위로
+    받으므로 번호 n의 텍스트는 n // MAX_PRACTICE_TEXT_COUNT 번째 묶음의 n % MAX_PRACTICE_TEXT_COUNT 번째다.
+    """
+    batches = {}
+    
+    def text_at(index):
+        batch, offset = divmod(index, MAX_PRACTICE_TEXT_COUNT)
+        texts = batches.get(batch)
+        if texts is None:
+            texts = batches[batch] = practice_texts.samples(mode, MAX_PRACTICE_TEXT_COUNT, f'{text_seed}:{batch}')
+        # 자리 연습은 클라이언트가 공백을 한 칸으로 정리해서 보여줌
+        return ' '.join(texts[offset].split()) if mode == '자리' else texts[offset]
+    
+    return text_at
+
+def score_practice_keylog(keylog, mode, text_seed):
+    """base64 키 입력 기록 재생 채점 - (결과, 오류 메시지)"""
+    if not text_seed:
+        return None, '연습 텍스트 정보가 없습니다. 다시 연습을 시작해주세요.'
+    try:
+        data = base64.b64decode(keylog, validate=True)
+    except (TypeError, binascii.Error):
+        return None, '키 입력 기록 형식이 올바르지 않습니다.'
+    try:
+        return score_keylog(data, issued_text_loader(mode, text_seed), PRACTICE_DURATION_SEC), 'OK'
+    except KeylogError as e:
+        return None, str(e)
+
 # API 엔드포인트 - 기록 저장 (보안 강화)
-@app.route('/api/records', methods=['POST'])
+@bp.route('/api/records', methods=['POST'])
 def create_record():
     """연습 기록 저장 - 보안 강화 버전"""
     try:
@@ -330,8 +946,12 @@ def create_record():
             return jsonify({'error': '5분 종료 후 저장 가능합니다.'}), 400
         
         # 6. Rate Limiting 검사
-        if not check_rate_limit(student_id, client_ip):
-            return jsonify({'error': f'너무 빠른 제출입니다. {RATE_LIMIT_WINDOW//60}분당 최대 {MAX_SUBMISSIONS_PER_WINDOW}번만 제출 가능합니다.'}), 429
+        allowed, retry_after = rate_limiter.hit('submit', student_id, MAX_SUBMISSIONS_PER_WINDOW, RATE_LIMIT_WINDOW)
+        if not allowed:
+            return too_many_requests(
+                f'너무 빠른 제출입니다. {RATE_LIMIT_WINDOW//60}분당 최대 {MAX_SUBMISSIONS_PER_WINDOW}번만 제출 가능합니다.',
+                retry_after, MAX_SUBMISSIONS_PER_WINDOW
+            )
         
         # 7. 실제 타이핑 활동 검증
         session_id = session.get('session_id')
@@ -340,45 +960,89 @@ def create_record():
             if not typing_valid:
                 return jsonify({'error': typing_msg}), 400
         
-        # 8. 데이터 무결성 검증
+        # 8. 키 입력 기록이 있으면 재생해서 서버가 직접 채점 (클라이언트가 보낸 값 대신 사용)
+        keylog = data.get('keylog')
+        if keylog is not None:
+            replayed, replay_msg = score_practice_keylog(keylog, mode, session.get('text_seed'))
+            if replayed is None:
+                return jsonify({'error': replay_msg}), 400
+            if (replayed['wpm'], replayed['accuracy'], replayed['score']) != (wpm, accuracy, score):
+                logging.info(f"재생 채점 결과로 대체: {student_id}, 제출 {wpm}/{accuracy}/{score}, "
+                             f"재생 {replayed['wpm']}/{replayed['accuracy']}/{replayed['score']}")
+            wpm, accuracy, score = replayed['wpm'], replayed['accuracy'], replayed['score']
+        elif REQUIRE_KEYLOG:
+            return jsonify({'error': '키 입력 기록이 필요합니다.'}), 400
+        
+        # 9. 데이터 무결성 검증
         is_valid, error_msg = validate_data_integrity(wpm, accuracy, score, duration_sec)
         if not is_valid:
             return jsonify({'error': error_msg}), 400
         
-        # 8. Referer 헤더 검증 (옵션)
+        # 10. Referer 헤더 검증 (옵션)
         referer = request.headers.get('Referer', '')
         if referer and not any(domain in referer for domain in [request.host, 'localhost', '127.0.0.1']):
             logging.warning(f'의심스러운 Referer: {referer}, IP: {client_ip}, Student: {student_id}')
         
-        # 9. 기록 저장
-        new_record = Record()
-        new_record.student_id = student_id
-        new_record.mode = mode
-        new_record.wpm = wpm
-        new_record.accuracy = accuracy
-        new_record.score = score
-        new_record.duration_sec = duration_sec
-        new_record.created_at = get_kst_now()
-        
-        db.session.add(new_record)
-        db.session.commit()
+        # 11. 기록 저장
+        created_at = get_kst_now()
+        ticket = None
+        write_behind = current_app.extensions.get('write_behind')
+        if write_behind is not None:
+            # 스풀 파일에 먼저 기록하고 바로 응답 (본 DB 저장은 백그라운드에서 일괄 처리)
+            ticket = write_behind.spool.enqueue({
+                'student_id': student_id,
+                'mode': mode,
+                'wpm': wpm,
+                'accuracy': accuracy,
+                'score': score,
+                'duration_sec': duration_sec,
+                'created_at': created_at.isoformat()
+            })
+            write_behind.notify()
+        else:
+            new_record = Record()
+            new_record.student_id = student_id
+            new_record.mode = mode
+            new_record.wpm = wpm
+            new_record.accuracy = accuracy
+            new_record.score = score
+            new_record.duration_sec = duration_sec
+            new_record.created_at = created_at
+            persist_records([new_record])
         
         # 세션 토큰 및 타이핑 데이터 무효화 (일회성)
         session_id = session.get('session_id')
-        if session_id and session_id in typing_sessions:
-            del typing_sessions[session_id]
+        if session_id:
+            session_store.delete_session(session_id)
         
         session.pop('practice_token', None)
         session.pop('practice_start_time', None)
         session.pop('practice_mode', None)
         session.pop('session_id', None)
+        session.pop('text_seed', None)
+        
+        if ticket is not None:
+            logging.info(f'기록 저장 대기: {student_id}, {mode}, {score}점, IP: {client_ip}, ticket: {ticket}')
+            return jsonify({
+                'success': True,
+                'queued': True,
+                'message': '기록이 접수되었습니다.',
+                'ticket': ticket,
+                'status_url': f'/api/records/pending/{ticket}',
+                'wpm': wpm,
+                'accuracy': accuracy,
+                'score': score
+            }), 202
         
         logging.info(f'기록 저장 성공: {student_id}, {mode}, {score}점, IP: {client_ip}')
         
         return jsonify({
             'success': True,
             'message': '기록이 성공적으로 저장되었습니다.',
-            'id': new_record.id
+            'id': new_record.id,
+            'wpm': wpm,
+            'accuracy': accuracy,
+            'score': score
         }), 201
         
     except ValueError as e:
@@ -389,8 +1053,25 @@ def create_record():
         db.session.rollback()
         return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
 
+# API 엔드포인트 - 대기 중인 기록 저장 상태
+@bp.route('/api/records/pending/<ticket>')
+def get_pending_record(ticket):
+    """write-behind로 접수된 기록의 저장 상태 (pending, writing, done, failed)"""
+    write_behind = current_app.extensions.get('write_behind')
+    if write_behind is None:
+        return jsonify({'error': '기록 저장 대기열을 사용하지 않습니다.'}), 404
+    try:
+        status = write_behind.spool.status(ticket)
+        if status is None:
+            return jsonify({'error': '접수된 기록을 찾을 수 없습니다.'}), 404
+        return jsonify({'success': True, **status})
+    except Exception as e:
+        logging.error(f"기록 저장 상태 조회 실패: {e}")
+        return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
+
 # API 엔드포인트 - 키스트로크 기록
-@app.route('/api/keystroke', methods=['POST'])
+@bp.route('/api/keystroke', methods=['POST'])
+@rate_limiter.limit('keystroke', *KEYSTROKE_RATE_LIMIT, key_func=client_key)
 def record_keystroke():
     """타이핑 활동 기록"""
     try:
@@ -399,16 +1080,11 @@ def record_keystroke():
             return jsonify({'error': '잘못된 요청입니다.'}), 400
         
         session_id = session.get('session_id')
-        if not session_id or session_id not in typing_sessions:
+        if not session_id or not session_store.has_session(session_id):
             return jsonify({'error': '유효하지 않은 세션입니다.'}), 401
         
         # 키스트로크 타임스탬프 기록
-        timestamp = time.time()
-        typing_sessions[session_id]['keystrokes'].append(timestamp)
-        
-        # 메모리 절약을 위해 오래된 데이터 정리
-        if len(typing_sessions[session_id]['keystrokes']) > 1000:
-            typing_sessions[session_id]['keystrokes'] = typing_sessions[session_id]['keystrokes'][-500:]
+        session_store.append_keystrokes(session_id, [time.time()])
         
         return jsonify({'success': True}), 200
         
@@ -416,8 +1092,58 @@ def record_keystroke():
         logging.error(f"키스트로크 기록 실패: {e}")
         return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
 
+# API 엔드포인트 - 키스트로크 배치 기록
+@bp.route('/api/keystrokes', methods=['POST'])
+@rate_limiter.limit('keystrokes', *KEYSTROKE_BATCH_RATE_LIMIT, key_func=client_key)
+def record_keystroke_batch():
+    """타이핑 활동 배치 기록 (델타 인코딩된 클라이언트 타임스탬프)"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': '잘못된 요청입니다.'}), 400
+        
+        session_id = session.get('session_id')
+        session_data = session_store.get_session(session_id) if session_id else None
+        if session_data is None:
+            return jsonify({'error': '유효하지 않은 세션입니다.'}), 401
+        
+        # 배치 번호는 1부터 (없거나 0이면 항상 중복으로 보고 버리게 되므로 거부)
+        seq = data.get('seq')
+        if not isinstance(seq, int) or isinstance(seq, bool) or seq < 1:
+            return jsonify({'error': '배치 번호가 올바르지 않습니다.'}), 400
+        base = float(data['base'])
+        sent_at = float(data['sent_at'])
+        deltas = data['deltas']
+        
+        # 재전송된 배치는 중복 기록하지 않음
+        if seq <= session_data['last_seq']:
+            return jsonify({'success': True, 'duplicate': True, 'seq': seq}), 200
+        
+        timestamps, error_msg = decode_keystroke_batch(base, deltas, sent_at, time.time())
+        if timestamps is None:
+            return jsonify({'error': error_msg}), 400
+        
+        # 세션 시작 이전이나 이전 배치보다 앞선 타임스탬프는 거부
+        timeline = session_data['timeline']
+        earliest = timeline.last if timeline.count else session_data['start_time'] - KEYSTROKE_CLOCK_SLACK
+        if timestamps[0] < earliest - KEYSTROKE_CLOCK_SLACK:
+            return jsonify({'error': '키 입력 시각이 세션과 일치하지 않습니다.'}), 400
+        
+        accepted, count = session_store.append_keystrokes(session_id, timestamps, seq=seq)
+        if not accepted:
+            return jsonify({'success': True, 'duplicate': True, 'seq': seq}), 200
+        
+        return jsonify({'success': True, 'seq': seq, 'count': count}), 200
+        
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': '키 입력 데이터 형식이 올바르지 않습니다.'}), 400
+    except Exception as e:
+        logging.error(f"키스트로크 배치 기록 실패: {e}")
+        return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
+
 # API 엔드포인트 - 랭킹 조회
-@app.route('/api/records/top')
+@bp.route('/api/records/top')
+@read_only
 def get_top_records():
     """상위 10개 기록 조회"""
     try:
@@ -425,48 +1151,115 @@ def get_top_records():
         if mode not in PRACTICE_MODES:
             return jsonify({'error': '올바르지 않은 연습 모드입니다.'}), 400
         
-        # 상위 10개 기록 조회 (점수 desc, 정확도 desc, WPM desc, 날짜 asc 순)
-        records = Record.query.filter_by(mode=mode)\
-            .order_by(Record.score.desc(), Record.accuracy.desc(), Record.wpm.desc(), Record.created_at.asc())\
-            .limit(10)\
-            .all()
+        # 상위 10개 기록 조회 (점수 desc, 정확도 desc, WPM desc, 날짜 asc 순, 캐시 사용)
+        version, records = leaderboard_cache.get(mode)
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'mode': mode,
-            'records': [record.to_dict() for record in records],
+            'records': records,
             'total': len(records)
         })
+        # 랭킹 버전이 같으면 304 응답 (If-None-Match)
+        response.set_etag(make_etag('top', mode, version))
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
         
     except Exception as e:
         logging.error(f"랭킹 조회 실패: {e}")
         return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
 
+LEADERBOARD_STREAM_RETRY_MS = 3000  # 연결이 끊겼을 때 브라우저의 재연결 대기 시간
+LEADERBOARD_STREAM_HEARTBEAT = 15  # 변경이 없을 때 주석 줄을 보내는 간격 (초, 프록시 유휴 타임아웃 방지)
+# 연결 하나의 최대 유지 시간 (초) - 끝나면 브라우저가 Last-Event-ID로 다시 연결
+LEADERBOARD_STREAM_MAX_AGE = float(os.environ.get("LEADERBOARD_STREAM_MAX_AGE", 25))
+
+# API 엔드포인트 - 랭킹 실시간 전송 (SSE)
+@bp.route('/api/records/stream')
+def stream_top_records():
+    """상위 10개 랭킹 변경분 전송 - 처음에 snapshot, 이후 저장될 때마다 delta 이벤트"""
+    broadcaster = current_app.extensions.get('leaderboard_stream')
+    if broadcaster is None:
+        return jsonify({'error': '실시간 랭킹이 꺼져 있습니다.'}), 404
+    
+    mode = request.args.get('mode', '자리')
+    if mode not in PRACTICE_MODES:
+        return jsonify({'error': '올바르지 않은 연습 모드입니다.'}), 400
+    
+    try:
+        subscription, version, records = broadcaster.subscribe(mode)
+    except Exception as e:
+        logging.error(f"랭킹 스트림 구독 실패: {e}")
+        return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
+    # 재연결한 클라이언트가 이미 같은 버전을 갖고 있으면 스냅샷 생략
+    resume = request.headers.get('Last-Event-ID') == str(version)
+    
+    def generate():
+        try:
+            yield f'retry: {LEADERBOARD_STREAM_RETRY_MS}\n\n'
+            if not resume:
+                yield format_event('snapshot', {'mode': mode, 'version': version, 'records': records},
+                                   event_id=version)
+            deadline = time.monotonic() + LEADERBOARD_STREAM_MAX_AGE
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                message = subscription.get(min(LEADERBOARD_STREAM_HEARTBEAT, remaining))
+                if message is CLOSED:
+                    break
+                yield message if message is not None else ': heartbeat\n\n'
+        finally:
+            broadcaster.unsubscribe(subscription)
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx 프록시 버퍼링 끄기
+    return response
+
 # API 엔드포인트 - 통계 조회
-@app.route('/api/records/stats')
+@bp.route('/api/records/stats')
+@read_only
 def get_statistics():
-    """전체 통계 조회"""
+    """전체/모드별 통계 조회 (통계 요약 테이블 사용)"""
     try:
-        # 전체 학생 수 (고유 student_id)
-        total_students = db.session.query(Record.student_id).distinct().count()
-        
-        # 전체 기록 수
-        total_records = Record.query.count()
+        summaries = {row.scope: row for row in RecordStats.query.all()}
+        histograms = {}
+        for row in RecordWpmHistogram.query.order_by(RecordWpmHistogram.scope, RecordWpmHistogram.wpm):
+            histograms.setdefault(row.scope, []).append((row.wpm, row.count))
         
-        # 평균 WPM (모든 기록의 평균)
-        avg_wpm_result = db.session.query(db.func.avg(Record.wpm)).scalar()
-        avg_wpm = float(avg_wpm_result) if avg_wpm_result else 0
+        def describe(scope):
+            summary = summaries.get(scope)
+            total = summary.total_records if summary else 0
+            histogram = histograms.get(scope, [])
+            return {
+                'total_students': summary.total_students if summary else 0,
+                'total_records': total,
+                'avg_wpm': summary.sum_wpm / total if total else 0,
+                'avg_accuracy': summary.sum_accuracy / total if total else 0,
+                'wpm_p50': histogram_percentile(histogram, total, 50),
+                'wpm_p90': histogram_percentile(histogram, total, 90)
+            }
         
-        # 평균 정확도 (모든 기록의 평균)
-        avg_accuracy_result = db.session.query(db.func.avg(Record.accuracy)).scalar()
-        avg_accuracy = float(avg_accuracy_result) if avg_accuracy_result else 0
+        if STATS_SCOPE_ALL in summaries:
+            overall = describe(STATS_SCOPE_ALL)
+        else:
+            # 요약이 아직 없으면 집계 쿼리 한 번으로 계산
+            total_students, total_records, avg_wpm, avg_accuracy = db.session.query(
+                db.func.count(db.distinct(Record.student_id)), db.func.count(Record.id),
+                db.func.avg(Record.wpm), db.func.avg(Record.accuracy)
+            ).one()
+            overall = {
+                'total_students': total_students,
+                'total_records': total_records,
+                'avg_wpm': float(avg_wpm) if avg_wpm else 0,
+                'avg_accuracy': float(avg_accuracy) if avg_accuracy else 0
+            }
         
         return jsonify({
             'success': True,
-            'total_students': total_students,
-            'total_records': total_records,
-            'avg_wpm': avg_wpm,
-            'avg_accuracy': avg_accuracy
+            **overall,
+            'modes': {mode: describe(mode) for mode in PRACTICE_MODES}
         })
         
     except Exception as e:
@@ -474,215 +1267,1074 @@ def get_statistics():
         return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
 
 # API 엔드포인트 - 페이지네이션된 기록 조회
-@app.route('/api/records')
+@bp.route('/api/records')
+@read_only
 def get_records():
-    """페이지네이션된 기록 조회"""
+    """페이지네이션된 기록 조회 (after 커서 또는 offset, format=columnar면 열별 배열)"""
     try:
         mode = request.args.get('mode', '자리')
         limit = int(request.args.get('limit', 10))
         offset = int(request.args.get('offset', 0))
+        after = request.args.get('after')
+        record_format = request.args.get('format', 'objects')
         
         if mode not in PRACTICE_MODES:
             return jsonify({'error': '올바르지 않은 연습 모드입니다.'}), 400
+        if record_format not in ('objects', 'columnar'):
+            return jsonify({'error': 'format은 objects 또는 columnar여야 합니다.'}), 400
         
         # limit 범위 제한 (1-10000, 전체 보기 지원)
         limit = max(1, min(limit, 10000))
         # offset 음수 방지
         offset = max(0, offset)
         
-        # 총 기록 수 조회
-        total_count = Record.query.filter_by(mode=mode).count()
+        # ORM 객체 대신 행 튜플로 조회 (최대 10000행의 객체 생성/to_dict 비용 제거)
+        query = db.select(*[getattr(Record, column) for column in RECORD_COLUMNS])\
+            .where(Record.mode == mode).order_by(*LEADERBOARD_ORDER)
+        if after:
+            # 키셋 페이지네이션: 앞 페이지를 건너뛰지 않고 인덱스에서 바로 이어서 읽음
+            query = query.where(after_cursor(after))
+        else:
+            query = query.offset(offset)
+        
+        # 한 건 더 읽어서 다음 페이지 존재 여부 확인
+        records = db.session.execute(query.limit(limit + 1)).all()
+        has_more = len(records) > limit
+        records = records[:limit]
+        
+        pagination = {
+            'limit': limit,
+            'has_more': has_more,
+            'current_count': len(records),
+            'next_cursor': encode_cursor(records[-1]) if has_more else None
+        }
+        if after:
+            pagination['after'] = after
+        else:
+            # 총 기록 수는 첫 요청(커서 없음)에서만 조회
+            pagination['offset'] = offset
+            pagination['total'] = Record.query.filter_by(mode=mode).count()
+        
+        if record_format == 'columnar':
+            payload = {'columns': list(RECORD_COLUMNS), 'data': columnar(records, RECORD_COLUMNS)}
+        else:
+            payload = {'records': [dict(zip(RECORD_COLUMNS, record)) for record in records]}
+        
+        return json_response({
+            'success': True,
+            'mode': mode,
+            'format': record_format,
+            **payload,
+            'pagination': pagination
+        })
+        
+    except ValueError:
+        return jsonify({'error': 'limit, offset 또는 after 값이 올바르지 않습니다.'}), 400
+    except Exception as e:
+        logging.error(f"기록 조회 실패: {e}")
+        return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
+
+STUDENT_HISTORY_MAX_LIMIT = 100  # 학생 기록 이력 한 페이지 최대 기록 수
+
+def encode_history_cursor(record):
+    """학생 기록 이력 위치(작성 시각, id)를 커서 문자열로 변환"""
+    key = [record.created_at.isoformat() if record.created_at else None, record.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+def before_history_cursor(cursor):
+    """커서보다 오래된 기록만 고르는 조건 (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = datetime.fromisoformat(created_at) if created_at else None
+        record_id = int(record_id)
+    except Exception:
+        raise ValueError('잘못된 커서입니다.')
+    # 날짜가 없는 기록은 맨 뒤 (get_student_records의 nulls_last와 같게)
+    if created_at is None:
+        return db.and_(Record.created_at.is_(None), Record.id < record_id)
+    return db.or_(
+        Record.created_at < created_at,
+        db.and_(Record.created_at == created_at, Record.id < record_id),
+        Record.created_at.is_(None)
+    )
+
+# API 엔드포인트 - 학생별 기록 이력
+@bp.route('/api/students/<student_id>/records')
+@read_only
+def get_student_records(student_id):
+    """학생 한 명의 기록 이력 (최신순, before 커서로 다음 페이지)"""
+    try:
+        student_id = student_id.strip()
+        if not ID_PATTERN.match(student_id):
+            return jsonify({'error': '학번 이름 형식이 올바르지 않습니다. (예: 10218 홍길동)'}), 400
+        
+        mode = request.args.get('mode')
+        if mode is not None and mode not in PRACTICE_MODES:
+            return jsonify({'error': '올바르지 않은 연습 모드입니다.'}), 400
+        limit = max(1, min(int(request.args.get('limit', 20)), STUDENT_HISTORY_MAX_LIMIT))
+        before = request.args.get('before')
         
-        # 페이지네이션된 기록 조회
-        records = Record.query.filter_by(mode=mode)\
-            .order_by(Record.score.desc(), Record.accuracy.desc(), Record.wpm.desc(), Record.created_at.asc())\
-            .offset(offset)\
-            .limit(limit)\
-            .all()
+        # ix_records_student_mode_created 인덱스 범위만 읽음
+        query = Record.query.filter(Record.student_id == student_id)
+        if mode is not None:
+            query = query.filter(Record.mode == mode)
+        if before:
+            query = query.filter(before_history_cursor(before))
+        records = query.order_by(Record.created_at.desc().nulls_last(), Record.id.desc()).limit(limit + 1).all()
+        has_more = len(records) > limit
+        records = records[:limit]
         
-        # 다음 페이지 존재 여부
-        has_more = (offset + limit) < total_count
+        # 총 기록 수는 최고 기록 테이블의 모드별 기록 수 합계에서 보관된 기록 수를 뺀 값 (COUNT 쿼리 없음)
+        bests = PersonalBest.query.filter(PersonalBest.student_id == student_id)
+        rollups = RecordArchiveRollup.query.filter(RecordArchiveRollup.student_id == student_id)
+        if mode is not None:
+            bests = bests.filter(PersonalBest.mode == mode)
+            rollups = rollups.filter(RecordArchiveRollup.mode == mode)
+        rollups = rollups.all()
+        archived = sum(rollup.record_count for rollup in rollups)
+        total = sum(best.record_count for best in bests) - archived
         
         return jsonify({
             'success': True,
+            'student_id': student_id,
             'mode': mode,
             'records': [record.to_dict() for record in records],
             'pagination': {
                 'limit': limit,
-                'offset': offset,
-                'total': total_count,
                 'has_more': has_more,
-                'current_count': len(records)
+                'current_count': len(records),
+                'total': total,
+                'next_cursor': encode_history_cursor(records[-1]) if has_more else None
+            },
+            # 지난 학기에 보관되어 이력에 나오지 않는 기록
+            'archived': {
+                'record_count': archived,
+                'first_created_at': min(rollup.first_created_at for rollup in rollups).isoformat() if rollups else None,
+                'last_created_at': max(rollup.last_created_at for rollup in rollups).isoformat() if rollups else None
             }
         })
         
     except ValueError:
-        return jsonify({'error': 'limit 또는 offset이 올바르지 않습니다.'}), 400
+        return jsonify({'error': 'limit 또는 before 값이 올바르지 않습니다.'}), 400
     except Exception as e:
-        logging.error(f"기록 조회 실패: {e}")
+        logging.error(f"학생 기록 이력 조회 실패: {e}")
         return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
 
+# API 엔드포인트 - 학생별 최고 기록과 순위
+@bp.route('/api/students/<student_id>/bests')
+@read_only
+def get_student_bests(student_id):
+    """학생 한 명의 모드별 최고 기록과 모드 내 학생 순위"""
+    try:
+        student_id = student_id.strip()
+        if not ID_PATTERN.match(student_id):
+            return jsonify({'error': '학번 이름 형식이 올바르지 않습니다. (예: 10218 홍길동)'}), 400
+        
+        mode = request.args.get('mode')
+        if mode is not None and mode not in PRACTICE_MODES:
+            return jsonify({'error': '올바르지 않은 연습 모드입니다.'}), 400
+        
+        query = PersonalBest.query.filter(PersonalBest.student_id == student_id)
+        if mode is not None:
+            query = query.filter(PersonalBest.mode == mode)
+        bests = query.all()
+        ranks = load_student_ranks(student_id, [best.mode for best in bests]) if bests else {}
+        
+        results = {}
+        for best in bests:
+            rank, ranked_students = ranks.get(best.mode, (None, 0))
+            results[best.mode] = {**best.to_dict(), 'rank': rank, 'ranked_students': ranked_students}
+        
+        return jsonify({
+            'success': True,
+            'student_id': student_id,
+            'bests': {name: results[name] for name in PRACTICE_MODES if name in results}
+        })
+        
+    except Exception as e:
+        logging.error(f"최고 기록 조회 실패: {e}")
+        return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
+
+# 기록 내보내기 설정
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8'
+}
+EXPORT_FETCH_SIZE = 1000  # 서버 측 커서에서 한 번에 가져올 행 수
+EXPORT_COLUMNS = RECORD_COLUMNS
+
+def parse_export_date(value, name):
+    """YYYY-MM-DD 형식 날짜 파싱 (없으면 None)"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f'{name} 날짜는 YYYY-MM-DD 형식이어야 합니다.')
+
+def iter_export_rows(mode, date_from, date_to):
+    """내보낼 기록을 id 순서로 조금씩 읽음 (ORM 객체 대신 행 튜플, PostgreSQL은 서버 측 커서)"""
+    stmt = db.select(*[getattr(Record, column) for column in EXPORT_COLUMNS]).order_by(Record.id)
+    if mode:
+        stmt = stmt.where(Record.mode == mode)
+    if date_from:
+        stmt = stmt.where(Record.created_at >= date_from)
+    if date_to:
+        # 종료일 포함
+        stmt = stmt.where(Record.created_at < date_to + timedelta(days=1))
+    
+    with reading():
+        result = db.session.execute(stmt.execution_options(yield_per=EXPORT_FETCH_SIZE))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+def export_csv(partitions):
+    """CSV 청크 생성 (엑셀에서 한글이 깨지지 않도록 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in partitions:
+        for row in rows:
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value for value in row
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def export_ndjson(partitions):
+    """NDJSON 청크 생성 (한 줄에 기록 하나)"""
+    for rows in partitions:
+        lines = []
+        for row in rows:
+            record = dict(zip(EXPORT_COLUMNS, row))
+            record['created_at'] = record['created_at'].isoformat() if record['created_at'] else None
+            lines.append(json.dumps(record, ensure_ascii=False))
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+# API 엔드포인트 - 기록 내보내기
+@bp.route('/api/records/export')
+def export_records():
+    """기록 전체 스트리밍 내보내기 (format=csv|ndjson, mode, from, to)"""
+    try:
+        export_format = request.args.get('format', 'csv')
+        mode = request.args.get('mode')
+        
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': 'format은 csv 또는 ndjson이어야 합니다.'}), 400
+        if mode and mode not in PRACTICE_MODES:
+            return jsonify({'error': '올바르지 않은 연습 모드입니다.'}), 400
+        
+        date_from = parse_export_date(request.args.get('from'), 'from')
+        date_to = parse_export_date(request.args.get('to'), 'to')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    partitions = iter_export_rows(mode, date_from, date_to)
+    chunks = export_csv(partitions) if export_format == 'csv' else export_ndjson(partitions)
+    
+    filename = f"records-{mode or 'all'}-{get_kst_now().strftime('%Y%m%d')}.{export_format}"
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
 # API 엔드포인트 - 연습 텍스트 가져오기
-@app.route('/api/practice-text/<mode>')
+@bp.route('/api/practice-text/<mode>')
+@rate_limiter.limit('practice-text', *PRACTICE_TEXT_RATE_LIMIT, key_func=client_key)
 def get_practice_text(mode):
-    """연습용 텍스트 가져오기"""
+    """연습용 텍스트 가져오기 (count: 한 번에 여러 개, seed: 같은 seed면 같은 텍스트)"""
     if mode not in PRACTICE_MODES:
         return jsonify({'error': '올바르지 않은 연습 모드입니다.'}), 400
+    if not practice_texts.has_mode(mode):
+        return jsonify({'error': '연습 텍스트를 찾을 수 없습니다.'}), 404
     
-    # 정적 데이터에서 랜덤하게 선택
-    import random
-    
-    # 자리 연습용 키워드 풀
-    keyboard_chars = ['asdf', 'jkl;', 'qwer', 'uiop', 'zxcv', 'bnm,']
-    python_keywords = ['if', 'else', 'def', 'for', 'while', 'and', 'or', 'not', 'in', 'is', 'True', 'False', 'None']
-    python_functions = ['print()', 'input()', 'len()', 'str()', 'int()', 'float()', 'bool()', 'list()', 'dict()']
-    symbols = ['[]', '{}', '()', '""', "''", ':', ';', ',', '.', '/', '?', '!', '@', '#', '$', '%', '^', '&', '*', '-', '+', '=', '_']
-    
-    practice_texts = {
-        '자리': [],  # 동적으로 생성됨
-        '낱말': [
-            'print input len str int float bool list dict tuple',
-            'def if else elif for while and or not in is',
-            'True False None return break continue pass',
-            'append remove pop sort index count reverse',
-            'range type isinstance hasattr getattr setattr'
-        ],
-        '문장': [
-            'print("Hello, World!")',
-            'for i in range(10):',
-            'if x > 0 and x < 100:',
-            'name = input("Enter your name: ")',
-            'numbers = [1, 2, 3, 4, 5]'
-        ],
-        '문단': [
-            '''def factorial(n):
-    if n <= 1:
-        return 1
-    else:
-        return n * factorial(n - 1)''',
-            '''numbers = [1, 2, 3, 4, 5]
-for num in numbers:
-    if num % 2 == 0:
-        print(f"{num} is even")''',
-            '''class Student:
-    def __init__(self, name, age):
-        self.name = name
-        self.age = age'''
+    try:
+        count = max(1, min(int(request.args.get('count', 1)), MAX_PRACTICE_TEXT_COUNT))
+    except ValueError:
+        return jsonify({'error': 'count 값이 올바르지 않습니다.'}), 400
+    seed = request.args.get('seed')
+    
+    texts = practice_texts.samples(mode, count, seed)
+    response = jsonify({
+        'success': True,
+        'mode': mode,
+        'text': texts[0],
+        'texts': texts,
+        'seed': seed
+    })
+    
+    if seed is None:
+        # 무작위 선택은 매번 달라야 하므로 캐시 금지
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    
+    # seed가 있으면 결과가 코퍼스 버전에만 의존하므로 캐시 가능
+    response.set_etag(make_etag('text', practice_texts.version, mode, count, seed))
+    response.headers['Cache-Control'] = f'public, max-age={PRACTICE_TEXT_MAX_AGE}'
+    return response.make_conditional(request)
+
+# 세션 저장소 상태 API 엔드포인트
+@bp.route('/api/admin/session-stats')
+@admin_required
+def get_session_stats():
+    """타이핑 세션 저장소 게이지 조회 (세션 수, 메모리, 만료/제거 수)"""
+    try:
+        return jsonify({'success': True, **session_store.stats()})
+    except Exception as e:
+        logging.error(f"세션 저장소 상태 조회 실패: {e}")
+        return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
+
+TYPING_ANOMALY_MAX_RESULTS = 200  # 일괄 검사 응답에 포함할 최대 세션 수
+
+# API 엔드포인트 - 입력 간격 이상 패턴 일괄 검사
+@bp.route('/api/admin/typing-anomalies')
+@admin_required
+def get_typing_anomalies():
+    """저장소의 모든 타이핑 세션을 한 번에 점수화 (all=1이면 정상 세션도 포함)"""
+    try:
+        include_all = request.args.get('all') == '1'
+        started = time.perf_counter()
+        session_ids = []
+        blobs = []
+        for session_id, blob in session_store.iter_timelines():
+            session_ids.append(session_id)
+            blobs.append(blob)
+        results = typing_anomaly.score_blobs(blobs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        flagged = [
+            {'session_id': session_id, **result}
+            for session_id, result in zip(session_ids, results) if include_all or result['suspicious']
         ]
-    }
+        reasons = {}
+        for result in results:
+            for reason in result['reasons']:
+                reasons[reason] = reasons.get(reason, 0) + 1
+        
+        return jsonify({
+            'success': True,
+            'scanned': len(results),
+            'suspicious': sum(1 for result in results if result['suspicious']),
+            'reasons': reasons,
+            'elapsed_ms': round(elapsed_ms, 1),
+            'sessions': flagged[:TYPING_ANOMALY_MAX_RESULTS],
+            'truncated': len(flagged) > TYPING_ANOMALY_MAX_RESULTS
+        })
+    except RuntimeError as e:
+        # numpy가 설치되지 않은 경우
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        logging.error(f"입력 간격 일괄 검사 실패: {e}")
+        return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
+
+# WPM 재계산 설정
+RECALCULATE_WPM_THRESHOLD = 20  # 이 값 이하의 비현실적인 WPM만 재계산
+RECALCULATE_BATCH_SIZE = 5000  # 한 번에 갱신할 id 범위 (배치마다 커밋)
+
+# 정확도 구간별 기준 WPM (중학생 실제 타이핑 속도 고려)
+RECALCULATE_ACCURACY_BANDS = (
+    (98, 18),  # 매우 높은 정확도: 신중하게 타이핑
+    (90, 22),  # 높은 정확도: 적당한 속도
+    (80, 25),  # 보통 정확도: 빠르게 타이핑하다 일부 실수
+    (70, 28),  # 낮은 정확도: 빠르게 타이핑하다 많은 실수
+    (None, 30)  # 매우 낮은 정확도: 매우 빠르게 시도했으나 실수 많음
+)
+
+# 모드별 난이도 조정 (그 밖의 모드는 1.0)
+RECALCULATE_DIFFICULTY = {'자리': 0.7, '낱말': 0.8, '문장': 0.9, '문단': 1.0}
+
+def recalculated_wpm(base_wpm, difficulty_factor):
+    """재계산된 WPM (합리적인 범위 보장, 중학생 기준: 12-35 WPM)"""
+    return max(12, min(round(base_wpm * difficulty_factor), 35))
+
+def recalculated_wpm_expression():
+    """모드와 정확도 구간별 새 WPM을 계산하는 SQL CASE 식
+
+    값은 파이썬에서 미리 계산해 두어 DB마다 다른 반올림 규칙의 영향을 받지 않는다.
+    """
+    def band_case(factor):
+        whens = [
+            (Record.accuracy >= min_accuracy, recalculated_wpm(base_wpm, factor))
+            for min_accuracy, base_wpm in RECALCULATE_ACCURACY_BANDS if min_accuracy is not None
+        ]
+        return db.case(*whens, else_=recalculated_wpm(RECALCULATE_ACCURACY_BANDS[-1][1], factor))
+    
+    return db.case(
+        *[(Record.mode == mode, band_case(factor)) for mode, factor in RECALCULATE_DIFFICULTY.items()],
+        else_=band_case(1.0)
+    )
+
+class MaintenanceJob(db.Model):
+    """관리 작업 진행 상태 (워커와 무관하게 상태 조회 가능)"""
+    __tablename__ = 'maintenance_jobs'
     
-    if mode == '자리':
-        # 자리 연습의 경우 랜덤하게 섞인 텍스트 생성
-        all_items = keyboard_chars + python_keywords + python_functions + symbols
-        random.shuffle(all_items)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed, failed
+    dry_run = db.Column(db.Boolean, nullable=False, default=False)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    updated = db.Column(db.Integer, nullable=False, default=0)
+    message = db.Column(db.Text)
+    started_at = db.Column(db.DateTime, default=get_kst_now)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'dry_run': self.dry_run,
+            'total': self.total,
+            'processed': self.processed,
+            'updated': self.updated,
+            'message': self.message,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+def run_recalculate_wpm(job_id):
+    """WPM 재계산 실행 - id 범위별 UPDATE ... CASE 후 배치마다 커밋 (메모리 사용량 일정)"""
+    job = db.session.get(MaintenanceJob, job_id)
+    target = Record.wpm <= RECALCULATE_WPM_THRESHOLD
+    new_wpm = recalculated_wpm_expression()
+    try:
+        total, min_id, max_id = db.session.query(
+            db.func.count(Record.id), db.func.min(Record.id), db.func.max(Record.id)
+        ).filter(target).one()
+        job.total = total
+        db.session.commit()
         
-        # 15-20개 항목을 선택해서 하나의 연습 텍스트로 만들기
-        num_items = random.randint(15, 20)
-        selected_items = all_items[:num_items]
-        selected_text = ' '.join(selected_items)
-    else:
-        texts = practice_texts.get(mode, [])
-        if not texts:
-            return jsonify({'error': '연습 텍스트를 찾을 수 없습니다.'}), 404
+        if job.dry_run:
+            # 실제 변경 없이 모드/결과 WPM별 대상 기록 수만 보고
+            changes = db.session.query(Record.mode, new_wpm.label('new_wpm'), db.func.count(Record.id))\
+                .filter(target, Record.wpm != new_wpm)\
+                .group_by(Record.mode, new_wpm).all()
+            job.processed = total
+            job.updated = sum(count for _, _, count in changes)
+            job.message = json.dumps(
+                [{'mode': mode, 'new_wpm': wpm, 'count': count} for mode, wpm, count in changes],
+                ensure_ascii=False
+            )
+        elif total:
+            low = min_id - 1
+            while low < max_id:
+                high = low + RECALCULATE_BATCH_SIZE
+                in_batch = db.and_(target, Record.id > low, Record.id <= high)
+                processed = db.session.query(db.func.count(Record.id)).filter(in_batch).scalar()
+                # 값이 그대로인 행은 쓰지 않아 잠금 범위를 줄임
+                result = db.session.execute(
+                    db.update(Record).where(in_batch, Record.wpm != new_wpm).values(wpm=new_wpm)
+                )
+                job.processed += processed
+                job.updated += result.rowcount
+                db.session.commit()
+                low = high
+            
+            # 랭킹 버전과 통계 요약 갱신
+            for mode in PRACTICE_MODES:
+                bump_cache_version(f'leaderboard:{mode}')
+            rebuild_record_stats()
+            rebuild_personal_bests()
+            leaderboard_cache.invalidate()
         
-        selected_text = random.choice(texts)
+        job.status = 'completed'
+        if not job.dry_run:
+            job.message = f'{job.updated}개 기록의 WPM이 재계산되었습니다.'
+    except Exception as e:
+        logging.error(f"WPM 재계산 실패: {e}")
+        db.session.rollback()
+        job = db.session.get(MaintenanceJob, job_id)
+        job.status = 'failed'
+        job.message = str(e)
     
-    return jsonify({
-        'success': True,
-        'mode': mode,
-        'text': selected_text
-    })
+    job.finished_at = get_kst_now()
+    db.session.commit()
+    return job
 
 # WPM 재계산 API 엔드포인트
-@app.route('/api/admin/recalculate-wpm', methods=['POST'])
+@bp.route('/api/admin/recalculate-wpm', methods=['POST'])
+@admin_required
 def recalculate_wpm():
-    """기존 기록의 WPM을 새로운 공식으로 재계산"""
+    """기존 기록의 WPM을 새로운 공식으로 재계산 (dry_run=1: 대상만 집계, background=1: 백그라운드 실행)"""
     try:
-        # 모든 기록 조회
-        records = Record.query.all()
-        updated_count = 0
-        
-        for record in records:
-            # 비현실적으로 낮은 WPM (20 이하) 기록만 재계산
-            if record.wpm <= 20:
-                duration_minutes = record.duration_sec / 60
-                
-                # 더 현실적인 WPM 계산 (중학생 실제 타이핑 속도 고려)
-                # 정확도와 연습 시간을 기반으로 한 추정
-                if record.accuracy >= 98:
-                    # 매우 높은 정확도: 신중하게 타이핑
-                    base_wpm = 18
-                elif record.accuracy >= 90:
-                    # 높은 정확도: 적당한 속도
-                    base_wpm = 22
-                elif record.accuracy >= 80:
-                    # 보통 정확도: 빠르게 타이핑하다 일부 실수
-                    base_wpm = 25
-                elif record.accuracy >= 70:
-                    # 낮은 정확도: 빠르게 타이핑하다 많은 실수
-                    base_wpm = 28
-                else:
-                    # 매우 낮은 정확도: 매우 빠르게 시도했으나 실수 많음
-                    base_wpm = 30
-                
-                # 모드별 난이도 조정
-                if record.mode == '자리':
-                    difficulty_factor = 0.7  # 기본 자리 연습은 쉬움
-                elif record.mode == '낱말':
-                    difficulty_factor = 0.8  # 단어는 조금 어려움
-                elif record.mode == '문장':
-                    difficulty_factor = 0.9  # 문장은 더 어려움
-                else:  # 문단
-                    difficulty_factor = 1.0  # 문단은 가장 어려움
-                
-                # 최종 WPM 계산
-                new_wpm = round(base_wpm * difficulty_factor)
-                
-                # 합리적인 범위 보장 (중학생 기준: 12-35 WPM)
-                new_wpm = max(12, min(new_wpm, 35))
-                
-                # 기록 업데이트
-                record.wpm = new_wpm
-                updated_count += 1
+        dry_run = request.args.get('dry_run') == '1'
+        background = request.args.get('background') == '1'
         
-        # 데이터베이스에 저장
+        job = MaintenanceJob(name='recalculate-wpm', dry_run=dry_run)
+        db.session.add(job)
         db.session.commit()
+        job_id = job.id
         
-        return jsonify({
+        if background:
+            app = current_app._get_current_object()
+            
+            def run():
+                with app.app_context():
+                    run_recalculate_wpm(job_id)
+            
+            threading.Thread(target=run, name=f'recalculate-wpm-{job_id}', daemon=True).start()
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status_url': f'/api/admin/jobs/{job_id}'
+            }), 202
+        
+        job = run_recalculate_wpm(job_id)
+        if job.status != 'completed':
+            return jsonify({'error': '서버 오류가 발생했습니다.', 'job_id': job_id}), 500
+        
+        response = {
             'success': True,
-            'message': f'{updated_count}개 기록의 WPM이 재계산되었습니다.',
-            'updated_count': updated_count,
-            'total_records': len(records)
-        })
+            'job_id': job_id,
+            'dry_run': dry_run,
+            'updated_count': job.updated,
+            'total_records': job.total
+        }
+        if dry_run:
+            response['message'] = f'{job.updated}개 기록의 WPM이 재계산될 예정입니다.'
+            response['changes'] = json.loads(job.message)
+        else:
+            response['message'] = job.message
+        return jsonify(response)
         
     except Exception as e:
         logging.error(f"WPM 재계산 실패: {e}")
         db.session.rollback()
         return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
 
-# 데이터베이스 테이블 생성
-with app.app_context():
+# 관리 작업 상태 API 엔드포인트
+@bp.route('/api/admin/jobs/<int:job_id>')
+@admin_required
+def get_job_status(job_id):
+    """관리 작업 진행 상태 조회"""
+    job = db.session.get(MaintenanceJob, job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+# 기록 보관 설정
+ARCHIVE_BATCH_SIZE = 1000  # 한 트랜잭션에서 옮길 기록 수 (배치마다 커밋해 잠금을 짧게 유지)
+ARCHIVE_TARGETS = ('table', 'csv')  # table: records_archive 테이블, csv: ARCHIVE_DIR의 CSV.gz 파일
+ARCHIVE_DIR = os.environ.get(
+    "ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive')
+)
+
+def update_archive_rollups(rows):
+    """보관할 기록 행을 학생별/모드별 요약과 WPM 분포에 더함 (커밋은 호출자가 수행)"""
+    summaries = {}
+    histogram = {}
+    for row in rows:
+        summary = summaries.get((row.student_id, row.mode))
+        if summary is None:
+            summary = summaries[(row.student_id, row.mode)] = {
+                'record_count': 0, 'sum_wpm': 0, 'sum_accuracy': 0.0,
+                'best': row, 'first_created_at': row.created_at, 'last_created_at': row.created_at
+            }
+        summary['record_count'] += 1
+        summary['sum_wpm'] += row.wpm
+        summary['sum_accuracy'] += row.accuracy
+        if ranking_key(row.score, row.accuracy, row.wpm, row.created_at, row.id) < \
+                ranking_key(summary['best'].score, summary['best'].accuracy, summary['best'].wpm,
+                            summary['best'].created_at, summary['best'].id):
+            summary['best'] = row
+        summary['first_created_at'] = min(summary['first_created_at'], row.created_at)
+        summary['last_created_at'] = max(summary['last_created_at'], row.created_at)
+        histogram[(row.mode, row.wpm)] = histogram.get((row.mode, row.wpm), 0) + 1
+    
+    existing = {
+        (rollup.student_id, rollup.mode): rollup
+        for rollup in RecordArchiveRollup.query.filter(
+            RecordArchiveRollup.student_id.in_({student_id for student_id, _ in summaries})
+        )
+    }
+    for key, summary in summaries.items():
+        best = summary['best']
+        rollup = existing.get(key)
+        if rollup is None:
+            db.session.add(RecordArchiveRollup(
+                student_id=key[0], mode=key[1],
+                record_count=summary['record_count'], sum_wpm=summary['sum_wpm'],
+                sum_accuracy=summary['sum_accuracy'],
+                best_record_id=best.id, best_wpm=best.wpm, best_accuracy=best.accuracy,
+                best_score=best.score, best_created_at=best.created_at,
+                first_created_at=summary['first_created_at'], last_created_at=summary['last_created_at']
+            ))
+            continue
+        rollup.record_count += summary['record_count']
+        rollup.sum_wpm += summary['sum_wpm']
+        rollup.sum_accuracy += summary['sum_accuracy']
+        if ranking_key(best.score, best.accuracy, best.wpm, best.created_at, best.id) < \
+                ranking_key(rollup.best_score, rollup.best_accuracy, rollup.best_wpm,
+                            rollup.best_created_at, rollup.best_record_id):
+            rollup.best_record_id = best.id
+            rollup.best_wpm = best.wpm
+            rollup.best_accuracy = best.accuracy
+            rollup.best_score = best.score
+            rollup.best_created_at = best.created_at
+        rollup.first_created_at = min(rollup.first_created_at, summary['first_created_at'])
+        rollup.last_created_at = max(rollup.last_created_at, summary['last_created_at'])
+    
+    for (mode, wpm), count in histogram.items():
+        increment_row(RecordArchiveWpmHistogram, {'mode': mode, 'wpm': wpm}, count=count)
+
+def open_archive_csv(path):
+    """보관 CSV.gz 파일 생성 (내보내기 CSV와 같은 열과 BOM)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    archive_file = gzip.open(path, 'xt', encoding='utf-8', newline='')
+    archive_file.write('\ufeff')
+    csv.writer(archive_file).writerow(EXPORT_COLUMNS)
+    return archive_file
+
+def run_archive_records(job_id, cutoff, target):
+    """cutoff 이전 기록 보관 - id 순서로 배치마다 옮기고(또는 파일에 쓰고) 지운 뒤 요약 갱신 후 커밋
+
+    통계 요약과 최고 기록은 보관된 기록을 포함한 전체 기간 값이므로 바꾸지 않는다.
+    """
+    job = db.session.get(MaintenanceJob, job_id)
+    target_rows = Record.created_at < cutoff
+    archive_file = None
+    path = None
     try:
-        db.create_all()
-        logging.info("데이터베이스 테이블이 성공적으로 생성되었습니다.")
-        
-        # 테스트 데이터 추가 (개발용)
-        if Record.query.count() == 0:
-            test_records = [
-                {'student_id': '10130 홍길동', 'mode': '자리', 'wpm': 45, 'accuracy': 92.5, 'score': 370, 'duration_sec': 300},
-                {'student_id': '10215 김영희', 'mode': '자리', 'wpm': 38, 'accuracy': 96.0, 'score': 350, 'duration_sec': 300},
-                {'student_id': '10302 박철수', 'mode': '자리', 'wpm': 52, 'accuracy': 89.2, 'score': 415, 'duration_sec': 300}
-            ]
-            for record_data in test_records:
-                record = Record(**record_data)
-                db.session.add(record)
-            db.session.commit()
-            logging.info("테스트 데이터가 추가되었습니다.")
+        job.total = db.session.query(db.func.count(Record.id)).filter(target_rows).scalar()
+        db.session.commit()
+        
+        if job.dry_run:
+            # 실제 변경 없이 모드별 대상 기록 수만 보고
+            changes = db.session.query(Record.mode, db.func.count(Record.id))\
+                .filter(target_rows).group_by(Record.mode).all()
+            job.processed = job.total
+            job.updated = job.total
+            job.message = json.dumps([{'mode': mode, 'count': count} for mode, count in changes], ensure_ascii=False)
+        elif job.total:
+            if target == 'csv':
+                path = os.path.join(ARCHIVE_DIR, f"records-before-{cutoff.strftime('%Y%m%d')}-job{job_id}.csv.gz")
+                archive_file = open_archive_csv(path)
+            columns = [getattr(Record, column) for column in RECORD_COLUMNS]
+            last_id = 0
+            while True:
+                # 기록 id는 작성 시각 순서에 가까우므로 기본 키 순서로 읽으면 오래된 기록부터 바로 찾음
+                rows = db.session.execute(
+                    db.select(*columns).where(target_rows, Record.id > last_id).order_by(Record.id).limit(ARCHIVE_BATCH_SIZE)
+                ).all()
+                if not rows:
+                    break
+                ids = [row.id for row in rows]
+                
+                if archive_file is not None:
+                    csv.writer(archive_file).writerows(
+                        [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows
+                    )
+                    # 기록을 지우기 전에 압축 버퍼를 파일에 씀
+                    archive_file.flush()
+                else:
+                    archived_at = get_kst_now()
+                    db.session.execute(
+                        db.insert(RecordArchive),
+                        [{**row._asdict(), 'archived_at': archived_at} for row in rows]
+                    )
+                update_archive_rollups(rows)
+                db.session.execute(db.delete(Record).where(Record.id.in_(ids)))
+                for mode in {row.mode for row in rows}:
+                    bump_cache_version(f'leaderboard:{mode}')
+                job.processed += len(rows)
+                job.updated += len(rows)
+                db.session.commit()
+                leaderboard_cache.invalidate()
+                last_id = ids[-1]
+        
+        job.status = 'completed'
+        if not job.dry_run:
+            job.message = f'{job.updated}개 기록을 보관했습니다.' + (f' ({path})' if path else '')
+    except Exception as e:
+        logging.error(f"기록 보관 실패: {e}")
+        db.session.rollback()
+        job = db.session.get(MaintenanceJob, job_id)
+        job.status = 'failed'
+        job.message = str(e)
+    finally:
+        if archive_file is not None:
+            archive_file.close()
+    
+    job.finished_at = get_kst_now()
+    db.session.commit()
+    return job
+
+# 기록 보관 API 엔드포인트
+@bp.route('/api/admin/archive-records', methods=['POST'])
+@admin_required
+def archive_records():
+    """before 날짜 이전 기록을 보관하고 요약만 남김 (target=table|csv, dry_run=1: 대상만 집계, background=1: 백그라운드 실행)"""
+    try:
+        cutoff = parse_export_date(request.args.get('before'), 'before')
+        target = request.args.get('target', 'table')
+        dry_run = request.args.get('dry_run') == '1'
+        background = request.args.get('background') == '1'
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if cutoff is None:
+        return jsonify({'error': 'before 날짜가 필요합니다. (예: 2026-03-01)'}), 400
+    if target not in ARCHIVE_TARGETS:
+        return jsonify({'error': 'target은 table 또는 csv여야 합니다.'}), 400
+    
+    try:
+        job = MaintenanceJob(name='archive-records', dry_run=dry_run)
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+        
+        if background:
+            app = current_app._get_current_object()
             
+            def run():
+                with app.app_context():
+                    run_archive_records(job_id, cutoff, target)
+            
+            threading.Thread(target=run, name=f'archive-records-{job_id}', daemon=True).start()
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status_url': f'/api/admin/jobs/{job_id}'
+            }), 202
+        
+        job = run_archive_records(job_id, cutoff, target)
+        if job.status != 'completed':
+            return jsonify({'error': '서버 오류가 발생했습니다.', 'job_id': job_id}), 500
+        
+        response = {
+            'success': True,
+            'job_id': job_id,
+            'dry_run': dry_run,
+            'archived_count': job.updated,
+            'total_records': job.total
+        }
+        if dry_run:
+            response['message'] = f'{job.updated}개 기록이 보관될 예정입니다.'
+            response['changes'] = json.loads(job.message)
+        else:
+            response['message'] = job.message
+        return jsonify(response)
+        
     except Exception as e:
-        logging.error(f"데이터베이스 테이블 생성 실패: {e}")
-        logging.info("Replit PostgreSQL 데이터베이스를 사용합니다.")
+        logging.error(f"기록 보관 실패: {e}")
+        db.session.rollback()
+        return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
+
+# 데이터베이스 테이블 생성
+def init_db():
+    """테이블/인덱스 생성 및 통계 요약 초기화 (앱 컨텍스트 안에서, 여러 번 실행해도 안전)"""
+    # 기본 DB만 (읽기 엔진은 복제본이거나 같은 DB이므로 건드리지 않음)
+    db.create_all(bind_key=None)
+    # 기존 테이블에는 create_all()이 새 인덱스를 만들지 않으므로 따로 확인
+    for index in Record.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+    logging.info("데이터베이스 테이블이 성공적으로 생성되었습니다.")
+    
+    # 통계 요약 테이블이 비어 있으면 기존 기록으로 채움
+    if db.session.get(RecordStats, STATS_SCOPE_ALL) is None:
+        rebuild_record_stats()
+        db.session.commit()
+        logging.info("기록 통계 요약을 생성했습니다.")
+    
+    # 최고 기록 테이블이 비어 있으면 기존 기록으로 채움
+    if PersonalBest.query.first() is None and Record.query.first() is not None:
+        rebuild_personal_bests()
+        db.session.commit()
+        logging.info("학생별 최고 기록을 생성했습니다.")
+
+def seed_db():
+    """테스트 데이터 추가 (개발용, 기록이 하나도 없을 때만) - 추가한 기록 수 반환"""
+    if Record.query.count() > 0:
+        return 0
+    
+    test_records = [
+        {'student_id': '10130 홍길동', 'mode': '자리', 'wpm': 45, 'accuracy': 92.5, 'score': 370, 'duration_sec': 300},
+        {'student_id': '10215 김영희', 'mode': '자리', 'wpm': 38, 'accuracy': 96.0, 'score': 350, 'duration_sec': 300},
+        {'student_id': '10302 박철수', 'mode': '자리', 'wpm': 52, 'accuracy': 89.2, 'score': 415, 'duration_sec': 300}
+    ]
+    persist_records([Record(**record_data) for record_data in test_records])
+    logging.info("테스트 데이터가 추가되었습니다.")
+    return len(test_records)
+
+@click.command('init-db')
+def init_db_command():
+    """테이블 생성 (배포 시 워커 시작 전에 한 번 실행)"""
+    init_db()
+    click.echo('데이터베이스 테이블을 생성했습니다.')
+
+@click.command('archive-records')
+@click.option('--before', required=True, help='이 날짜(YYYY-MM-DD) 이전 기록을 보관')
+@click.option('--target', type=click.Choice(ARCHIVE_TARGETS), default='table', show_default=True)
+@click.option('--dry-run', is_flag=True, help='대상 기록 수만 집계')
+def archive_records_command(before, target, dry_run):
+    """지난 학기 기록 보관 (통계/최고 기록 요약은 유지)"""
+    try:
+        cutoff = parse_export_date(before, 'before')
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    job = MaintenanceJob(name='archive-records', dry_run=dry_run)
+    db.session.add(job)
+    db.session.commit()
+    job = run_archive_records(job.id, cutoff, target)
+    if job.status != 'completed':
+        raise click.ClickException(job.message)
+    click.echo(f'{job.updated}개 기록이 보관될 예정입니다.' if dry_run else job.message)
+
+@click.command('requeue-records')
+@click.argument('tickets', nargs=-1)
+def requeue_records_command(tickets):
+    """write-behind 저장에 끝내 실패한(failed) 기록을 다시 저장 대기로 (티켓을 생략하면 전체)"""
+    write_behind = current_app.extensions.get('write_behind')
+    if write_behind is None:
+        raise click.ClickException('WRITE_BEHIND_SPOOL이 설정되지 않았습니다.')
+    count = write_behind.spool.requeue(tickets or None)
+    click.echo(f'{count}개 기록을 다시 저장 대기로 돌렸습니다.')
+
+@click.command('build-assets')
+def build_assets_command():
+    """정적 파일 최소화/해시 이름/압축본 생성 (static/dist, 배포 빌드 단계에서 실행)"""
+    manifest = build_assets(current_app.static_folder)
+    for filename, entry in manifest['assets'].items():
+        sizes = ', '.join(f"{encoding} {entry[encoding]:,}B" for encoding in ('br', 'gzip') if encoding in entry)
+        click.echo(f"{filename} -> {entry['file']} ({entry['source_size']:,}B -> {entry['size']:,}B, {sizes})")
+
+@click.command('seed')
+def seed_command():
+    """개발용 테스트 데이터 추가"""
+    init_db()
+    click.echo(f'테스트 데이터 {seed_db()}건을 추가했습니다.')
+
+@click.command('generate-records')
+@click.option('--count', type=click.IntRange(min=1), default=1000000, show_default=True, help='생성할 기록 수')
+@click.option('--students', type=click.IntRange(1, synthetic_records.MAX_STUDENTS), default=3000, show_default=True,
+              help='학생 수')
+@click.option('--start', help='기록 시작 날짜 (YYYY-MM-DD, 기본값: 120일 전)')
+@click.option('--end', help='이 날짜(YYYY-MM-DD) 전까지 생성 (기본값: 오늘)')
+@click.option('--seed', type=int, help='난수 seed (같은 값이면 같은 데이터)')
+@click.option('--batch-size', type=click.IntRange(min=1), default=synthetic_records.DEFAULT_BATCH_SIZE,
+              show_default=True, help='한 번에 적재/커밋할 행 수')
+@click.option('--keep-indexes', is_flag=True,
+              help='records 보조 인덱스를 유지한 채 적재 (기본값: 지웠다가 적재 후 다시 생성 - 그동안 랭킹 조회가 느림)')
+def generate_records_command(count, students, start, end, seed, batch_size, keep_indexes):
+    """벤치마크용 합성 기록 대량 추가 (개발용) - 통계 요약, 최고 기록, 랭킹 버전도 다시 계산"""
+    try:
+        end = parse_export_date(end, 'end') or get_kst_now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start = parse_export_date(start, 'start') or end - timedelta(days=120)
+        batches = synthetic_records.generate_batches(
+            count, synthetic_records.make_students(students, random.Random(seed)), start, end,
+            seed=seed, batch_size=batch_size
+        )
+        init_db()
+        
+        started = time.perf_counter()
+        def progress(loaded):
+            click.echo(f'{loaded:,}/{count:,}건 적재 ({loaded / (time.perf_counter() - started):,.0f}건/초)')
+        loaded = synthetic_records.bulk_load(
+            db.engine, batches, table=Record.__tablename__, progress=progress,
+            deferred_indexes=() if keep_indexes else tuple(Record.__table__.indexes)
+        )
+        load_seconds = time.perf_counter() - started
+    except (RuntimeError, ValueError) as e:
+        raise click.ClickException(str(e))
+    
+    # 대량 적재는 기록마다 요약을 갱신하지 않으므로 한 번에 다시 계산하고 모든 워커의 랭킹 캐시 무효화
+    started = time.perf_counter()
+    rebuild_record_stats()
+    rebuild_personal_bests()
+    for mode in PRACTICE_MODES:
+        bump_cache_version(f'leaderboard:{mode}')
+    db.session.commit()
+    leaderboard_cache.invalidate()
+    click.echo(f'합성 기록 {loaded:,}건 추가: 적재 {load_seconds:.1f}초 ({loaded / load_seconds:,.0f}건/초), '
+               f'통계/최고 기록 재계산 {time.perf_counter() - started:.1f}초')
+
+def enable_auto_init_db(app):
+    """첫 요청 때 한 번 테이블 생성 확인 (워커 시작은 DB와 무관하게 바로 끝남)"""
+    lock = threading.Lock()
+    state = {'done': False}
+    
+    @app.before_request
+    def ensure_database():
+        if state['done']:
+            return
+        with lock:
+            if state['done']:
+                return
+            try:
+                init_db()
+            except Exception as e:
+                # 다음 요청에서 다시 시도
+                logging.error(f"데이터베이스 테이블 생성 실패: {e}")
+                db.session.rollback()
+                return
+            state['done'] = True
+
+# PostgreSQL 연결 옵션 (연결/쿼리가 오래 걸리면 워커를 붙잡지 않도록 제한)
+POSTGRES_CONNECT_ARGS = {
+    "connect_timeout": 10,
+    "options": "-c statement_timeout=30000"
+}
+
+def normalize_database_url(database_url, name):
+    """DB URL 정리 - postgres://를 postgresql://로 변경 (없으면 None)"""
+    if not database_url:
+        return None
+    if database_url.startswith("postgres://"):
+        return database_url.replace("postgres://", "postgresql://", 1)
+    if database_url.startswith("https://"):
+        logging.warning(f"{name}이 HTTPS 형식입니다. PostgreSQL 연결 문자열이 필요합니다.")
+        logging.warning("Supabase에서 올바른 Database URL을 복사해주세요.")
+    return database_url
+
+def create_app(config=None):
+    """Flask 앱 생성
+
+    DB 엔진은 만들기만 하고 연결은 첫 쿼리 때 맺는다. 테이블 생성은 `flask --app main init-db`로
+    미리 하거나, DB_AUTO_INIT=1(기본값)이면 워커별 첫 요청 때 확인한다.
+    """
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-for-development")
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+    
+    # 데이터베이스 설정 (기본 DB = 쓰기 및 읽기 엔진이 없을 때의 모든 쿼리)
+    app.config["SQLALCHEMY_DATABASE_URI"] = normalize_database_url(os.environ.get("DATABASE_URL"), "DATABASE_URL")
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+        "pool_timeout": 10,
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 5)),
+        "max_overflow": 0
+    }
+    app.config["DB_AUTO_INIT"] = os.environ.get("DB_AUTO_INIT", "1") == "1"
+    if config:
+        app.config.update(config)
+    
+    # PostgreSQL 전용 연결 옵션 (로컬 SQLite로 실행할 때는 제외)
+    database_url = app.config["SQLALCHEMY_DATABASE_URI"]
+    if database_url and database_url.startswith("postgresql"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"].setdefault("connect_args", dict(POSTGRES_CONNECT_ARGS))
+    
+    # 요청/DB 계측 - METRICS_ENABLED=1일 때만 훅과 /metrics 등록 (풀 클래스를 바꾸므로 db.init_app 전에)
+    metrics = None
+    if os.environ.get("METRICS_ENABLED") == "1":
+        slow_request_ms = os.environ.get("SLOW_REQUEST_MS")  # 지정하면 이보다 느린 요청을 경고 로그로 남김
+        metrics = Metrics(slow_request_ms=float(slow_request_ms) if slow_request_ms else None)
+        metrics.init_app(app, app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+        metrics.add_gauge('typing_sessions', '저장된 타이핑 세션 수',
+                          lambda: session_store.stats()['live_sessions'])
+        metrics.add_gauge('typing_sessions_memory_bytes', '타이핑 세션 추정 메모리',
+                          lambda: session_store.stats()['memory_bytes'])
+        metrics.add_gauge('rate_limit_rejections', '빈도 제한으로 거부된 요청 수 (워커 시작 후 누적)',
+                          lambda: {(('rule', name),): count for name, count in rate_limiter.rejections.items()})
+        metrics.add_gauge('db_pool_checked_out', '풀별 사용 중인 DB 커넥션 수', lambda: {
+            (('pool', name),): stats['checked_out'] for name, stats in db_pool_stats().items() if stats.get('size') is not None
+        })
+        metrics.add_gauge('db_pool_saturation', '풀별 사용 중인 커넥션 / 최대 커넥션', lambda: {
+            (('pool', name),): stats['saturation'] for name, stats in db_pool_stats().items() if stats.get('size') is not None
+        })
+        metrics.add_gauge('home_fragment_cache', '홈 화면 조각 캐시 조회 결과 (워커 시작 후 누적)', lambda: {
+            (('result', 'hit'),): home_fragments.hits, (('result', 'miss'),): home_fragments.misses
+        })
+        metrics.add_gauge('db_read_fallbacks', '읽기 DB 장애로 기본 DB에서 실행한 조회 수 (워커 시작 후 누적)',
+                          lambda: db_pool_stats().get('read', {}).get('fallbacks', 0))
+    
+    # 읽기 전용 엔진 - DATABASE_READ_URL에 읽기 복제본을 지정하거나, DATABASE_URL과 같은 값을 주면
+    # 같은 DB에 읽기용 풀만 따로 둔다 (랭킹 조회가 몰려도 기록 저장이 커넥션을 기다리지 않음)
+    read_url = normalize_database_url(os.environ.get("DATABASE_READ_URL"), "DATABASE_READ_URL")
+    if read_url:
+        read_options = dict(app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+        read_options.pop("connect_args", None)
+        read_options.update(
+            url=read_url,
+            pool_size=int(os.environ.get("DB_READ_POOL_SIZE", 5)),
+            max_overflow=int(os.environ.get("DB_READ_MAX_OVERFLOW", 5))
+        )
+        if read_url.startswith("postgresql"):
+            read_options["connect_args"] = dict(POSTGRES_CONNECT_ARGS)
+        app.config.setdefault("SQLALCHEMY_BINDS", {})[READ_BIND] = read_options
+    
+    # 데이터베이스 초기화
+    db.init_app(app)
+    if metrics is not None:
+        with app.app_context():
+            for engine in db.engines.values():
+                metrics.instrument_engine(engine)
+    if READ_BIND in app.config["SQLALCHEMY_BINDS"]:
+        ReadRouter(retry_after=float(os.environ.get("DB_READ_RETRY_AFTER", 30))).init_app(app, db)
+    app.register_blueprint(bp)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(archive_records_command)
+    app.cli.add_command(requeue_records_command)
+    app.cli.add_command(build_assets_command)
+    app.cli.add_command(generate_records_command)
+    if app.config["DB_AUTO_INIT"]:
+        enable_auto_init_db(app)
+    
+    # 제출 시 입력 간격 검사를 켰다면 numpy가 없을 때 첫 제출이 아니라 시작할 때 실패
+    if TYPING_ANOMALY_CHECK in ('log', 'reject'):
+        typing_anomaly.require_numpy()
+    
+    # 정적 파일 - 해시 이름(/assets/...)과 미리 압축한 본문, 1년 immutable 캐시
+    # (빌드가 없거나 원본이 바뀌었으면 ASSET_AUTO_BUILD=1일 때 워커 시작 시 static/dist에 빌드)
+    app.add_template_global(asset_url)
+    if os.environ.get("ASSET_PIPELINE", "1") == "1":
+        AssetPipeline(auto_build=os.environ.get("ASSET_AUTO_BUILD", "1") == "1").init_app(app)
+    
+    # 응답 압축 (프록시가 이미 압축하면 RESPONSE_COMPRESSION=0)
+    if os.environ.get("RESPONSE_COMPRESSION", "1") == "1":
+        ResponseCompressor(min_size=int(os.environ.get("COMPRESS_MIN_SIZE", 1024))).init_app(app)
+    
+    # 기록 저장 write-behind (WRITE_BEHIND_SPOOL에 스풀 파일 경로를 지정하면 사용, 작성기 스레드는
+    # 요청을 받는 프로세스에서만 첫 요청 때 시작 - init-db, requeue-records 등 CLI 명령은 스풀만 사용)
+    if os.environ.get("WRITE_BEHIND_SPOOL"):
+        def flush(items):
+            with app.app_context():
+                return flush_spooled_records(items)
+        
+        write_behind = WriteBehindWriter(
+            RecordSpool(os.environ["WRITE_BEHIND_SPOOL"]),
+            flush,
+            batch_size=int(os.environ.get("WRITE_BEHIND_BATCH", 50))
+        )
+        app.extensions['write_behind'] = write_behind
+        app.before_request(write_behind.start)
+        if metrics is not None:
+            metrics.add_gauge('write_behind_records', '스풀 상태별 기록 수', lambda: {
+                (('status', status),): count for status, count in write_behind.spool.counts().items()
+            })
+    
+    # 랭킹 실시간 전송 (LEADERBOARD_STREAM=1이면 /api/records/stream 사용, 구독자마다 연결 하나를 계속 잡으므로
+    # gthread 워커 필요 - gunicorn.conf.py가 선택하고, sync 워커에서는 시작할 때 끔)
+    if os.environ.get("LEADERBOARD_STREAM") == "1":
+        def load_leaderboard(mode):
+            with app.app_context(), reading():
+                return leaderboard_cache.get(mode)
+        
+        def read_versions():
+            with app.app_context(), reading():
+                return read_leaderboard_versions()
+        
+        broadcaster = LeaderboardBroadcaster(
+            load_leaderboard, read_versions,
+            poll_interval=float(os.environ.get("LEADERBOARD_STREAM_POLL", 1.0))
+        )
+        app.extensions['leaderboard_stream'] = broadcaster
+        if metrics is not None:
+            metrics.add_gauge('leaderboard_stream_subscribers', '랭킹 스트림 구독자 수',
+                              broadcaster.subscriber_count)
+    
+    return app
 
 if __name__ == '__main__':
     # 개발 환경에서 디버그 모드로 실행
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    create_app().run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,335 @@
+"""정적 파일 빌드와 제공 (해시 이름 + 미리 압축)
+
+- build_assets(): app.js, leaderboard.js, custom.css를 최소화해 내용 해시가 들어간 이름
+  (js/app.3f2a9c1d0e.js)으로 static/dist/에 쓰고, .gz(과 brotli가 있으면 .br) 압축본과
+  manifest.json을 만든다.
+- AssetPipeline: /assets/<해시 이름>을 Cache-Control: immutable(1년)로 제공하고, Accept-Encoding에
+  따라 미리 만든 .br/.gz를 그대로 보낸다 (요청마다 압축하지 않음).
+- asset_url(): 템플릿에서 원본 경로를 해시 이름 URL로 바꿈. 빌드가 없거나 디버그 모드면 원본
+  /static/ URL을 그대로 쓴다.
+
+최소화는 보수적으로 한다: JS는 주석, 들여쓰기, 빈 줄, 연속 공백만 지우고 줄바꿈은 남겨
+자동 세미콜론 삽입 동작이 바뀌지 않게 하며, CSS는 주석과 구분자 주변 공백만 지운다.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+
+from flask import abort, current_app, request, send_file, url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSETS = ('js/app.js', 'js/leaderboard.js', 'css/custom.css')
+DIST_DIR = 'dist'  # static 폴더 아래 빌드 결과 위치
+MANIFEST_NAME = 'manifest.json'
+BUILD_VERSION = 1  # 최소화/압축 방식을 바꾸면 올림 (기존 빌드를 다시 만듦)
+HASH_LENGTH = 10
+URL_PREFIX = '/assets'
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600  # 이름이 내용 해시이므로 1년 동안 다시 확인하지 않음
+GZIP_LEVEL = 9  # 빌드 때 한 번만 압축하므로 최대 압축
+BROTLI_QUALITY = 11
+COMPRESSED_VARIANTS = (('br', '.br'), ('gzip', '.gz'))  # 선호 순서
+
+# 이 문자나 키워드 뒤의 /는 나눗셈이 아니라 정규식 리터럴의 시작
+REGEX_PRECEDERS = frozenset('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = frozenset({
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'instanceof', 'new', 'delete', 'void',
+    'throw', 'yield', 'await', 'of'
+})
+
+
+def _is_identifier_char(char):
+    return char.isalnum() or char in '_$'
+
+
+def _regex_allowed(out):
+    """출력한 마지막 토큰 뒤에서 /가 정규식 리터럴을 시작하는지"""
+    text = ''.join(out[-32:]).rstrip(' \n')
+    if not text:
+        return True
+    last = text[-1]
+    if last in REGEX_PRECEDERS or last == '}':
+        return True
+    if _is_identifier_char(last):
+        start = len(text)
+        while start > 0 and _is_identifier_char(text[start - 1]):
+            start -= 1
+        return text[start:] in REGEX_KEYWORDS
+    return False
+
+
+def _scan_quoted(source, start, quote):
+    """따옴표 문자열 끝(닫는 따옴표 다음) 위치"""
+    index = start + 1
+    while index < len(source):
+        char = source[index]
+        if char == '\\':
+            index += 2
+            continue
+        if char == quote:
+            return index + 1
+        if char == '\n':
+            break
+        index += 1
+    raise ValueError(f'닫히지 않은 문자열 ({start}번째 문자)')
+
+
+def _scan_regex(source, start):
+    """정규식 리터럴 끝(닫는 / 다음) 위치 - 플래그는 일반 코드로 이어서 처리"""
+    index = start + 1
+    in_class = False
+    while index < len(source):
+        char = source[index]
+        if char == '\\':
+            index += 2
+            continue
+        if char == '\n':
+            break
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            return index + 1
+        index += 1
+    raise ValueError(f'닫히지 않은 정규식 ({start}번째 문자)')
+
+
+def _scan_template(source, start):
+    """템플릿 리터럴 조각 끝 위치와 ${ 로 끝났는지 (`...` 또는 `...${ / }...` 단위)"""
+    index = start + 1
+    while index < len(source):
+        char = source[index]
+        if char == '\\':
+            index += 2
+            continue
+        if char == '`':
+            return index + 1, False
+        if source.startswith('${', index):
+            return index + 2, True
+        index += 1
+    raise ValueError(f'닫히지 않은 템플릿 리터럴 ({start}번째 문자)')
+
+
+def minify_js(source):
+    """JS 주석/들여쓰기/빈 줄/연속 공백 제거 (문자열, 템플릿, 정규식 리터럴은 그대로)"""
+    out = []
+    braces = []  # 열려 있는 템플릿 ${ } 마다 안쪽 중괄호 깊이
+    index, length = 0, len(source)
+    while index < length:
+        char = source[index]
+        if char in ' \t\r':
+            end = index
+            while end < length and source[end] in ' \t\r':
+                end += 1
+            # 줄 처음과 끝의 공백은 버리고, 토큰 사이 공백은 하나로
+            if out and out[-1] not in (' ', '\n') and end < length and source[end] != '\n':
+                out.append(' ')
+            index = end
+        elif char == '\n':
+            while out and out[-1] == ' ':
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append('\n')
+            index += 1
+        elif source.startswith('//', index):
+            end = source.find('\n', index)
+            index = length if end < 0 else end
+        elif source.startswith('/*', index):
+            end = source.find('*/', index + 2)
+            if end < 0:
+                raise ValueError(f'닫히지 않은 주석 ({index}번째 문자)')
+            if out and out[-1] not in (' ', '\n'):
+                out.append(' ')
+            index = end + 2
+        elif char in '"\'':
+            end = _scan_quoted(source, index, char)
+            out.append(source[index:end])
+            index = end
+        elif char == '`' or (char == '}' and braces and braces[-1] == 0):
+            if char == '}':
+                braces.pop()
+            end, opened = _scan_template(source, index)
+            if opened:
+                braces.append(0)
+            out.append(source[index:end])
+            index = end
+        elif char == '/' and _regex_allowed(out):
+            end = _scan_regex(source, index)
+            out.append(source[index:end])
+            index = end
+        else:
+            if braces and char == '{':
+                braces[-1] += 1
+            elif braces and char == '}':
+                braces[-1] -= 1
+            out.append(char)
+            index += 1
+    while out and out[-1] in (' ', '\n'):
+        out.pop()
+    return ''.join(out) + '\n'
+
+
+_CSS_COMMENTS = re.compile(r'/\*.*?\*/|("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', re.S)
+_CSS_STRINGS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+# 선택자의 `a :hover`와 `a:hover`는 다르므로 콜론 주변 공백은 남김
+_CSS_SEPARATORS = re.compile(r' ?([{};,>]) ?')
+
+
+def minify_css(source):
+    """CSS 주석 제거, 공백을 하나로 줄이고 { } ; , > 주변 공백 제거 (문자열은 그대로)"""
+    text = _CSS_COMMENTS.sub(lambda match: match.group(1) or ' ', source)
+    parts = _CSS_STRINGS.split(text)
+    for index in range(0, len(parts), 2):
+        code = re.sub(r'\s+', ' ', parts[index])
+        parts[index] = _CSS_SEPARATORS.sub(r'\1', code).replace(';}', '}')
+    return ''.join(parts).strip() + '\n'
+
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css}
+
+
+def hashed_name(filename, content):
+    """내용 해시가 들어간 파일 이름 (js/app.js -> js/app.<해시>.js)"""
+    stem, extension = os.path.splitext(filename)
+    return f'{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{extension}'
+
+
+def _write_atomic(path, data):
+    # 여러 워커가 동시에 빌드해도 읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일에 쓰고 교체
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as temp:
+            temp.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _source_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_assets(static_folder, filenames=ASSETS):
+    """최소화 + 해시 이름 + 압축본 생성 후 manifest 반환
+
+    이전 빌드 파일은 지우지 않는다 (배포 직후 예전 HTML을 받은 브라우저가 예전 이름을 요청할 수 있음).
+    """
+    dist_folder = os.path.join(static_folder, DIST_DIR)
+    assets = {}
+    for filename in filenames:
+        with open(os.path.join(static_folder, filename), 'rb') as source_file:
+            source = source_file.read()
+        minify = MINIFIERS.get(os.path.splitext(filename)[1])
+        content = minify(source.decode('utf-8')).encode('utf-8') if minify else source
+        output = hashed_name(filename, content)
+        path = os.path.join(dist_folder, output)
+        _write_atomic(path, content)
+        entry = {'file': output, 'source': _source_digest(source),
+                 'source_size': len(source), 'size': len(content)}
+
+        variants = {'gzip': gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(content, quality=BROTLI_QUALITY)
+        for encoding, suffix in COMPRESSED_VARIANTS:
+            data = variants.get(encoding)
+            if data is not None and len(data) < len(content):
+                _write_atomic(path + suffix, data)
+                entry[encoding] = len(data)
+        assets[filename] = entry
+
+    manifest = {'version': BUILD_VERSION, 'assets': assets}
+    _write_atomic(os.path.join(dist_folder, MANIFEST_NAME),
+                  json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+    return manifest
+
+
+def read_manifest(static_folder):
+    """빌드된 manifest (없으면 None)"""
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME), encoding='utf-8') as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(manifest, static_folder, filenames=ASSETS):
+    """manifest가 현재 원본 파일과 빌드 방식으로 만든 것인지"""
+    if manifest is None or manifest.get('version') != BUILD_VERSION:
+        return False
+    assets = manifest.get('assets', {})
+    for filename in filenames:
+        entry = assets.get(filename)
+        if entry is None or not os.path.isfile(os.path.join(static_folder, DIST_DIR, entry['file'])):
+            return False
+        with open(os.path.join(static_folder, filename), 'rb') as source_file:
+            if _source_digest(source_file.read()) != entry['source']:
+                return False
+    return True
+
+
+def asset_url(filename):
+    """템플릿용 정적 파일 URL - 빌드된 파일이 있으면 해시 이름 URL"""
+    pipeline = current_app.extensions.get('assets')
+    if pipeline is not None and not current_app.debug:
+        entry = pipeline.assets.get(filename)
+        if entry is not None:
+            return url_for('assets', filename=entry['file'])
+    return url_for('static', filename=filename)
+
+
+class AssetPipeline:
+    """해시 이름 정적 파일을 immutable 캐시 헤더와 미리 압축한 본문으로 제공"""
+
+    def __init__(self, auto_build=True):
+        self.auto_build = auto_build
+        self.assets = {}  # 원본 경로 -> manifest 항목
+
+    def init_app(self, app):
+        self.assets = self.load(app.static_folder)
+        self.dist_folder = os.path.join(app.static_folder, DIST_DIR)
+        app.add_url_rule(f'{URL_PREFIX}/<path:filename>', 'assets', self.send_asset)
+        app.extensions['assets'] = self
+
+    def load(self, static_folder):
+        """빌드 결과 확인 - 없거나 원본이 바뀌었으면 auto_build일 때 새로 빌드"""
+        manifest = read_manifest(static_folder)
+        if is_current(manifest, static_folder):
+            return manifest['assets']
+        if not self.auto_build:
+            logging.warning("정적 파일 빌드가 없거나 원본과 다름 - 원본 파일 제공 (flask --app main build-assets)")
+            return {}
+        try:
+            return build_assets(static_folder)['assets']
+        except (OSError, ValueError) as e:
+            logging.warning(f"정적 파일 빌드 실패 - 원본 파일 제공: {e}")
+            return {}
+
+    def send_asset(self, filename):
+        path = safe_join(self.dist_folder, filename)
+        if (path is None or filename.endswith(tuple(suffix for _, suffix in COMPRESSED_VARIANTS))
+                or not os.path.isfile(path)):
+            abort(404)
+
+        encodings = [encoding for encoding, suffix in COMPRESSED_VARIANTS if os.path.isfile(path + suffix)]
+        encoding = request.accept_encodings.best_match(encodings) if encodings else None
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if encoding is not None:
+            path += dict(COMPRESSED_VARIANTS)[encoding]
+        response = send_file(path, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE, conditional=True)
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.cache_control.immutable = True
+        return response
@@ -0,0 +1,95 @@
+"""입력 간격 이상 패턴 일괄 검사 마이크로벤치마크
+
+사람 입력(로그정규 간격 + 가끔 멈춤)과 스크립트 입력(일정 간격, 작은 흔들림) 타임라인을
+만들어 typing_anomaly의 판정 결과를 보여주고, 세션 수를 늘려 가며 저장소 전체 일괄 검사
+(score_blobs 한 번)와 세션마다 따로 검사할 때의 세션당 비용을 비교한다. numpy 필요.
+
+    python benchmarks/anomaly.py
+    python benchmarks/anomaly.py --sessions 1000 5000 20000 --keystrokes 1500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from keystroke_timeline import KeystrokeTimeline  # noqa: E402
+from typing_anomaly import score_blobs, score_timeline  # noqa: E402
+
+DISTINCT_TIMELINES = 200  # 서로 다른 타임라인 수 (나머지는 반복해서 세션 수를 채움)
+
+
+def human_interval(rng):
+    interval = rng.lognormvariate(rng.uniform(4.6, 5.6), rng.uniform(0.35, 0.6))
+    if rng.random() < 0.03:
+        interval += rng.uniform(800, 3000)  # 다음 글자를 찾거나 텍스트를 읽는 멈춤
+    return interval
+
+
+def script_interval(rng, base, jitter):
+    return base * rng.uniform(1 - jitter, 1 + jitter)
+
+
+def make_timeline(keystrokes, next_interval):
+    timeline = KeystrokeTimeline()
+    timestamp = 0.0
+    for _ in range(keystrokes):
+        timestamp += next_interval() / 1000
+        timeline.append(timestamp)
+    return timeline
+
+
+def make_blobs(keystrokes, script_share, rng):
+    """(직렬화된 타임라인, 스크립트 여부) 목록"""
+    blobs = []
+    for _ in range(DISTINCT_TIMELINES):
+        if rng.random() < script_share:
+            base, jitter = rng.uniform(80, 250), rng.choice((0.0, 0.05, 0.1, 0.2))
+            timeline = make_timeline(keystrokes, lambda: script_interval(rng, base, jitter))
+            blobs.append((timeline.to_bytes(), True))
+        else:
+            blobs.append((make_timeline(keystrokes, lambda: human_interval(rng)).to_bytes(), False))
+    return blobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='입력 간격 이상 패턴 일괄 검사 벤치마크')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1000, 5000, 10000], help='세션 수')
+    parser.add_argument('--keystrokes', type=int, default=1500, help='세션당 키 입력 수')
+    parser.add_argument('--script-share', type=float, default=0.2, help='스크립트 세션 비율')
+    parser.add_argument('--seed', type=int, default=1, help='난수 seed')
+    args = parser.parse_args(argv)
+
+    samples = make_blobs(args.keystrokes, args.script_share, random.Random(args.seed))
+    results = score_blobs([blob for blob, _ in samples])
+    humans = [result for result, (_, is_script) in zip(results, samples) if not is_script]
+    scripts = [result for result, (_, is_script) in zip(results, samples) if is_script]
+    print(f"판정 ({DISTINCT_TIMELINES}개 타임라인, 세션당 키 입력 {args.keystrokes}개): "
+          f"사람 {sum(r['suspicious'] for r in humans)}/{len(humans)}개 의심, "
+          f"스크립트 {sum(r['suspicious'] for r in scripts)}/{len(scripts)}개 의심")
+
+    print(f"{'세션 수':>8}{'일괄(ms)':>12}{'세션당(µs)':>14}{'개별(µs)':>12}{'배':>8}")
+    for count in args.sessions:
+        blobs = [samples[index % len(samples)][0] for index in range(count)]
+        started = time.perf_counter()
+        score_blobs(blobs)
+        batch = time.perf_counter() - started
+
+        # 세션마다 따로 검사 (제출 시 경로) - 오래 걸리므로 최대 1000개만 재서 환산
+        sample = blobs[:min(count, 1000)]
+        timelines = [KeystrokeTimeline.from_bytes(blob) for blob in sample]
+        started = time.perf_counter()
+        for timeline in timelines:
+            score_timeline(timeline)
+        single = (time.perf_counter() - started) / len(sample)
+
+        print(f"{count:>8}{batch * 1000:>12.1f}{batch / count * 1e6:>14.1f}{single * 1e6:>12.1f}"
+              f"{single / (batch / count):>8.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""교실 부하 테스트
+
+학생 N명이 동시에 연습 화면 진입 → 연습 텍스트 조회 → 키 입력 전송 → 기록 저장 →
+랭킹 조회까지 실제 흐름대로 요청을 보내고, 엔드포인트별 처리량과 p50/p95/p99
+지연 시간, 타이핑 세션 저장소 증가량을 보고한다.
+
+두 가지 방식으로 실행할 수 있다.
+
+1) 프로세스 내부 (Flask 테스트 클라이언트) - 가상 시계로 5분 연습을 몇 초 만에 재현
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/classroom.py --students 30
+
+2) 실행 중인 서버 (gunicorn 등) - 실제 시간으로 진행 (기록 저장 검증 때문에 --duration 300 이상)
+    DATABASE_URL=sqlite:////tmp/bench.db SESSION_STORE_URL=sqlite:////tmp/sessions.db \\
+        gunicorn -w 4 --bind 127.0.0.1:5000 main:app
+    python benchmarks/classroom.py --url http://127.0.0.1:5000 --students 30 --duration 300
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import re
+import resource
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOKEN_PATTERN = re.compile(r"window\.practiceToken = '([^']+)'")
+KEYSTROKE_BATCH_SIZE = 50  # static/js/app.js와 같은 배치 크기
+PRACTICE_DURATION = 300  # 기록 저장에 필요한 연습 시간 (초)
+
+
+class VirtualClock:
+    """time.time()을 대체하는 가상 시계 - 라운드마다 앞으로 건너뜀
+
+    지연 시간 측정은 time.perf_counter()를 쓰므로 영향을 받지 않는다.
+    """
+
+    def __init__(self):
+        self._real_time = time.time
+        self._skew = 0.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self._real_time() + self._skew
+
+    def advance(self, seconds):
+        with self._lock:
+            self._skew += seconds
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def install(self):
+        time.time = self.time
+
+    def uninstall(self):
+        time.time = self._real_time
+
+
+class RealClock:
+    """실제 서버 대상 - 라운드 간격만큼 실제로 기다림"""
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class Recorder:
+    """엔드포인트별 지연 시간/상태 코드 수집"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def add(self, endpoint, seconds, status):
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][status] += 1
+
+
+def percentile(sorted_values, percent):
+    """최근접 순위 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class TestClientTransport:
+    """Flask 테스트 클라이언트 (학생마다 쿠키가 분리된 클라이언트 하나)"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class HttpTransport:
+    """실제 HTTP 서버 (학생마다 쿠키 저장소 하나)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(
+            self.base_url + urllib.parse.quote(path, safe='/?&=%'), data=data, method=method,
+            headers={'Content-Type': 'application/json'} if data is not None else {}
+        )
+        try:
+            with self.opener.open(req, timeout=30) as response:
+                return response.status, response.read().decode('utf-8')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode('utf-8')
+
+
+class Student:
+    """학생 한 명의 연습 흐름"""
+
+    def __init__(self, number, transport, recorder, clock, mode, keystroke_mode, rng):
+        self.student_id = f'{10000 + number:05d} 학생'
+        self.transport = transport
+        self.recorder = recorder
+        self.clock = clock
+        self.mode = mode
+        self.keystroke_mode = keystroke_mode
+        self.rng = rng
+        self.token = None
+        self.seq = 0
+
+    def call(self, endpoint, method, path, body=None):
+        started = time.perf_counter()
+        try:
+            status, text = self.transport.request(method, path, body)
+        except Exception as e:  # 연결 실패 등은 예외 이름으로 집계
+            status, text = type(e).__name__, ''
+        self.recorder.add(endpoint, time.perf_counter() - started, status)
+        return status, text
+
+    def start(self):
+        status, html = self.call('GET /practice/<mode>', 'GET', f'/practice/{self.mode}')
+        match = TOKEN_PATTERN.search(html) if status == 200 else None
+        self.token = match.group(1) if match else None
+        self.call('GET /api/practice-text/<mode>', 'GET', f'/api/practice-text/{self.mode}')
+
+    def type_for(self, seconds, keys):
+        """seconds 동안 keys번 입력한 것처럼 키 입력 전송"""
+        if self.keystroke_mode == 'single':
+            for _ in range(keys):
+                self.call('POST /api/keystroke', 'POST', '/api/keystroke', {'key': 'a'})
+            return
+
+        now_ms = self.clock.time() * 1000
+        gaps = [self.rng.uniform(0.5, 1.5) for _ in range(keys)]
+        scale = seconds * 1000 / sum(gaps)
+        deltas = [int(gap * scale) for gap in gaps]
+        base = now_ms - sum(deltas)
+        for start in range(0, keys, KEYSTROKE_BATCH_SIZE):
+            chunk = deltas[start:start + KEYSTROKE_BATCH_SIZE]
+            self.seq += 1
+            self.call('POST /api/keystrokes', 'POST', '/api/keystrokes', {
+                'seq': self.seq,
+                'base': base,
+                'deltas': [0] + chunk[1:] if start == 0 else chunk,
+                'sent_at': now_ms
+            })
+            base += sum(chunk)
+
+    def finish(self):
+        wpm = self.rng.randint(15, 60)
+        accuracy = round(self.rng.uniform(85, 99.5), 1)
+        self.call('POST /api/records', 'POST', '/api/records', {
+            'student_id': self.student_id,
+            'mode': self.mode,
+            'wpm': wpm,
+            'accuracy': accuracy,
+            'score': round(wpm * (accuracy / 100) ** 2 * 100),
+            'duration_sec': PRACTICE_DURATION,
+            'practice_token': self.token
+        })
+
+    def read_leaderboard(self):
+        self.call('GET /api/records/top', 'GET', f'/api/records/top?mode={self.mode}')
+        self.call('GET /api/records/stats', 'GET', '/api/records/stats')
+        self.call('GET /api/records', 'GET', f'/api/records?mode={self.mode}&limit=100')
+
+
+def session_stats(args, app_module):
+    """타이핑 세션 저장소 게이지"""
+    if app_module is not None:
+        return app_module.session_store.stats()
+    try:
+        status, text = HttpTransport(args.url).request('GET', '/api/admin/session-stats')
+        return json.loads(text) if status == 200 else {}
+    except Exception:
+        return {}
+
+
+def run(args):
+    app_module = None
+    if args.url:
+        clock = RealClock()
+        make_transport = lambda: HttpTransport(args.url)
+    else:
+        sys.path.insert(0, ROOT)
+        os.environ.setdefault('RATE_LIMIT_ENABLED', '0' if args.no_rate_limit else '1')
+        import app as app_module
+        flask_app = app_module.create_app()
+        with flask_app.app_context():
+            app_module.init_db()
+        clock = VirtualClock()
+        make_transport = lambda: TestClientTransport(flask_app)
+
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    students = [
+        Student(number, make_transport(), recorder, clock, args.mode, args.keystroke_mode,
+                random.Random(rng.random()))
+        for number in range(args.students)
+    ]
+    rounds = max(1, args.duration // args.round_seconds)
+    keys_per_round = max(1, round(args.keys_per_minute * args.round_seconds / 60))
+
+    before = session_stats(args, app_module)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    phases = {}
+
+    if isinstance(clock, VirtualClock):
+        clock.install()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency or args.students) as pool:
+            def phase(name, func):
+                started = time.perf_counter()
+                list(pool.map(func, students))
+                phases[name] = time.perf_counter() - started
+
+            phase('start', Student.start)
+            for _ in range(rounds):
+                clock.sleep(args.round_seconds)
+                phase_started = time.perf_counter()
+                list(pool.map(lambda student: student.type_for(args.round_seconds, keys_per_round), students))
+                phases['typing'] = phases.get('typing', 0.0) + time.perf_counter() - phase_started
+            during = session_stats(args, app_module)
+            phase('submit', Student.finish)
+            phase('leaderboard', Student.read_leaderboard)
+    finally:
+        if isinstance(clock, VirtualClock):
+            clock.uninstall()
+
+    after = session_stats(args, app_module)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return build_report(args, recorder, phases, before, during, after, rss_before, rss_after)
+
+
+def build_report(args, recorder, phases, before, during, after, rss_before, rss_after):
+    endpoints = {}
+    busy = sum(phases.values())
+    for endpoint, values in recorder.latencies.items():
+        values = sorted(values)
+        endpoints[endpoint] = {
+            'requests': len(values),
+            'statuses': dict(recorder.statuses[endpoint]),
+            'p50_ms': percentile(values, 50) * 1000,
+            'p95_ms': percentile(values, 95) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+            'max_ms': values[-1] * 1000
+        }
+    total = sum(item['requests'] for item in endpoints.values())
+    return {
+        'target': args.url or 'test-client',
+        'students': args.students,
+        'mode': args.mode,
+        'keystroke_mode': args.keystroke_mode,
+        'requests': total,
+        'busy_seconds': busy,
+        'throughput_rps': total / busy if busy else 0.0,
+        'phases': phases,
+        'endpoints': endpoints,
+        'session_store': {'before': before, 'during': during, 'after': after},
+        # ru_maxrss는 리눅스에서 KB 단위 (프로세스 내부 실행일 때만 의미 있음)
+        'max_rss_kb': {'before': rss_before, 'after': rss_after}
+    }
+
+
+def print_report(report):
+    print(f"대상: {report['target']}  학생: {report['students']}명  모드: {report['mode']}  "
+          f"키 입력: {report['keystroke_mode']}")
+    print(f"요청 {report['requests']}건 / {report['busy_seconds']:.2f}초 "
+          f"= {report['throughput_rps']:.1f} req/s")
+    print()
+    print(f"{'엔드포인트':<32}{'요청':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}  상태")
+    for endpoint, item in sorted(report['endpoints'].items()):
+        statuses = ', '.join(f'{status}:{count}' for status, count in sorted(item['statuses'].items(), key=str))
+        print(f"{endpoint:<32}{item['requests']:>8}{item['p50_ms']:>10.1f}{item['p95_ms']:>10.1f}"
+              f"{item['p99_ms']:>10.1f}{item['max_ms']:>10.1f}  {statuses}")
+    print()
+    store = report['session_store']
+    for label in ('before', 'during', 'after'):
+        stats = store[label] or {}
+        print(f"세션 저장소 {label:<7} 세션 {stats.get('live_sessions', '-')}개, "
+              f"{stats.get('memory_bytes', 0) / 1024:.0f} KB")
+    rss = report['max_rss_kb']
+    print(f"최대 RSS {rss['before'] / 1024:.1f} MB → {rss['after'] / 1024:.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='교실 단위 부하 테스트')
+    parser.add_argument('--url', help='실행 중인 서버 주소 (없으면 프로세스 내부 테스트 클라이언트)')
+    parser.add_argument('--students', type=int, default=30, help='동시 접속 학생 수')
+    parser.add_argument('--concurrency', type=int, help='동시 요청 스레드 수 (기본값: 학생 수)')
+    parser.add_argument('--mode', default='자리', help='연습 모드')
+    parser.add_argument('--keystroke-mode', choices=('batch', 'single'), default='batch',
+                        help='batch: /api/keystrokes 배치 전송, single: 키마다 /api/keystroke')
+    parser.add_argument('--duration', type=int, default=PRACTICE_DURATION, help='연습 시간 (초)')
+    parser.add_argument('--round-seconds', type=int, default=15, help='키 입력 전송 간격 (초)')
+    parser.add_argument('--keys-per-minute', type=int, default=200, help='학생당 분당 키 입력 수')
+    parser.add_argument('--no-rate-limit', action='store_true', help='프로세스 내부 실행 시 빈도 제한 끄기')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""키 입력 기록 재생 채점 마이크로벤치마크
+
+실제 연습 텍스트로 5분 연습(기본 분당 300타, 오타 5%, 오타의 70%는 백스페이스로 고침)의
+이진 키 입력 기록을 만들어 typing_replay.score_keylog()의 세션당 처리 시간을 재고,
+문자마다 입력창을 흉내 내는 단순 구현과 결과/속도를 비교한다.
+
+    python benchmarks/replay.py
+    python benchmarks/replay.py --mode 문단 --cpm 400 --typo-rate 0.1
+"""
+import argparse
+import operator
+import os
+import random
+import sys
+import timeit
+from array import array
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from practice_texts import PracticeTextCorpus  # noqa: E402
+from typing_replay import BACKSPACE, KEYLOG_VERSION, MAX_DELTA_MS, decode_keylog, score_keylog  # noqa: E402
+
+PRACTICE_DURATION = 300  # 초
+TEXT_BATCH_SIZE = 20  # app.MAX_PRACTICE_TEXT_COUNT와 같은 묶음 크기
+
+
+def make_text_loader(corpus, mode, seed):
+    """app.issued_text_loader와 같은 방식으로 번호별 텍스트 생성"""
+    batches = {}
+
+    def text_at(index):
+        batch, offset = divmod(index, TEXT_BATCH_SIZE)
+        if batch not in batches:
+            batches[batch] = corpus.samples(mode, TEXT_BATCH_SIZE, f'{seed}:{batch}')
+        text = batches[batch][offset]
+        return ' '.join(text.split()) if mode == '자리' else text
+
+    return text_at
+
+
+def simulate_session(text_at, cpm, typo_rate, fix_rate, rng):
+    """연습 한 번의 이진 키 입력 기록 생성"""
+    units = array('H', [KEYLOG_VERSION, 0])
+    mean_gap = 60000 / cpm
+    elapsed = 0.0
+    index = 0
+    text = text_at(index)
+    typed = 0
+
+    def press(code):
+        nonlocal elapsed
+        gap = rng.expovariate(1 / mean_gap)
+        elapsed += gap
+        units.extend((min(int(gap), MAX_DELTA_MS), code))
+
+    while elapsed < PRACTICE_DURATION * 1000:
+        expected = text[typed]
+        if rng.random() < typo_rate:
+            press(ord(rng.choice('qwertyuiopasdfghjkl')))
+            # 마지막 글자는 입력하는 순간 다음 텍스트로 넘어가므로 고칠 수 없음
+            if typed < len(text) - 1 and rng.random() < fix_rate:
+                press(ord(BACKSPACE))
+                press(ord(expected))
+        else:
+            press(ord(expected))
+        typed += 1
+        if typed >= len(text):
+            index += 1
+            text = text_at(index)
+            typed = 0
+    if sys.byteorder == 'big':
+        units.byteswap()
+    return units.tobytes()
+
+
+def naive_score(data, text_at):
+    """문자마다 입력창 상태를 갱신하는 단순 구현 (정확성 비교용) - (정타 수, 입력 수)"""
+    first_index, _, typed = decode_keylog(data)
+    index = first_index
+    text = text_at(index)
+    buffer = []
+    correct = total = 0
+    for char in typed:
+        if char == BACKSPACE:
+            if buffer:
+                buffer.pop()
+            continue
+        buffer.append(char)
+        if len(buffer) >= len(text):
+            correct += sum(map(operator.eq, text, buffer))
+            total += len(buffer)
+            buffer = []
+            index += 1
+            text = text_at(index)
+    correct += sum(map(operator.eq, text, buffer))
+    total += len(buffer)
+    return correct, total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='키 입력 기록 재생 채점 벤치마크')
+    parser.add_argument('--mode', default='문장', help='연습 모드')
+    parser.add_argument('--cpm', type=float, default=300, help='분당 입력 수')
+    parser.add_argument('--typo-rate', type=float, default=0.05, help='오타 비율')
+    parser.add_argument('--fix-rate', type=float, default=0.7, help='오타를 백스페이스로 고치는 비율')
+    parser.add_argument('--repeat', type=int, default=2000, help='측정 반복 횟수')
+    parser.add_argument('--seed', type=int, default=1, help='난수 seed')
+    args = parser.parse_args(argv)
+
+    corpus = PracticeTextCorpus.load(os.path.join(ROOT, 'data', 'practice_texts.json'))
+    if not corpus.has_mode(args.mode):
+        print(f'알 수 없는 모드: {args.mode}')
+        return 1
+
+    text_at = make_text_loader(corpus, args.mode, 'bench')
+    data = simulate_session(text_at, args.cpm, args.typo_rate, args.fix_rate, random.Random(args.seed))
+    for index in range(200):
+        text_at(index)  # 텍스트 생성 비용은 측정에서 제외
+
+    result = score_keylog(data, text_at, PRACTICE_DURATION)
+    correct, total = naive_score(data, text_at)
+    if (correct, total) != (result['correct_chars'], result['typed_chars']):
+        print(f"결과 불일치: 재생 {result['correct_chars']}/{result['typed_chars']}, 단순 {correct}/{total}")
+        return 1
+
+    fast = min(timeit.repeat(lambda: score_keylog(data, text_at, PRACTICE_DURATION),
+                             number=args.repeat, repeat=3)) / args.repeat
+    slow = min(timeit.repeat(lambda: naive_score(data, text_at),
+                             number=max(1, args.repeat // 10), repeat=3)) / max(1, args.repeat // 10)
+
+    print(f"모드 {args.mode}, 분당 {args.cpm:.0f}타, 오타 {args.typo_rate:.0%}: "
+          f"키 입력 {result['keystrokes']}개, 기록 {len(data)}바이트, 텍스트 {result['texts']}개")
+    print(f"채점 결과: WPM {result['wpm']}, 정확도 {result['accuracy']}%, 점수 {result['score']} "
+          f"(정타 {result['correct_chars']}/{result['typed_chars']})")
+    print(f"score_keylog: {fast * 1e6:8.1f}µs/세션")
+    print(f"문자 단위 구현: {slow * 1e6:8.1f}µs/세션 ({slow / fast:.1f}배)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""기록 목록 응답 직렬화/압축 마이크로벤치마크
+
+/api/records 전체 보기(최대 10000행) 응답을 기존 방식(Record.to_dict() + jsonify 기본 설정)과
+api_encoding의 객체/열 배열(columnar) 형식으로 만들어 보고, 형식별 본문 크기와
+gzip/brotli 압축 후 크기, 직렬화(+압축) 시간을 비교한다. brotli 결과는 brotli 패키지가
+있을 때만, orjson이 없으면 json.dumps 경로로 측정된다.
+
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --rows 2000 --repeat 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api_encoding  # noqa: E402
+from api_encoding import columnar, compress, dumps  # noqa: E402
+
+# app.RECORD_COLUMNS와 같은 순서 (app을 불러오지 않고 측정)
+RECORD_COLUMNS = ('id', 'student_id', 'mode', 'wpm', 'accuracy', 'score', 'duration_sec', 'created_at')
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN_NAMES = ('민준', '서연', '도윤', '하은', '시우', '지유', '주원', '서윤', '예준', '지민')
+
+
+def make_rows(count, rng):
+    """랭킹 순서로 정렬된 기록 행 튜플"""
+    started = datetime(2026, 3, 2, 9, 0)
+    rows = []
+    for record_id in range(1, count + 1):
+        wpm = rng.randint(30, 400)
+        accuracy = float(rng.randint(70, 100))
+        rows.append((
+            record_id,
+            f'{rng.randint(10101, 31030)} {rng.choice(SURNAMES)}{rng.choice(GIVEN_NAMES)}',
+            '문장', wpm, accuracy, round(wpm * (accuracy / 100) ** 2 * 100), 300,
+            started + timedelta(seconds=rng.randint(0, 90 * 86400), microseconds=rng.randint(0, 999999))
+        ))
+    rows.sort(key=lambda row: (-row[5], -row[4], -row[3], row[7], row[0]))
+    return rows
+
+
+def legacy_body(rows):
+    """기존 응답 - 행마다 to_dict()와 같은 dict, Flask 기본 JSON 설정 (ASCII 이스케이프, 키 정렬)"""
+    records = [
+        {**dict(zip(RECORD_COLUMNS[:-1], row[:-1])), 'created_at': row[-1].isoformat()}
+        for row in rows
+    ]
+    return json.dumps({'success': True, 'mode': '문장', 'records': records},
+                      ensure_ascii=True, sort_keys=True, separators=(',', ':')).encode('ascii')
+
+
+def objects_body(rows):
+    return dumps({'success': True, 'mode': '문장', 'format': 'objects',
+                  'records': [dict(zip(RECORD_COLUMNS, row)) for row in rows]})
+
+
+def columnar_body(rows):
+    return dumps({'success': True, 'mode': '문장', 'format': 'columnar',
+                  'columns': list(RECORD_COLUMNS), 'data': columnar(rows, RECORD_COLUMNS)})
+
+
+def measure(function, repeat):
+    return min(timeit.repeat(function, number=repeat, repeat=3)) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='기록 목록 응답 직렬화/압축 벤치마크')
+    parser.add_argument('--rows', type=int, default=10000, help='기록 수')
+    parser.add_argument('--repeat', type=int, default=10, help='측정 반복 횟수')
+    parser.add_argument('--seed', type=int, default=1, help='난수 seed')
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows, random.Random(args.seed))
+    encodings = [None] + list(reversed(api_encoding.available_encodings()))
+    formats = [
+        ('기존 (to_dict + jsonify)', legacy_body),
+        ('objects', objects_body),
+        ('columnar', columnar_body)
+    ]
+
+    encoder = 'orjson' if api_encoding.orjson is not None else 'json.dumps'
+    print(f"기록 {args.rows}행, 인코더 {encoder}, 압축 {', '.join(encodings[1:])}")
+    print(f"{'형식':<24}{'인코딩':>8}{'크기(KB)':>12}{'시간(ms)':>12}")
+    baseline = None
+    for name, build in formats:
+        body = build(rows)
+        for encoding in encodings:
+            if encoding is None:
+                size = len(body)
+                seconds = measure(lambda: build(rows), args.repeat)
+            else:
+                size = len(compress(body, encoding))
+                seconds = measure(lambda: compress(build(rows), encoding), args.repeat)
+            if baseline is None:
+                baseline = size
+            print(f"{name:<24}{encoding or '없음':>8}{size / 1024:>12.1f}{seconds * 1000:>12.2f}"
+                  f"   ({size / baseline:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
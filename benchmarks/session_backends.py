@@ -0,0 +1,124 @@
+"""세션 저장소 구현별 동작 확인과 처리량 비교
+
+메모리, SQLite, Redis 세션 저장소에 같은 시나리오(세션 생성, 배치 번호가 있는 키 입력
+추가와 중복 배치, 조회, 일괄 읽기, 삭제)를 돌려 결과가 같은지 확인한 뒤, 세션 수를 정해
+키 입력 배치 추가/세션 조회 처리량을 잰다. Redis 서버가 없으면 fakeredis를 client=로
+넘겨 Redis 구현 코드를 그대로 실행한다 (redis, fakeredis 패키지 필요: pip install '.[redis,bench]').
+
+    python benchmarks/session_backends.py
+    python benchmarks/session_backends.py --sessions 500 --batches 40
+    python benchmarks/session_backends.py --redis-url redis://localhost:6379/15
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from session_store import MemorySessionStore, RedisSessionStore, SQLiteSessionStore  # noqa: E402
+
+BATCH_SIZE = 20  # 배치당 키 입력 수 (클라이언트 전송 주기 동안 입력하는 양)
+KEY_INTERVAL = 0.15  # 키 입력 간격 (초)
+
+
+def make_stores(directory, redis_url):
+    """(이름, 저장소) 목록 - redis_url이 없으면 fakeredis 사용"""
+    stores = [
+        ('memory', MemorySessionStore()),
+        ('sqlite', SQLiteSessionStore(os.path.join(directory, 'sessions.db'))),
+    ]
+    if redis_url:
+        stores.append(('redis', RedisSessionStore(redis_url, prefix='bench:')))
+    else:
+        try:
+            import fakeredis
+        except ImportError:
+            print('fakeredis가 없어 Redis 저장소는 건너뜁니다.')
+            return stores
+        stores.append(('redis(fake)', RedisSessionStore(client=fakeredis.FakeRedis(), prefix='bench:')))
+    return stores
+
+
+def scenario(store):
+    """기능 확인 시나리오 - 저장소마다 같아야 하는 결과 목록"""
+    results = []
+    store.create_session('check', 1000.0, 'token')
+    results.append(store.append_keystrokes('check', [1000.5, 1000.7, 1000.9], seq=1))
+    results.append(store.append_keystrokes('check', [1000.5, 1000.7, 1000.9], seq=1))  # 중복 배치
+    results.append(store.append_keystrokes('check', [1001.0, float('nan'), 1001.2], seq=2))
+    session = store.get_session('check')
+    timeline = session['timeline']
+    results.append((session['start_time'], session['token'], session['last_seq'],
+                    timeline.count, round(timeline.span, 6), round(timeline.mean, 6)))
+    results.append(store.has_session('check'))
+    results.append(sorted(session_id for session_id, _ in store.iter_timelines()))
+    try:
+        store.append_keystrokes('missing', [1.0])
+        results.append('no KeyError')
+    except KeyError:
+        results.append('KeyError')
+    store.delete_session('check')
+    results.append((store.has_session('check'), store.get_session('check')))
+    return results
+
+
+def measure(store, sessions, batches):
+    """(배치 추가/초, 조회/초)"""
+    session_ids = [f'bench-{index}' for index in range(sessions)]
+    for session_id in session_ids:
+        store.create_session(session_id, 0.0, 'token')
+
+    started = time.perf_counter()
+    for seq in range(1, batches + 1):
+        base = seq * BATCH_SIZE * KEY_INTERVAL
+        timestamps = [base + index * KEY_INTERVAL for index in range(BATCH_SIZE)]
+        for session_id in session_ids:
+            store.append_keystrokes(session_id, timestamps, seq=seq)
+    append_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for session_id in session_ids:
+        store.get_session(session_id)
+    get_seconds = time.perf_counter() - started
+
+    for session_id in session_ids:
+        store.delete_session(session_id)
+    return sessions * batches / append_seconds, sessions / get_seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='세션 저장소 구현별 동작 확인과 처리량 비교')
+    parser.add_argument('--sessions', type=int, default=200, help='세션 수 (한 교실 ~ 여러 교실)')
+    parser.add_argument('--batches', type=int, default=20, help='세션당 키 입력 배치 수')
+    parser.add_argument('--redis-url', help='실제 Redis 서버 (지정하지 않으면 fakeredis)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        stores = make_stores(directory, args.redis_url)
+        expected = None
+        failed = False
+        for name, store in stores:
+            results = scenario(store)
+            if expected is None:
+                expected = results
+            elif results != expected:
+                print(f'{name}: 동작이 memory 저장소와 다릅니다\n  기대: {expected}\n  결과: {results}')
+                failed = True
+        if failed:
+            return 1
+        print(f"동작 확인: {', '.join(name for name, _ in stores)} 저장소 결과 일치")
+
+        print(f"{'저장소':>12}{'배치 추가/초':>14}{'조회/초':>12}")
+        for name, store in stores:
+            appends, gets = measure(store, args.sessions, args.batches)
+            print(f'{name:>12}{appends:>14,.0f}{gets:>12,.0f}')
+        if not args.redis_url:
+            print('redis(fake)는 프로세스 안에서 흉내 낸 서버라 처리량은 참고용입니다 (네트워크 왕복 없음).')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""읽기/쓰기 DB 엔진 분리
+
+랭킹/통계 조회가 기록 저장과 같은 커넥션 풀을 다투지 않도록 읽기 전용 라우트의 SELECT를
+별도 엔진(읽기 복제본 또는 같은 DB의 별도 풀)으로 보낸다.
+
+- 라우트는 @read_only, 백그라운드 스레드는 `with reading():` 안에서 실행한 SELECT만 읽기 엔진 사용
+- 쓰기, flush 중 쿼리, text() 쿼리는 항상 기본(쓰기) 엔진
+- 읽기 엔진 연결이 실패하면 retry_after초 동안 기본 엔진으로 보낸 뒤 다시 시도
+  (실패한 @read_only 라우트는 기본 엔진으로 한 번 더 실행)
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+READ_BIND = 'read'  # SQLALCHEMY_BINDS 키
+DEFAULT_RETRY_AFTER = 30  # 읽기 엔진 장애 후 다시 시도하기까지 (초)
+
+_reading = ContextVar('db_reading', default=False)
+
+
+@contextmanager
+def reading():
+    """이 블록 안의 SELECT를 읽기 엔진으로 보냄"""
+    token = _reading.set(True)
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+def read_only(view):
+    """읽기 전용 라우트 표시 - 뷰 함수 안의 SELECT를 읽기 엔진으로 보냄"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.pop('db_read_failed', None)
+        with reading():
+            response = view(*args, **kwargs)
+        # 다른 요청의 실패와 섞이지 않도록 이 요청에서 난 실패만 확인 (프로세스 전체 카운터는 쓰지 않음)
+        if g.pop('db_read_failed', False):
+            # 실행 중 읽기 엔진 연결이 실패해 오류 응답일 수 있음 - 기본 엔진으로 다시 실행 (읽기 전용이라 안전)
+            current_app.extensions['db_routing'].db.session.rollback()
+            response = view(*args, **kwargs)
+        return response
+    return wrapper
+
+
+class RoutingSession(Session):
+    """읽기 구간의 SELECT를 읽기 엔진으로 보내는 세션"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _reading.get() and not self._flushing and getattr(clause, 'is_select', False):
+            router = current_app.extensions.get('db_routing')
+            if router is not None:
+                engine = router.read_engine()
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def pool_stats(engine):
+    """커넥션 풀 사용량 - size, checked_out, overflow, capacity, saturation(사용 중 / 최대)"""
+    pool = engine.pool
+    if not hasattr(pool, 'checkedout'):
+        return {}  # SQLite 메모리 DB 등 크기 제한이 없는 풀
+    size = pool.size()
+    max_overflow = getattr(pool, '_max_overflow', 0)
+    checked_out = pool.checkedout()
+    capacity = size + max_overflow if max_overflow >= 0 else None
+    return {
+        'size': size,
+        'checked_out': checked_out,
+        'overflow': max(0, pool.overflow()),
+        'capacity': capacity,
+        'saturation': round(checked_out / capacity, 3) if capacity else 0.0
+    }
+
+
+class ReadRouter:
+    """읽기 엔진 상태 (장애 시 기본 엔진으로 대체)"""
+
+    def __init__(self, retry_after=DEFAULT_RETRY_AFTER):
+        self.retry_after = retry_after
+        self.db = None
+        self.engine = None
+        self.failures = 0  # 읽기 엔진 연결 실패 수
+        self.fallbacks = 0  # 읽기 엔진 장애로 기본 엔진에서 실행한 SELECT 수
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db):
+        """db.init_app() 이후 호출 - SQLALCHEMY_BINDS의 읽기 엔진 연결"""
+        self.db = db
+        with app.app_context():
+            self.engine = db.engines[READ_BIND]
+        event.listen(self.engine, 'handle_error', self._handle_error)
+        app.extensions['db_routing'] = self
+
+    def read_engine(self):
+        """읽기 엔진 (장애 중이면 None)"""
+        if self._down_until and time.monotonic() < self._down_until:
+            with self._lock:
+                self.fallbacks += 1
+            return None
+        return self.engine
+
+    def is_down(self):
+        return time.monotonic() < self._down_until
+
+    def _handle_error(self, context):
+        # 연결 실패나 끊김만 장애로 보고, SQL 오류는 그대로 둠
+        if context.is_disconnect or context.connection is None:
+            # 이벤트는 쿼리를 실행한 스레드에서 호출되므로 g는 실패를 겪은 요청의 것
+            if has_app_context():
+                g.db_read_failed = True
+            with self._lock:
+                self.failures += 1
+                if not self.is_down():
+                    logging.warning(f"읽기 DB 연결 실패 - {self.retry_after}초 동안 기본 DB 사용: "
+                                    f"{context.original_exception}")
+                self._down_until = time.monotonic() + self.retry_after
@@ -0,0 +1,43 @@
+"""렌더링한 템플릿 조각 캐시
+
+홈 화면처럼 대부분이 바뀌지 않는 페이지를 조각별로 렌더링해 두고, 조각마다 넘긴 키
+(랭킹 버전 등)가 바뀔 때만 다시 렌더링한다. 이름마다 가장 최근 키의 결과 하나만 남기므로
+버전이 올라가면 이전 결과는 따로 지우지 않아도 버려진다.
+
+워커 프로세스별 메모리 캐시이며, 다른 워커의 변경은 키(DB에 저장된 버전)로 감지한다.
+"""
+import threading
+
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """이름별 (키, 렌더링 결과) 캐시"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # {이름: (키, Markup)}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, key, render):
+        """name 조각의 key 결과 - 없거나 키가 바뀌었으면 render()로 만들어 저장"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        # 렌더링은 잠금 밖에서 (동시에 같은 조각을 만들면 나중 결과로 덮어씀 - 내용은 같음)
+        fragment = Markup(render())
+        with self._lock:
+            self._entries[name] = (key, fragment)
+        return fragment
+
+    def invalidate(self, name=None):
+        """캐시 비우기 (name이 없으면 전체)"""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
@@ -0,0 +1,27 @@
+"""gunicorn 설정 (Procfile에서 --config로 사용)
+
+LEADERBOARD_STREAM=1이면 구독 중인 브라우저마다 연결을 하나씩 계속 잡으므로 스레드 워커
+(gthread, 워커당 GUNICORN_THREADS개)로 실행한다. 명령줄에서 --worker-class sync 등으로 바꿔
+실행하면 워커 하나가 구독자 하나에 묶이므로, 그런 워커에서는 실시간 랭킹을 끄고 폴링으로
+돌아가게 한다. 워커 수는 gunicorn 기본 동작대로 WEB_CONCURRENCY를 따른다.
+"""
+import logging
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+if os.environ.get("LEADERBOARD_STREAM") == "1":
+    worker_class = "gthread"
+    threads = int(os.environ.get("GUNICORN_THREADS", 32))
+
+# 동시 요청을 처리하지 못하는 워커 (이벤트 루프 워커는 gevent/eventlet 등 별도 클래스)
+BLOCKING_WORKERS = ("SyncWorker",)
+
+
+def post_worker_init(worker):
+    """sync 워커에서는 랭킹 스트림을 끔 (홈 화면은 스트림이 없으면 폴링 사용)"""
+    app = worker.wsgi
+    extensions = getattr(app, "extensions", {})
+    if type(worker).__name__ in BLOCKING_WORKERS and extensions.pop("leaderboard_stream", None) is not None:
+        logging.warning("sync 워커에서는 실시간 랭킹(LEADERBOARD_STREAM)을 사용할 수 없어 끕니다 - "
+                        "gthread 워커로 실행하세요.")
@@ -0,0 +1,152 @@
+"""고정 크기 키 입력 타임라인
+
+키 입력 시각 목록 대신 처음/마지막 시각, 개수, 입력 간격 평균/분산(Welford),
+간격 히스토그램을 키 입력마다 O(1)로 갱신한다. 최근 간격은 밀리초 정수
+링 버퍼에만 남겨 세션 하나가 차지하는 메모리를 몇 KB로 고정한다.
+"""
+import math
+import struct
+from array import array
+
+# 최근 입력 간격을 보관하는 링 버퍼 크기
+RING_SIZE = 512
+
+# 입력 간격 히스토그램 경계 (ms) - 마지막 구간은 5000ms 이상
+HISTOGRAM_EDGES_MS = (25, 50, 75, 100, 150, 200, 300, 500, 1000, 2000, 5000)
+
+# 링 버퍼에 저장할 수 있는 최대 간격 (uint32 ms)
+MAX_INTERVAL_MS = 0xFFFFFFFF
+
+# 직렬화 헤더: count, first, last, mean, m2, ring_pos
+_HEADER = struct.Struct('<QddddI')
+_HISTOGRAM_BYTES = (len(HISTOGRAM_EDGES_MS) + 1) * 4
+_RING_BYTES = RING_SIZE * 4
+
+# 직렬화 레이아웃 (여러 세션을 한 번에 읽는 쪽에서 사용): 헤더, uint32 히스토그램, uint32 링 버퍼
+SERIALIZED_FIELDS = (
+    ('count', '<u8'), ('first', '<f8'), ('last', '<f8'), ('mean', '<f8'), ('m2', '<f8'), ('ring_pos', '<u4'),
+    ('histogram', '<u4', (len(HISTOGRAM_EDGES_MS) + 1,)), ('ring', '<u4', (RING_SIZE,))
+)
+
+
+def _bucket(interval_ms):
+    """간격이 속하는 히스토그램 구간 번호"""
+    for index, edge in enumerate(HISTOGRAM_EDGES_MS):
+        if interval_ms < edge:
+            return index
+    return len(HISTOGRAM_EDGES_MS)
+
+
+class KeystrokeTimeline:
+    """키 입력 타임라인 (시각 단위: 초, 간격 단위: ms)"""
+
+    __slots__ = ('count', 'first', 'last', 'mean', 'm2', 'histogram', 'ring', 'ring_pos')
+
+    def __init__(self):
+        self.count = 0
+        self.first = 0.0
+        self.last = 0.0
+        self.mean = 0.0  # 입력 간격 평균 (ms)
+        self.m2 = 0.0  # 입력 간격 편차 제곱합 (Welford)
+        self.histogram = array('I', bytes(_HISTOGRAM_BYTES))
+        self.ring = array('I', bytes(_RING_BYTES))
+        self.ring_pos = 0
+
+    def append(self, timestamp):
+        """키 입력 시각 하나 추가 (이전 시각보다 앞서면 이전 시각으로 간주, NaN/무한대는 버림)"""
+        # NaN은 max()/비교를 모두 통과해 처음/마지막 시각과 평균/분산을 영구히 오염시킴
+        if not math.isfinite(timestamp):
+            return
+        if self.count == 0:
+            self.first = self.last = timestamp
+            self.count = 1
+            return
+
+        interval = max(0.0, timestamp - self.last) * 1000
+        self.last = max(self.last, timestamp)
+        self.count += 1
+
+        # 입력 간격 평균/분산 갱신
+        n = self.count - 1
+        delta = interval - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (interval - self.mean)
+
+        interval_ms = min(int(round(interval)), MAX_INTERVAL_MS)
+        self.histogram[_bucket(interval_ms)] += 1
+        self.ring[self.ring_pos] = interval_ms
+        self.ring_pos = (self.ring_pos + 1) % RING_SIZE
+
+    def extend(self, timestamps):
+        """키 입력 시각 여러 개 추가"""
+        for timestamp in timestamps:
+            self.append(timestamp)
+
+    @property
+    def span(self):
+        """첫 입력부터 마지막 입력까지의 시간 (초)"""
+        return self.last - self.first if self.count > 1 else 0.0
+
+    @property
+    def interval_count(self):
+        return max(0, self.count - 1)
+
+    @property
+    def interval_variance(self):
+        """입력 간격 표본 분산 (ms^2)"""
+        n = self.interval_count
+        return self.m2 / (n - 1) if n > 1 else 0.0
+
+    @property
+    def interval_std(self):
+        return math.sqrt(self.interval_variance)
+
+    def recent_intervals(self):
+        """링 버퍼에 남은 최근 입력 간격 (오래된 것부터, ms)"""
+        size = min(self.interval_count, RING_SIZE)
+        end = self.ring_pos
+        start = (end - size) % RING_SIZE
+        if size == 0:
+            return array('I')
+        if start < end:
+            return self.ring[start:end]
+        return self.ring[start:] + self.ring[:end]
+
+    def summary(self):
+        """검증/모니터링용 요약"""
+        return {
+            'count': self.count,
+            'first': self.first,
+            'last': self.last,
+            'span': self.span,
+            'interval_mean_ms': self.mean,
+            'interval_std_ms': self.interval_std,
+            'histogram': list(self.histogram)
+        }
+
+    def to_bytes(self):
+        """고정 길이 바이너리로 직렬화"""
+        header = _HEADER.pack(self.count, self.first, self.last, self.mean, self.m2, self.ring_pos)
+        return header + self.histogram.tobytes() + self.ring.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """to_bytes() 결과에서 복원"""
+        timeline = cls()
+        if not data:
+            return timeline
+        (timeline.count, timeline.first, timeline.last,
+         timeline.mean, timeline.m2, timeline.ring_pos) = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        timeline.histogram = array('I', data[offset:offset + _HISTOGRAM_BYTES])
+        offset += _HISTOGRAM_BYTES
+        timeline.ring = array('I', data[offset:offset + _RING_BYTES])
+        return timeline
+
+    def copy(self):
+        return KeystrokeTimeline.from_bytes(self.to_bytes())
+
+    @staticmethod
+    def nbytes():
+        """직렬화 크기 (세션당 고정)"""
+        return _HEADER.size + _HISTOGRAM_BYTES + _RING_BYTES
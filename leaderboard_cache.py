@@ -0,0 +1,85 @@
+"""모드별 상위 N 랭킹 캐시
+
+랭킹은 기록이 저장될 때만 바뀌므로 모드별 상위 N개를 정렬된 리스트로 들고 있다가
+저장 시 한 건씩 끼워 넣는다(write-through). 워커 간 일관성은 DB에 저장된
+모드별 버전 번호로 맞춘다. 다른 워커가 버전을 올렸으면 다시 조회한다.
+"""
+import bisect
+import threading
+import time
+
+
+def ranking_key(record):
+    """랭킹 정렬 키 (점수 desc, 정확도 desc, WPM desc, 날짜 asc - 없으면 맨 뒤, id asc)"""
+    return (-record['score'], -record['accuracy'], -record['wpm'],
+            record['created_at'] is None, record['created_at'] or '', record['id'])
+
+
+class LeaderboardCache:
+    """모드별 상위 N 기록 캐시
+
+    loader(mode, size)는 정렬된 기록 딕셔너리 목록을, version_reader()는
+    {모드: 버전} 딕셔너리를 반환해야 한다. DB 버전은 version_ttl초 동안 재사용한다.
+    """
+
+    def __init__(self, loader, version_reader, size=10, version_ttl=1.0):
+        self.loader = loader
+        self.version_reader = version_reader
+        self.size = size
+        self.version_ttl = version_ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # {mode: (version, [(key, record), ...])}
+        self._versions = {}
+        self._versions_checked = 0.0
+
+    def _current_version(self, mode):
+        now = time.monotonic()
+        if now - self._versions_checked >= self.version_ttl:
+            versions = self.version_reader()
+            with self._lock:
+                self._versions = dict(versions)
+                self._versions_checked = now
+        return self._versions.get(mode, 0)
+
+    def get(self, mode):
+        """(버전, 상위 N 기록 목록) 반환"""
+        version = self._current_version(mode)
+        with self._lock:
+            entry = self._entries.get(mode)
+            if entry is not None and entry[0] == version:
+                return version, [record for _, record in entry[1]]
+
+        records = self.loader(mode, self.size)
+        with self._lock:
+            self._entries[mode] = (version, [(ranking_key(record), record) for record in records])
+        return version, records
+
+    def record_inserted(self, mode, record, new_version):
+        """새 기록 반영 - 캐시가 직전 버전이면 끼워 넣고, 아니면 버림"""
+        self.records_inserted(mode, [record], new_version)
+
+    def records_inserted(self, mode, records, new_version):
+        """한 번의 버전 증가로 저장된 기록 여러 개 반영"""
+        with self._lock:
+            self._versions[mode] = max(self._versions.get(mode, 0), new_version)
+            entry = self._entries.get(mode)
+            if entry is None or entry[0] != new_version - 1:
+                self._entries.pop(mode, None)
+                return
+
+            items = list(entry[1])
+            for record in records:
+                key = ranking_key(record)
+                if len(items) < self.size or key < items[-1][0]:
+                    bisect.insort(items, (key, record), key=lambda item: item[0])
+                    del items[self.size:]
+            self._entries[mode] = (new_version, items)
+
+    def invalidate(self, mode=None):
+        """캐시 비우기 (mode가 없으면 전체) - 다음 조회 때 DB 버전을 다시 확인"""
+        with self._lock:
+            if mode is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(mode, None)
+            self._versions_checked = 0.0
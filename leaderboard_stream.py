@@ -0,0 +1,167 @@
+"""랭킹 변경 실시간 전송 (Server-Sent Events)
+
+워커마다 폴링 스레드 하나가 DB의 모드별 랭킹 버전을 확인하고, 버전이 바뀐 모드의
+상위 N개를 다시 읽어 이전 목록과의 차이(새로 들어온 기록, 순위 이동, 빠진 기록)만
+구독자 큐에 넣는다. 구독자는 큐에서 기다리기만 하므로 구독자가 많아도 DB 조회는
+워커당 한 번이다. 구독자가 없으면 DB를 보지 않는다.
+"""
+import json
+import logging
+import queue
+import threading
+
+DEFAULT_POLL_INTERVAL = 1.0  # DB 버전 확인 간격 (초)
+DEFAULT_QUEUE_SIZE = 32  # 구독자별 대기 이벤트 수 - 넘치면 연결을 끊어 새 스냅샷을 받게 함
+
+# 구독 종료 신호
+CLOSED = object()
+
+
+def diff_rankings(previous, current):
+    """이전/현재 상위 목록 비교 - 현재 순서(id 목록)와 새 기록, 순위 이동, 빠진 기록"""
+    previous_positions = {record['id']: index for index, record in enumerate(previous)}
+    current_ids = [record['id'] for record in current]
+    inserted = []
+    moved = []
+    for index, record in enumerate(current):
+        old_index = previous_positions.get(record['id'])
+        if old_index is None:
+            inserted.append({'position': index, 'record': record})
+        elif old_index != index:
+            moved.append({'id': record['id'], 'from': old_index, 'to': index})
+    current_set = set(current_ids)
+    removed = [record_id for record_id in previous_positions if record_id not in current_set]
+    return {'order': current_ids, 'inserted': inserted, 'moved': moved, 'removed': removed}
+
+
+def format_event(event, data, event_id=None):
+    """SSE 메시지 한 개"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, ensure_ascii=False, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class Subscription:
+    """구독자 한 명의 이벤트 큐"""
+
+    __slots__ = ('mode', 'queue', 'closed')
+
+    def __init__(self, mode, size):
+        self.mode = mode
+        self.queue = queue.Queue(maxsize=size)
+        self.closed = False
+
+    def get(self, timeout):
+        """다음 이벤트 (timeout 안에 없으면 None, 종료되면 CLOSED)"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class LeaderboardBroadcaster:
+    """모드별 랭킹 변경 팬아웃
+
+    version_reader()는 {모드: 버전}, loader(mode)는 (버전, 상위 기록 목록)을 반환해야 한다.
+    둘 다 폴링 스레드에서 호출되므로 필요한 앱 컨텍스트는 호출자가 감싸서 넘긴다.
+    """
+
+    def __init__(self, loader, version_reader, poll_interval=DEFAULT_POLL_INTERVAL,
+                 queue_size=DEFAULT_QUEUE_SIZE):
+        self.loader = loader
+        self.version_reader = version_reader
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = {}  # {mode: set(Subscription)}
+        self._states = {}  # {mode: (버전, 상위 기록 목록)}
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def subscribe(self, mode):
+        """구독 시작 - (구독, 현재 버전, 현재 상위 목록)"""
+        subscription = Subscription(mode, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(mode, set()).add(subscription)
+            state = self._states.get(mode)
+        if state is None:
+            state = self.loader(mode)
+            with self._lock:
+                self._states.setdefault(mode, state)
+        self._ensure_thread()
+        return subscription, state[0], state[1]
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.mode)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.mode]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def notify(self):
+        """이 워커에서 기록이 저장됨 - 다음 폴링을 기다리지 않고 바로 확인"""
+        self._wakeup.set()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='leaderboard-stream', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                self.poll()
+            except Exception as e:
+                logging.error(f"랭킹 변경 확인 실패: {e}")
+
+    def poll(self):
+        """구독자가 있는 모드의 버전 확인 후 변경분 전송"""
+        with self._lock:
+            modes = list(self._subscribers)
+        if not modes:
+            return
+
+        versions = self.version_reader()
+        for mode in modes:
+            with self._lock:
+                previous_version, previous = self._states.get(mode, (None, []))
+            if versions.get(mode, 0) == previous_version:
+                continue
+
+            version, current = self.loader(mode)
+            with self._lock:
+                self._states[mode] = (version, current)
+            if version == previous_version:
+                continue
+            delta = diff_rankings(previous, current)
+            delta.update({'mode': mode, 'version': version})
+            self._publish(mode, format_event('delta', delta, event_id=version))
+
+    def _publish(self, mode, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(mode, ()))
+        for subscription in subscribers:
+            if subscription.closed:
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                # 읽지 못하는 구독자는 끊고, 다시 연결하면 새 스냅샷을 받음
+                subscription.closed = True
+                self.unsubscribe(subscription)
+                try:
+                    subscription.queue.get_nowait()
+                    subscription.queue.put_nowait(CLOSED)
+                except (queue.Empty, queue.Full):
+                    pass
@@ -1,4 +1,6 @@
-from app import app
+from app import create_app
+
+app = create_app()
 
 # Replit에서 실행할 때 사용되는 엔트리 포인트
 if __name__ == '__main__':
@@ -0,0 +1,235 @@
+"""요청/DB 계측과 Prometheus 텍스트 형식 /metrics
+
+라우트별 응답 시간 히스토그램, 요청당 SQL 실행 수/시간(엔진 이벤트), 커넥션 풀
+대기 시간, 저장소 크기 같은 게이지를 모아 /metrics로 노출하고, 느린 요청은 로그로 남긴다.
+
+init_app()을 호출하지 않으면 훅이 하나도 등록되지 않으므로 꺼져 있을 때 비용이 없다.
+Metrics는 앱마다 하나이며, SQL 이벤트와 풀 대기 시간도 instrument_engine()으로 넘긴 그 앱의
+엔진에만 걸린다 (한 프로세스에 앱이 여럿이어도 값이 섞이지 않음).
+값은 워커 프로세스별로 집계된다 (gunicorn 워커가 여럿이면 스크레이프마다 워커 하나의 값).
+"""
+import bisect
+import logging
+import threading
+import time
+
+from flask import Response, g, request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+# 응답 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 요청당 SQL 실행 수 히스토그램 구간
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """누적 구간 히스토그램 (갱신은 Metrics의 잠금 안에서)"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class TimedQueuePool(QueuePool):
+    """커넥션을 얻을 때까지 기다린 시간을 재는 QueuePool (metrics는 Metrics.instrument_engine()이 지정)"""
+
+    metrics = None
+
+    def recreate(self):
+        # engine.dispose()가 만드는 새 풀에도 계측 유지
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_pool_wait(time.perf_counter() - started)
+
+
+class Metrics:
+    """프로세스 내부 계측 저장소"""
+
+    def __init__(self, slow_request_ms=None):
+        self.slow_request_ms = slow_request_ms
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 요청 처리 중인 스레드의 SQL 실행 수/시간
+        self._requests = {}  # {(method, route, status): Histogram}
+        self._request_queries = {}  # {route: Histogram}
+        self._query_duration = Histogram(LATENCY_BUCKETS)
+        self._pool_wait = Histogram(LATENCY_BUCKETS)
+        self._pool_timeouts = 0
+        self._gauges = []  # [(이름, 설명, 함수)]
+        # 같은 엔진에 두 번 등록됐는지 event.contains로 확인할 수 있도록 바운드 메서드를 한 번만 만듦
+        self._engine_listeners = (
+            ('before_cursor_execute', self._before_cursor_execute),
+            ('after_cursor_execute', self._after_cursor_execute),
+            ('handle_error', self._handle_error),
+        )
+
+    # 등록
+    def init_app(self, app, engine_options=None):
+        """요청 훅과 /metrics 엔드포인트 등록 (앱마다 한 번, 다시 호출하면 무시)
+
+        engine_options(SQLALCHEMY_ENGINE_OPTIONS)를 넘기면 엔진 생성 전에 풀 클래스를 바꿔
+        커넥션 대기 시간도 잰다. 엔진이 만들어진 뒤 instrument_engine()을 호출해야 SQL과 풀
+        대기 시간이 이 Metrics에 모인다.
+        """
+        registered = app.extensions.get('metrics')
+        if registered is not None:
+            if registered is not self:
+                raise RuntimeError('이 앱에는 이미 다른 계측이 등록되어 있습니다.')
+            return
+        app.extensions['metrics'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+        if engine_options is not None and 'poolclass' not in engine_options:
+            engine_options['poolclass'] = TimedQueuePool
+
+        app.add_url_rule('/metrics', 'metrics', self.render_response)
+
+    def instrument_engine(self, engine):
+        """엔진의 SQL 실행 이벤트와 (TimedQueuePool이면) 풀 대기 시간을 이 Metrics로 집계"""
+        for name, listener in self._engine_listeners:
+            if not event.contains(engine, name, listener):
+                event.listen(engine, name, listener)
+        if isinstance(engine.pool, TimedQueuePool):
+            engine.pool.metrics = self
+
+    def add_gauge(self, name, help_text, func):
+        """스크레이프할 때 func()로 값을 읽는 게이지 (숫자 또는 {(라벨 이름, 값)...: 숫자})"""
+        self._gauges.append((name, help_text, func))
+
+    # 요청 훅
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        self._local.queries = 0
+        self._local.query_time = 0.0
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        queries = getattr(self._local, 'queries', 0)
+        query_time = getattr(self._local, 'query_time', 0.0)
+        self._local.queries = None  # 요청 밖의 SQL은 요청별 집계에서 제외
+
+        key = (request.method, route, response.status_code)
+        with self._lock:
+            histogram = self._requests.get(key)
+            if histogram is None:
+                histogram = self._requests[key] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(elapsed)
+            histogram = self._request_queries.get(route)
+            if histogram is None:
+                histogram = self._request_queries[route] = Histogram(QUERY_COUNT_BUCKETS)
+            histogram.observe(queries)
+
+        if self.slow_request_ms is not None and elapsed * 1000 >= self.slow_request_ms:
+            logging.warning(
+                f"느린 요청: {request.method} {request.path} {response.status_code} "
+                f"{elapsed * 1000:.1f}ms (SQL {queries}회, {query_time * 1000:.1f}ms)"
+            )
+        return response
+
+    # 엔진 이벤트
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get('metrics_started')
+        if not stack:
+            return
+        elapsed = time.perf_counter() - stack.pop()
+        with self._lock:
+            self._query_duration.observe(elapsed)
+        if getattr(self._local, 'queries', None) is not None:
+            self._local.queries += 1
+            self._local.query_time += elapsed
+
+    def _handle_error(self, context):
+        # 실패한 SQL은 after_cursor_execute가 호출되지 않으므로 시작 시각만 정리
+        if context.connection is not None:
+            stack = context.connection.info.get('metrics_started')
+            if stack:
+                stack.pop()
+
+    def observe_pool_wait(self, seconds):
+        with self._lock:
+            self._pool_wait.observe(seconds)
+
+    # 출력
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self._lock:
+            self._render_histograms(
+                lines, 'http_request_duration_seconds', '라우트별 응답 시간',
+                [((('method', method), ('route', route), ('status', status)), histogram)
+                 for (method, route, status), histogram in sorted(self._requests.items(), key=str)]
+            )
+            self._render_histograms(
+                lines, 'http_request_db_queries', '요청당 SQL 실행 수',
+                [((('route', route),), histogram) for route, histogram in sorted(self._request_queries.items())]
+            )
+            self._render_histograms(lines, 'db_query_duration_seconds', 'SQL 실행 시간',
+                                    [((), self._query_duration)])
+            self._render_histograms(lines, 'db_pool_checkout_wait_seconds', '커넥션 풀 대기 시간',
+                                    [((), self._pool_wait)])
+
+        for name, help_text, func in self._gauges:
+            try:
+                value = func()
+            except Exception as e:
+                logging.error(f"게이지 조회 실패 ({name}): {e}")
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            if isinstance(value, dict):
+                for labels, item in sorted(value.items(), key=str):
+                    lines.append(f'{name}{_labels(labels)} {item}')
+            else:
+                lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histograms(lines, name, help_text, series):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for labels, histogram in series:
+            cumulative = 0
+            for edge, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(labels + (("le", edge),))} {cumulative}')
+            lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {histogram.count}')
+            lines.append(f'{name}_sum{_labels(labels)} {histogram.sum}')
+            lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
+
+    def render_response(self):
+        return Response(self.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
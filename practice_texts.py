@@ -0,0 +1,69 @@
+"""연습 텍스트 코퍼스
+
+연습 텍스트를 데이터 파일(JSON)에서 시작 시 한 번만 읽어 모드별 튜플로 준비해 두고,
+요청마다 시드를 지정할 수 있는 난수 생성기로 O(1)에 뽑는다. 자리 연습처럼 항목을
+섞어 만드는 모드는 항목 풀에서 15-20개를 비복원 추출해 한 줄로 잇는다.
+
+데이터 파일 형식:
+    {"version": 1,
+     "modes": {"자리": {"items": [...], "min_items": 15, "max_items": 20},
+               "낱말": {"texts": [...]}, ...}}
+"""
+import hashlib
+import json
+import random
+
+DEFAULT_MIN_ITEMS = 15
+DEFAULT_MAX_ITEMS = 20
+
+
+class PracticeTextCorpus:
+    """모드별 연습 텍스트 묶음 (읽기 전용이라 워커 스레드 간 공유 가능)"""
+
+    def __init__(self, modes, version):
+        self.version = version  # 파일 내용 해시 - ETag/캐시 키로 사용
+        self._texts = {}
+        self._items = {}
+        for mode, spec in modes.items():
+            if 'items' in spec:
+                items = tuple(spec['items'])
+                low = spec.get('min_items', DEFAULT_MIN_ITEMS)
+                high = min(spec.get('max_items', DEFAULT_MAX_ITEMS), len(items))
+                if not items or low > high:
+                    raise ValueError(f'{mode} 모드의 항목 수가 올바르지 않습니다.')
+                self._items[mode] = (items, low, high)
+            else:
+                texts = tuple(text for text in spec.get('texts', []) if text)
+                if texts:
+                    self._texts[mode] = texts
+
+    @classmethod
+    def load(cls, path):
+        """JSON 데이터 파일에서 코퍼스 생성"""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw.decode('utf-8'))
+        version = f"{data.get('version', 1)}-{hashlib.sha1(raw).hexdigest()[:12]}"
+        return cls(data['modes'], version)
+
+    def has_mode(self, mode):
+        return mode in self._texts or mode in self._items
+
+    def size(self, mode):
+        """모드별 텍스트 (또는 항목) 수"""
+        if mode in self._items:
+            return len(self._items[mode][0])
+        return len(self._texts.get(mode, ()))
+
+    def sample(self, mode, rng=random):
+        """연습 텍스트 하나 선택 (없는 모드는 KeyError)"""
+        if mode in self._items:
+            items, low, high = self._items[mode]
+            return ' '.join(rng.sample(items, rng.randint(low, high)))
+        texts = self._texts[mode]
+        return texts[rng.randrange(len(texts))]
+
+    def samples(self, mode, count=1, seed=None):
+        """연습 텍스트 count개 선택 - 같은 seed면 어느 워커에서든 같은 결과"""
+        rng = random.Random(f'{self.version}:{mode}:{seed}') if seed is not None else random.Random()
+        return [self.sample(mode, rng) for _ in range(count)]
@@ -0,0 +1,269 @@
+"""슬라이딩 윈도우 요청 빈도 제한
+
+키마다 현재/직전 고정 창의 요청 수 두 개만 저장하고, 직전 창의 수를 겹치는 비율만큼
+가중해 슬라이딩 윈도우 요청 수를 추정한다 (sliding window counter). 검사와 기록이
+모두 O(1)이고 키당 저장 공간도 일정하다.
+
+카운터 저장소는 세션 저장소와 같은 URL 형식으로 고른다.
+memory://(워커별), sqlite:///경로(같은 서버의 워커 간 공유), redis://(서버 간 공유)
+"""
+import functools
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from flask import jsonify
+
+# 만료 카운터 정리 최소 간격 (초)
+PURGE_INTERVAL = 60
+
+
+def evaluate_window(current, previous, elapsed, window, limit):
+    """요청 하나를 더 허용할 수 있는지와 재시도까지 남은 시간(초) 계산
+
+    current/previous: 현재/직전 창의 요청 수, elapsed: 현재 창 시작 후 지난 시간
+    """
+    weight = 1 - elapsed / window
+    if previous * weight + current + 1 <= limit:
+        return True, 0
+
+    if current + 1 > limit:
+        # 현재 창만으로도 가득 참 - 다음 창에서 현재 창의 가중치가 충분히 줄어들 때까지
+        wait = (window - elapsed) + window * (1 - (limit - 1) / current)
+    else:
+        # 직전 창의 가중치가 줄어들 때까지
+        wait = window * (1 - (limit - 1 - current) / previous) - elapsed
+    return False, max(1, math.ceil(wait))
+
+
+class RateLimitStorage:
+    """카운터 저장소 공통 인터페이스"""
+
+    backend = None
+
+    def hit(self, key, limit, window, now):
+        """요청 하나 기록 시도 - (허용 여부, 재시도까지 남은 초) 반환
+
+        거부된 요청은 세지 않는다.
+        """
+        raise NotImplementedError
+
+
+class MemoryRateLimitStorage(RateLimitStorage):
+    """프로세스 내부 딕셔너리 저장소 (워커마다 따로 셈)"""
+
+    backend = 'memory'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  # {key: [창 번호, 현재 창 요청 수, 직전 창 요청 수, 만료 시각]}
+        self._next_purge = 0.0
+
+    def hit(self, key, limit, window, now):
+        index, elapsed = divmod(now, window)
+        with self._lock:
+            if now >= self._next_purge:
+                self._purge(now)
+
+            counter = self._counters.get(key)
+            if counter is None or counter[0] < index - 1:
+                current, previous = 0, 0
+            elif counter[0] == index - 1:
+                current, previous = 0, counter[1]
+            else:
+                current, previous = counter[1], counter[2]
+
+            allowed, retry_after = evaluate_window(current, previous, elapsed, window, limit)
+            if allowed:
+                current += 1
+            self._counters[key] = [index, current, previous, (index + 2) * window]
+            return allowed, retry_after
+
+    def _purge(self, now):
+        """두 창이 모두 지난 카운터 정리 (PURGE_INTERVAL마다 분할 상환)"""
+        self._next_purge = now + PURGE_INTERVAL
+        expired = [key for key, counter in self._counters.items() if counter[3] <= now]
+        for key in expired:
+            del self._counters[key]
+
+
+class SQLiteRateLimitStorage(RateLimitStorage):
+    """SQLite 파일 저장소 (같은 서버의 여러 워커 프로세스가 공유)"""
+
+    backend = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._next_purge = 0.0
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                window_index INTEGER NOT NULL,
+                current INTEGER NOT NULL,
+                previous INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def _connection(self):
+        """스레드별 연결 (WAL 모드, 트랜잭션은 직접 관리)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, limit, window, now):
+        index, elapsed = divmod(now, window)
+        index = int(index)
+        conn = self._connection()
+        # 읽기-계산-쓰기 사이에 다른 워커가 끼어들지 않도록 쓰기 잠금을 먼저 잡음
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if now >= self._next_purge:
+                self._next_purge = now + PURGE_INTERVAL
+                conn.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+
+            row = conn.execute(
+                'SELECT window_index, current, previous FROM rate_limits WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row[0] < index - 1:
+                current, previous = 0, 0
+            elif row[0] == index - 1:
+                current, previous = 0, row[1]
+            else:
+                current, previous = row[1], row[2]
+
+            allowed, retry_after = evaluate_window(current, previous, elapsed, window, limit)
+            if allowed:
+                current += 1
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limits (key, window_index, current, previous, expires_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, index, current, previous, (index + 2) * window)
+            )
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return allowed, retry_after
+
+
+class RedisRateLimitStorage(RateLimitStorage):
+    """Redis 저장소 (여러 서버 간 공유) - 창마다 키 하나, EXPIRE로 자동 정리"""
+
+    backend = 'redis'
+
+    def __init__(self, url=None, client=None, prefix='typing:ratelimit:'):
+        # redis 패키지는 가져오는 데 시간이 걸리므로 Redis 저장소를 쓸 때만 불러옴
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Redis 빈도 제한 저장소를 사용하려면 redis 패키지가 필요합니다 (pip install '.[redis]').")
+        self._watch_error = redis.WatchError
+        if client is None:
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key, limit, window, now):
+        index, elapsed = divmod(now, window)
+        index = int(index)
+        current_key = f'{self.prefix}{key}:{index}'
+        previous_key = f'{self.prefix}{key}:{index - 1}'
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    # 확인과 증가를 하나의 트랜잭션으로 처리 (낙관적 잠금)
+                    pipe.watch(current_key)
+                    current, previous = pipe.mget(current_key, previous_key)
+                    allowed, retry_after = evaluate_window(
+                        int(current or 0), int(previous or 0), elapsed, window, limit
+                    )
+                    if not allowed:
+                        return False, retry_after
+
+                    pipe.multi()
+                    pipe.incr(current_key)
+                    pipe.expire(current_key, int(window * 2) + 1)
+                    pipe.execute()
+                    return True, 0
+                except self._watch_error:
+                    continue
+
+
+def create_rate_limit_storage(url=None):
+    """저장소 URL로 구현 선택 - memory://, sqlite:///경로, redis://호스트"""
+    url = url or 'memory://'
+    scheme = urlparse(url).scheme
+
+    if scheme == 'memory':
+        return MemoryRateLimitStorage()
+    if scheme == 'sqlite':
+        path = url[len('sqlite:///'):] if url.startswith('sqlite:///') else url[len('sqlite://'):]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return SQLiteRateLimitStorage(path)
+    if scheme in ('redis', 'rediss', 'unix'):
+        return RedisRateLimitStorage(url)
+
+    logging.warning(f"알 수 없는 빈도 제한 저장소 URL입니다: {url} - 메모리 저장소를 사용합니다.")
+    return MemoryRateLimitStorage()
+
+
+class RateLimiter:
+    """이름별 제한 규칙을 저장소에 적용
+
+    라우트에는 @limiter.limit(...) 데코레이터로 선언하고, 요청 본문을 읽은 뒤에야
+    키를 알 수 있는 경우에는 limiter.hit(...)을 직접 호출한다.
+    """
+
+    def __init__(self, storage, enabled=True):
+        self.storage = storage
+        self.enabled = enabled
+        self.rejections = defaultdict(int)  # {규칙 이름: 거부 횟수} (워커별, 모니터링용)
+
+    def hit(self, name, key, limit, window, now=None):
+        """(허용 여부, 재시도까지 남은 초) 반환 - 저장소 오류 시에는 허용"""
+        if not self.enabled:
+            return True, 0
+        try:
+            allowed, retry_after = self.storage.hit(f'{name}:{key}', limit, window, now or time.time())
+        except Exception as e:
+            logging.error(f"빈도 제한 확인 실패: {e}")
+            return True, 0
+        if not allowed:
+            self.rejections[name] += 1
+        return allowed, retry_after
+
+    def limit(self, name, limit, window, key_func, message=None):
+        """라우트 데코레이터 - 초과 시 429와 Retry-After 헤더 반환"""
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapped(*args, **kwargs):
+                allowed, retry_after = self.hit(name, key_func(), limit, window)
+                if not allowed:
+                    return too_many_requests(message or '요청이 너무 많습니다. 잠시 후 다시 시도하세요.',
+                                             retry_after, limit)
+                return view(*args, **kwargs)
+            return wrapped
+        return decorator
+
+
+def too_many_requests(message, retry_after, limit=None):
+    """429 응답 (Retry-After 헤더 포함)"""
+    response = jsonify({'error': message, 'retry_after': retry_after})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    if limit is not None:
+        response.headers['RateLimit-Limit'] = str(limit)
+    return response
@@ -0,0 +1,568 @@
+"""타이핑 세션 저장소
+
+여러 gunicorn 워커가 같은 타이핑 세션을 보도록 공통 인터페이스 뒤에
+메모리, SQLite(로컬 워커 간 공유), Redis 구현을 둔다.
+버려진 세션은 TTL, 최대 개수, 최대 용량 기준으로 정리한다.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from keystroke_timeline import KeystrokeTimeline
+
+# 세션 수명 관리 기본값
+DEFAULT_SESSION_TTL = 3600  # 마지막 사용 후 1시간이 지나면 만료
+DEFAULT_MAX_ENTRIES = 10000  # 최대 세션 수
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 최대 세션 메모리 (추정치)
+DEFAULT_SWEEP_INTERVAL = 30  # 정리 작업 최소 간격 (초)
+
+# 세션 하나의 추정 메모리 사용량 (세션 딕셔너리 기본 크기 + 고정 크기 타임라인)
+SESSION_OVERHEAD_BYTES = 600
+SESSION_BYTES = SESSION_OVERHEAD_BYTES + KeystrokeTimeline.nbytes()
+
+
+class SessionStore:
+    """세션 저장소 공통 인터페이스
+
+    ttl이 지난 세션은 만료되고, max_entries/max_bytes를 넘으면 가장 오래 쓰이지 않은
+    세션부터 밀어낸다. 정리는 쓰기 요청 중에 sweep_interval마다 나눠서 수행하며,
+    start_sweeper()로 백그라운드 스레드에서 돌릴 수도 있다.
+    """
+
+    def __init__(self, ttl=DEFAULT_SESSION_TTL, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, sweep_interval=DEFAULT_SWEEP_INTERVAL):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._sweeper = None
+
+    def create_session(self, session_id, start_time, token):
+        """새 타이핑 세션 생성"""
+        raise NotImplementedError
+
+    def get_session(self, session_id):
+        """세션 조회 - {'start_time', 'token', 'last_seq', 'timeline'} 또는 None
+
+        timeline은 KeystrokeTimeline 사본이다.
+        """
+        raise NotImplementedError
+
+    def has_session(self, session_id):
+        """세션 존재 여부"""
+        return self.get_session(session_id) is not None
+
+    def append_keystrokes(self, session_id, timestamps, seq=None):
+        """키 입력 추가 - (추가 여부, 누적 키 입력 수) 반환, 세션이 없으면 KeyError
+
+        seq가 주어지면 마지막 배치 번호 이하인 배치는 무시한다.
+        """
+        raise NotImplementedError
+
+    def delete_session(self, session_id):
+        """세션 삭제"""
+        raise NotImplementedError
+
+    def session_count(self):
+        """현재 저장된 세션 수"""
+        raise NotImplementedError
+
+    def iter_timelines(self):
+        """살아 있는 모든 세션의 (세션 id, 직렬화된 타임라인) - 관리자 일괄 검사용"""
+        raise NotImplementedError
+
+    def sweep(self, now=None):
+        """만료 세션/제출 기록 정리 및 용량 제한 적용"""
+        raise NotImplementedError
+
+    def stats(self):
+        """게이지 - live_sessions, memory_bytes, evictions, expirations"""
+        raise NotImplementedError
+
+    def _maybe_sweep(self, now):
+        """sweep_interval마다 한 번씩만 정리 (요청 처리 중 분할 상환)"""
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            try:
+                self.sweep(now)
+            except Exception as e:
+                logging.error(f"세션 정리 실패: {e}")
+
+    def start_sweeper(self, interval=None):
+        """백그라운드 정리 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._sweeper is not None:
+            return
+        interval = interval or self.sweep_interval
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logging.error(f"세션 정리 실패: {e}")
+
+        self._sweeper = threading.Thread(target=run, name='session-sweeper', daemon=True)
+        self._sweeper.start()
+
+
+class MemorySessionStore(SessionStore):
+    """프로세스 내부 딕셔너리 저장소 (단일 워커용)
+
+    세션은 마지막 사용 순서(LRU)로 정렬되어 있어 앞쪽부터 만료/제거한다.
+    """
+
+    def __init__(self, **limits):
+        super().__init__(**limits)
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # {session_id: {'timeline': KeystrokeTimeline, 'start_time': timestamp, ...}}
+        self.evictions = 0
+        self.expirations = 0
+
+    def _touch(self, session_id, data, now):
+        """만료 시각 연장 후 LRU 맨 뒤로 이동"""
+        data['expires_at'] = now + self.ttl
+        self._sessions.move_to_end(session_id)
+
+    def _pop(self, session_id):
+        return self._sessions.pop(session_id, None)
+
+    def _live(self, session_id, now):
+        """만료되지 않은 세션 반환 (만료됐으면 제거)"""
+        data = self._sessions.get(session_id)
+        if data is not None and data['expires_at'] <= now:
+            self._pop(session_id)
+            self.expirations += 1
+            return None
+        return data
+
+    def create_session(self, session_id, start_time, token):
+        now = time.time()
+        with self._lock:
+            self._pop(session_id)
+            data = {
+                'timeline': KeystrokeTimeline(),
+                'start_time': start_time,
+                'token': token,
+                'last_seq': 0
+            }
+            self._sessions[session_id] = data
+            self._touch(session_id, data, now)
+            self._sweep_locked(now)
+
+    def get_session(self, session_id):
+        now = time.time()
+        with self._lock:
+            data = self._live(session_id, now)
+            if data is None:
+                return None
+            self._touch(session_id, data, now)
+            return {
+                'start_time': data['start_time'],
+                'token': data['token'],
+                'last_seq': data['last_seq'],
+                'timeline': data['timeline'].copy()
+            }
+
+    def has_session(self, session_id):
+        with self._lock:
+            return self._live(session_id, time.time()) is not None
+
+    def append_keystrokes(self, session_id, timestamps, seq=None):
+        now = time.time()
+        with self._lock:
+            data = self._live(session_id, now)
+            if data is None:
+                raise KeyError(session_id)
+            self._touch(session_id, data, now)
+            timeline = data['timeline']
+            if seq is not None:
+                if seq <= data['last_seq']:
+                    return False, timeline.count
+                data['last_seq'] = seq
+
+            timeline.extend(timestamps)
+            self._sweep_locked(now)
+            return True, timeline.count
+
+    def delete_session(self, session_id):
+        with self._lock:
+            self._pop(session_id)
+
+    def session_count(self):
+        return len(self._sessions)
+
+    def iter_timelines(self):
+        now = time.time()
+        with self._lock:
+            timelines = [
+                (session_id, data['timeline'].to_bytes())
+                for session_id, data in self._sessions.items() if data['expires_at'] > now
+            ]
+        return iter(timelines)
+
+    def sweep(self, now=None):
+        with self._lock:
+            self._sweep_locked(now or time.time())
+
+    def _sweep_locked(self, now):
+        # 만료 세션 정리 (LRU 순서라 앞쪽만 확인하면 됨)
+        while self._sessions:
+            session_id, data = next(iter(self._sessions.items()))
+            if data['expires_at'] > now:
+                break
+            self._pop(session_id)
+            self.expirations += 1
+
+        # 개수/용량 제한 초과 시 가장 오래 쓰이지 않은 세션부터 제거
+        while self._sessions and (len(self._sessions) > self.max_entries or
+                                  len(self._sessions) * SESSION_BYTES > self.max_bytes):
+            self._pop(next(iter(self._sessions)))
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'live_sessions': len(self._sessions),
+                'memory_bytes': len(self._sessions) * SESSION_BYTES,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite 파일 저장소 (같은 서버의 여러 워커 프로세스가 공유)
+
+    정리 카운터도 파일에 저장하여 워커 전체 합계를 보여준다.
+    """
+
+    def __init__(self, path, **limits):
+        super().__init__(**limits)
+        self.path = path
+        self._local = threading.local()
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS typing_sessions (
+                session_id TEXT PRIMARY KEY,
+                start_time REAL NOT NULL,
+                token TEXT NOT NULL,
+                last_seq INTEGER NOT NULL DEFAULT 0,
+                last_access REAL NOT NULL DEFAULT 0,
+                timeline BLOB
+            );
+            CREATE INDEX IF NOT EXISTS ix_typing_sessions_access ON typing_sessions (last_access);
+            CREATE TABLE IF NOT EXISTS store_counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+
+    def _connection(self):
+        """스레드별 연결 (WAL 모드, 트랜잭션은 직접 관리)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _connect(self, write=True):
+        """트랜잭션 컨텍스트 (쓰기면 잠금을 먼저 잡음)"""
+        return _Transaction(self._connection(), 'BEGIN IMMEDIATE' if write else 'BEGIN')
+
+    def create_session(self, session_id, start_time, token):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO typing_sessions (session_id, start_time, token, last_access, timeline) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (session_id, start_time, token, now, KeystrokeTimeline().to_bytes())
+            )
+        self._maybe_sweep(now)
+
+    def get_session(self, session_id):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT start_time, token, last_seq, timeline FROM typing_sessions '
+                'WHERE session_id = ? AND last_access > ?',
+                (session_id, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                'UPDATE typing_sessions SET last_access = ? WHERE session_id = ?', (now, session_id)
+            )
+        return {
+            'start_time': row[0],
+            'token': row[1],
+            'last_seq': row[2],
+            'timeline': KeystrokeTimeline.from_bytes(row[3])
+        }
+
+    def has_session(self, session_id):
+        with self._connect(write=False) as conn:
+            row = conn.execute(
+                'SELECT 1 FROM typing_sessions WHERE session_id = ? AND last_access > ?',
+                (session_id, time.time() - self.ttl)
+            ).fetchone()
+        return row is not None
+
+    def append_keystrokes(self, session_id, timestamps, seq=None):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT last_seq, timeline FROM typing_sessions '
+                'WHERE session_id = ? AND last_access > ?',
+                (session_id, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                raise KeyError(session_id)
+            last_seq, blob = row
+            timeline = KeystrokeTimeline.from_bytes(blob)
+            if seq is not None and seq <= last_seq:
+                return False, timeline.count
+
+            # 고정 크기 타임라인을 읽고 고쳐 쓰므로 배치 크기와 무관하게 한 행만 갱신
+            timeline.extend(timestamps)
+            conn.execute(
+                'UPDATE typing_sessions SET last_seq = ?, timeline = ?, last_access = ? '
+                'WHERE session_id = ?',
+                (seq if seq is not None else last_seq, timeline.to_bytes(), now, session_id)
+            )
+        self._maybe_sweep(now)
+        return True, timeline.count
+
+    def delete_session(self, session_id):
+        with self._connect() as conn:
+            _delete_sessions(conn, [session_id])
+
+    def session_count(self):
+        with self._connect(write=False) as conn:
+            return conn.execute('SELECT COUNT(*) FROM typing_sessions').fetchone()[0]
+
+    def iter_timelines(self):
+        with self._connect(write=False) as conn:
+            rows = conn.execute(
+                'SELECT session_id, timeline FROM typing_sessions WHERE last_access > ?',
+                (time.time() - self.ttl,)
+            ).fetchall()
+        return iter(rows)
+
+    def sweep(self, now=None):
+        now = now or time.time()
+        with self._connect() as conn:
+            # 만료 세션 정리
+            expired = [session_id for (session_id,) in conn.execute(
+                'SELECT session_id FROM typing_sessions WHERE last_access <= ?', (now - self.ttl,)
+            )]
+            _delete_sessions(conn, expired)
+
+            # 개수/용량 제한 초과 시 가장 오래 쓰이지 않은 세션부터 제거
+            (count,) = conn.execute('SELECT COUNT(*) FROM typing_sessions').fetchone()
+            limit = min(self.max_entries, self.max_bytes // SESSION_BYTES)
+            evicted = []
+            if count > limit:
+                evicted = [session_id for (session_id,) in conn.execute(
+                    'SELECT session_id FROM typing_sessions ORDER BY last_access LIMIT ?',
+                    (count - limit,)
+                ).fetchall()]
+                _delete_sessions(conn, evicted)
+
+            for name, value in (('expirations', len(expired)), ('evictions', len(evicted))):
+                if value:
+                    conn.execute(
+                        'INSERT INTO store_counters (name, value) VALUES (?, ?) '
+                        'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                        (name, value)
+                    )
+
+    def stats(self):
+        with self._connect(write=False) as conn:
+            (count,) = conn.execute('SELECT COUNT(*) FROM typing_sessions').fetchone()
+            counters = dict(conn.execute('SELECT name, value FROM store_counters'))
+        return {
+            'backend': 'sqlite',
+            'live_sessions': count,
+            'memory_bytes': count * SESSION_BYTES,
+            'evictions': counters.get('evictions', 0),
+            'expirations': counters.get('expirations', 0)
+        }
+
+
+def _delete_sessions(conn, session_ids):
+    """세션 삭제"""
+    conn.executemany(
+        'DELETE FROM typing_sessions WHERE session_id = ?', [(session_id,) for session_id in session_ids]
+    )
+
+
+class _Transaction:
+    """BEGIN ~ COMMIT/ROLLBACK 컨텍스트 (BEGIN IMMEDIATE는 쓰기 잠금을 먼저 잡아 원자성 보장)"""
+
+    def __init__(self, conn, begin):
+        self.conn = conn
+        self.begin = begin
+
+    def __enter__(self):
+        self.conn.execute(self.begin)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+class RedisSessionStore(SessionStore):
+    """Redis 저장소 (여러 서버 간 공유)
+
+    client에 redis.Redis 호환 객체(예: 테스트용 fakeredis)를 직접 넘길 수 있다.
+    만료는 키마다 EXPIRE로 처리하고, 개수/용량 제한은 Redis 서버의
+    maxmemory / maxmemory-policy(allkeys-lru) 설정에 맡긴다.
+    """
+
+    def __init__(self, url=None, client=None, prefix='typing:', **limits):
+        super().__init__(**limits)
+        # redis 패키지는 가져오는 데 시간이 걸리므로 Redis 저장소를 쓸 때만 불러옴
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Redis 세션 저장소를 사용하려면 redis 패키지가 필요합니다 (pip install '.[redis]').")
+        self._watch_error = redis.WatchError
+        if client is None:
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def _session_key(self, session_id):
+        return f'{self.prefix}session:{session_id}'
+
+    def create_session(self, session_id, start_time, token):
+        session_key = self._session_key(session_id)
+        pipe = self.client.pipeline()
+        pipe.delete(session_key)
+        pipe.hset(session_key, mapping={
+            'start_time': repr(start_time),
+            'token': token,
+            'last_seq': 0,
+            'timeline': KeystrokeTimeline().to_bytes()
+        })
+        pipe.expire(session_key, self.ttl)
+        pipe.execute()
+
+    def get_session(self, session_id):
+        session_key = self._session_key(session_id)
+        pipe = self.client.pipeline()
+        pipe.hgetall(session_key)
+        pipe.expire(session_key, self.ttl)
+        meta, _ = pipe.execute()
+        if not meta:
+            return None
+        meta = {_text(k): v for k, v in meta.items()}
+        return {
+            'start_time': float(meta['start_time']),
+            'token': _text(meta['token']),
+            'last_seq': int(meta['last_seq']),
+            'timeline': KeystrokeTimeline.from_bytes(meta['timeline'])
+        }
+
+    def has_session(self, session_id):
+        return bool(self.client.exists(self._session_key(session_id)))
+
+    def append_keystrokes(self, session_id, timestamps, seq=None):
+        session_key = self._session_key(session_id)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    # 배치 번호 확인과 타임라인 갱신을 하나의 트랜잭션으로 처리 (낙관적 잠금)
+                    pipe.watch(session_key)
+                    last_seq, blob = pipe.hmget(session_key, 'last_seq', 'timeline')
+                    if last_seq is None:
+                        raise KeyError(session_id)
+                    timeline = KeystrokeTimeline.from_bytes(blob)
+                    if seq is not None and seq <= int(last_seq):
+                        return False, timeline.count
+
+                    timeline.extend(timestamps)
+                    pipe.multi()
+                    pipe.hset(session_key, 'timeline', timeline.to_bytes())
+                    if seq is not None:
+                        pipe.hset(session_key, 'last_seq', seq)
+                    pipe.expire(session_key, self.ttl)
+                    pipe.execute()
+                    return True, timeline.count
+                except self._watch_error:
+                    continue
+
+    def delete_session(self, session_id):
+        self.client.delete(self._session_key(session_id))
+
+    def session_count(self):
+        return sum(1 for _ in self.client.scan_iter(match=f'{self.prefix}session:*'))
+
+    def iter_timelines(self, batch_size=500):
+        prefix = f'{self.prefix}session:'
+        keys = []
+        for key in self.client.scan_iter(match=f'{prefix}*'):
+            keys.append(key)
+            if len(keys) >= batch_size:
+                yield from self._fetch_timelines(keys, prefix)
+                keys = []
+        if keys:
+            yield from self._fetch_timelines(keys, prefix)
+
+    def _fetch_timelines(self, keys, prefix):
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hget(key, 'timeline')
+        for key, blob in zip(keys, pipe.execute()):
+            # 조회 사이에 만료된 세션은 건너뜀
+            if blob is not None:
+                yield _text(key)[len(prefix):], blob
+
+    def sweep(self, now=None):
+        # 만료는 Redis가 직접 처리
+        pass
+
+    def stats(self):
+        try:
+            info = self.client.info()
+        except Exception:  # INFO를 지원하지 않는 호환 서버/대역
+            info = {}
+        return {
+            'backend': 'redis',
+            'live_sessions': self.session_count(),
+            'memory_bytes': info.get('used_memory', 0),
+            'evictions': info.get('evicted_keys', 0),
+            'expirations': info.get('expired_keys', 0)
+        }
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def create_session_store(url=None, **limits):
+    """저장소 URL로 구현 선택 - memory://, sqlite:///경로, redis://호스트"""
+    url = url or 'memory://'
+    scheme = urlparse(url).scheme
+
+    if scheme == 'memory':
+        return MemorySessionStore(**limits)
+    if scheme == 'sqlite':
+        path = url[len('sqlite:///'):] if url.startswith('sqlite:///') else url[len('sqlite://'):]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return SQLiteSessionStore(path, **limits)
+    if scheme in ('redis', 'rediss', 'unix'):
+        return RedisSessionStore(url, **limits)
+
+    logging.warning(f"알 수 없는 세션 저장소 URL입니다: {url} - 메모리 저장소를 사용합니다.")
+    return MemorySessionStore(**limits)
@@ -107,19 +107,197 @@ function playCompleteSound() {
 // DOM 요소들 (DOMContentLoaded 후에 초기화됨)
 let elements = {};
 
+// 키 입력 배치 전송 설정
+const KEYSTROKE_BATCH_SIZE = 50;      // 이 개수만큼 모이면 즉시 전송
+const KEYSTROKE_FLUSH_MS = 2000;      // 이 시간이 지나면 모인 만큼 전송
+const KEYSTROKE_MAX_BATCH = 500;      // 요청 한 번에 보낼 최대 개수 (서버의 MAX_KEYSTROKE_BATCH와 같아야 함)
+let keystrokeBuffer = [];             // 아직 전송하지 않은 키 입력 시각 (ms)
+let keystrokeSeq = 0;                 // 마지막으로 배정한 배치 번호 (전송 중인 배치 포함)
+let keystrokeRetry = null;            // 실패해서 다시 보낼 배치 {seq, times} - 같은 번호로 보내 중복 저장 방지
+let keystrokeFlushTimer = null;
+let keystrokeFlushPromise = null;     // 전송 중인 요청 (동시에 하나만 전송)
+
 // 타이핑 활동 기록
 function recordKeystroke() {
-    // 서버에 키스트로크 기록 (비동기로 전송)
-    fetch('/api/keystroke', {
+    keystrokeBuffer.push(Date.now());
+    
+    if (keystrokeBuffer.length >= KEYSTROKE_BATCH_SIZE) {
+        flushKeystrokes();
+    } else if (!keystrokeFlushTimer) {
+        keystrokeFlushTimer = setTimeout(flushKeystrokes, KEYSTROKE_FLUSH_MS);
+    }
+}
+
+// 버퍼의 키 입력 시각을 델타 인코딩하여 배치 전송
+function encodeKeystrokeBatch(seq, times) {
+    const deltas = times.map((t, i) => i === 0 ? 0 : t - times[i - 1]);
+    return {
+        seq: seq,
+        base: times[0],
+        deltas: deltas,
+        sent_at: Date.now()
+    };
+}
+
+function flushKeystrokes() {
+    if (keystrokeFlushTimer) {
+        clearTimeout(keystrokeFlushTimer);
+        keystrokeFlushTimer = null;
+    }
+    
+    // 이전 전송이 끝난 뒤 이어서 전송 (순서 보장)
+    if (keystrokeFlushPromise) {
+        return keystrokeFlushPromise.then(() => keystrokeBuffer.length ? flushKeystrokes() : undefined);
+    }
+    
+    // 실패한 배치를 먼저 다시 보내고, 새 배치는 서버 한도 이하로 잘라서 번호를 배정
+    let batch = keystrokeRetry;
+    keystrokeRetry = null;
+    if (!batch) {
+        if (keystrokeBuffer.length === 0) {
+            return Promise.resolve();
+        }
+        batch = {
+            seq: ++keystrokeSeq,
+            times: keystrokeBuffer.splice(0, Math.min(keystrokeBuffer.length, KEYSTROKE_MAX_BATCH))
+        };
+    }
+    
+    keystrokeFlushPromise = fetch('/api/keystrokes', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ timestamp: Date.now() })
-    }).catch(error => {
-        // 조용히 실패 처리 (사용자 경험 방해 안 함)
+        body: JSON.stringify(encodeKeystrokeBatch(batch.seq, batch.times))
+    })
+    .then(response => {
+        if (response.status === 400 || response.status === 401) {
+            // 잘못된 배치나 만료된 세션은 다시 보내도 실패하므로 버림
+            console.log('키스트로크 배치 거부:', response.status);
+            return;
+        }
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+    })
+    .catch(error => {
+        // 조용히 실패 처리하고 같은 번호로 다시 시도 (사용자 경험 방해 안 함)
         console.log('키스트로크 기록 실패:', error);
+        keystrokeRetry = batch;
+    })
+    .finally(() => {
+        keystrokeFlushPromise = null;
+        // 남은 배치(재시도 또는 한도를 넘어 남은 키 입력)는 잠시 뒤 이어서 전송
+        if ((keystrokeRetry || keystrokeBuffer.length) && !keystrokeFlushTimer) {
+            keystrokeFlushTimer = setTimeout(flushKeystrokes, KEYSTROKE_FLUSH_MS);
+        }
     });
+    
+    return keystrokeFlushPromise;
+}
+
+// 버퍼가 빌 때까지 배치를 이어서 전송 (전송에 실패하면 멈추고 재시도는 타이머에 맡김)
+function flushAllKeystrokes() {
+    return flushKeystrokes().then(() => keystrokeBuffer.length && !keystrokeRetry ? flushAllKeystrokes() : undefined);
 }
 
+// 키 입력 기록 (저장할 때 함께 보내 서버가 다시 입력해 보며 채점)
+// 형식: uint16 리틀 엔디언 [버전, 첫 텍스트 번호] + [이전 입력 후 경과 ms, 문자 코드] 반복
+const KEYLOG_VERSION = 1;
+const KEYLOG_BACKSPACE = 8;           // 마지막 문자 삭제
+const KEYLOG_MAX_DELTA_MS = 0xFFFF;
+let keylogUnits = [];                 // [경과 ms, 문자 코드, 경과 ms, 문자 코드, ...]
+let keylogFirstText = 0;              // 연습을 시작한 텍스트 번호
+let keylogLastTime = null;
+let keylogText = '';                  // 마지막으로 기록한 입력창 내용
+
+function resetKeylog() {
+    keylogUnits = [];
+    keylogFirstText = textIndex;
+    keylogLastTime = startTime;
+    keylogText = '';
+}
+
+// 입력창 변경을 삭제/추가 문자로 나누어 기록 (앞부분이 같은 만큼은 그대로 둠)
+function logInputChange(value) {
+    let common = 0;
+    const limit = Math.min(keylogText.length, value.length);
+    while (common < limit && keylogText[common] === value[common]) {
+        common++;
+    }
+    
+    const now = Date.now();
+    let delta = Math.max(0, Math.min(now - keylogLastTime, KEYLOG_MAX_DELTA_MS));
+    keylogLastTime = now;
+    for (let i = keylogText.length; i > common; i--) {
+        keylogUnits.push(delta, KEYLOG_BACKSPACE);
+        delta = 0;
+    }
+    for (let i = common; i < value.length; i++) {
+        keylogUnits.push(delta, value.charCodeAt(i));
+        delta = 0;
+    }
+    keylogText = value;
+}
+
+function encodeKeylog() {
+    const view = new DataView(new ArrayBuffer((keylogUnits.length + 2) * 2));
+    view.setUint16(0, KEYLOG_VERSION, true);
+    view.setUint16(2, keylogFirstText, true);
+    keylogUnits.forEach((unit, i) => view.setUint16((i + 2) * 2, unit, true));
+    
+    // base64 변환 (긴 배열은 나눠서 문자열로)
+    const bytes = new Uint8Array(view.buffer);
+    let binary = '';
+    for (let i = 0; i < bytes.length; i += 0x8000) {
+        binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+    }
+    return btoa(binary);
+}
+
+// 연습 텍스트는 세션 seed로 묶음 단위로 받음 (서버가 채점할 때 같은 텍스트를 다시 만듦)
+const TEXT_BATCH_SIZE = 20;           // 서버의 MAX_PRACTICE_TEXT_COUNT와 같아야 함
+let textIndex = -1;                   // 현재 텍스트 번호
+let textBatches = {};                 // {묶음 번호: 텍스트 배열 Promise}
+
+function fetchPracticeText(index) {
+    const batch = Math.floor(index / TEXT_BATCH_SIZE);
+    if (!textBatches[batch]) {
+        const seed = encodeURIComponent(`${window.textSeed}:${batch}`);
+        textBatches[batch] = fetch(`/api/practice-text/${window.currentMode}?seed=${seed}&count=${TEXT_BATCH_SIZE}`)
+            .then(response => response.json())
+            .then(data => {
+                if (!data.success) {
+                    throw new Error(data.error || '연습 텍스트를 불러올 수 없습니다.');
+                }
+                return data.texts;
+            })
+            .catch(error => {
+                delete textBatches[batch];
+                throw error;
+            });
+    }
+    
+    // 묶음 끝이 가까우면 다음 묶음을 미리 받아 둠
+    if (index % TEXT_BATCH_SIZE >= TEXT_BATCH_SIZE - 3 && !textBatches[batch + 1]) {
+        fetchPracticeText((batch + 1) * TEXT_BATCH_SIZE).catch(() => {});
+    }
+    return textBatches[batch].then(texts => texts[index % TEXT_BATCH_SIZE]);
+}
+
+// 페이지를 떠날 때 남은 키 입력 전송
+// (전송 중인 요청과 겹치지 않도록 새 배치 번호를 배정하고, 서버 한도 이하로 나눠 보냄)
+window.addEventListener('pagehide', function() {
+    if (!navigator.sendBeacon) return;
+    const batches = keystrokeRetry ? [keystrokeRetry] : [];
+    keystrokeRetry = null;
+    while (keystrokeBuffer.length > 0) {
+        batches.push({ seq: ++keystrokeSeq, times: keystrokeBuffer.splice(0, KEYSTROKE_MAX_BATCH) });
+    }
+    batches.forEach(batch => {
+        const payload = JSON.stringify(encodeKeystrokeBatch(batch.seq, batch.times));
+        navigator.sendBeacon('/api/keystrokes', new Blob([payload], { type: 'application/json' }));
+    });
+});
+
 // 페이지 로드 시 초기화
 document.addEventListener('DOMContentLoaded', function() {
     // DOM 요소들 초기화
@@ -250,37 +428,30 @@ function loadPracticeText() {
         return;
     }
     
-    // API에서 연습 텍스트 가져오기
-    fetch(`/api/practice-text/${window.currentMode}`)
-        .then(response => response.json())
-        .then(data => {
-            if (data.success) {
-                // 자리 연습의 경우 줄바꿈 문자 제거
-                if (window.currentMode === '자리') {
-                    currentText = data.text.replace(/\n/g, ' ').replace(/\s+/g, ' ').trim();
-                } else {
-                    currentText = data.text;
-                }
-                
-                // 새로운 텍스트가 로드될 때 점수 변수 초기화
-                accumulatedScore = 0;
-                completedWords = [];
-                lastScoredWordIndex = -1;
-                
-                // UI 점수 표시도 초기화
-                if (elements.score) elements.score.textContent = '0';
-                
-
-                
-                renderPracticeText();
+    // API에서 다음 번호의 연습 텍스트 가져오기
+    textIndex++;
+    fetchPracticeText(textIndex)
+        .then(text => {
+            // 자리 연습의 경우 줄바꿈 문자 제거
+            if (window.currentMode === '자리') {
+                currentText = text.replace(/\n/g, ' ').replace(/\s+/g, ' ').trim();
             } else {
-                elements.practiceText.textContent = '연습 텍스트를 불러올 수 없습니다.';
-                console.error('API 오류:', data.error);
+                currentText = text;
             }
+            
+            // 새로운 텍스트가 로드될 때 점수 변수 초기화
+            accumulatedScore = 0;
+            completedWords = [];
+            lastScoredWordIndex = -1;
+            
+            // UI 점수 표시도 초기화
+            if (elements.score) elements.score.textContent = '0';
+            
+            renderPracticeText();
         })
         .catch(error => {
             elements.practiceText.textContent = '연습 텍스트를 불러오는 중 오류가 발생했습니다.';
-            console.error('네트워크 오류:', error);
+            console.error('연습 텍스트 오류:', error);
         });
 }
 
@@ -513,6 +684,7 @@ function actuallyStartPractice() {
     // 타이머 시작
     startTime = Date.now();
     isTimerRunning = true;
+    resetKeylog();
     timeRemaining = 300; // 5분
     
     practiceTimer = setInterval(updateTimer, 1000);
@@ -540,6 +712,9 @@ function updateTimer() {
 
 function handleUserInput() {
     userTypedText = elements.userInput.value;
+    if (isTimerRunning) {
+        logInputChange(userTypedText);
+    }
     
     // 실시간 하이라이트 업데이트
     updateTextHighlight();
@@ -620,6 +795,7 @@ function updateTextHighlight() {
 
 function updateStats() {
     const elapsedTime = (Date.now() - startTime) / 1000 / 60; // 분 단위
+    // 지금 입력 중인 텍스트 기준 (저장된 기록과 비교할 수 있도록 기존 공식 유지 - 서버 재생 채점도 같음)
     const typedChars = userTypedText.length;
     const correctChars = getCorrectCharCount();
     
@@ -851,6 +1027,9 @@ function endPractice() {
     elements.timer.textContent = '0:00';
     elements.timer.style.color = 'var(--bs-danger)';
     
+    // 남은 키 입력 전송
+    flushAllKeystrokes();
+    
     // 마지막 미완성 단어도 점수 계산 (부분 점수)
     calculateFinalPartialScore();
     
@@ -987,20 +1166,30 @@ function saveRecord() {
         accuracy: parseFloat(elements.accuracy.textContent.replace('%', '')) || 0,
         score: parseInt(elements.score.textContent) || 0,
         duration_sec: Math.floor(elapsedTime),  // 실제 경과 시간
-        practice_token: window.practiceToken     // 보안 토큰 추가
+        practice_token: window.practiceToken,    // 보안 토큰 추가
+        keylog: encodeKeylog()                   // 서버 재생 채점용 키 입력 기록
     };
     
-    // API로 저장 요청
-    fetch('/api/records', {
+    // 남은 키 입력을 먼저 전송한 뒤 API로 저장 요청
+    flushAllKeystrokes()
+    .then(() => fetch('/api/records', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
         body: JSON.stringify(recordData)
-    })
+    }))
     .then(response => response.json())
+    .then(data => data.queued ? waitForPersistence(data) : data)
     .then(data => {
         if (data.success) {
+            // 서버가 키 입력 기록으로 다시 계산해 저장한 값 표시
+            if (data.wpm !== undefined) {
+                elements.wpm.textContent = data.wpm;
+                elements.accuracy.textContent = `${data.accuracy}%`;
+                elements.score.textContent = data.score;
+            }
+            
             // 성공 모달 표시
             const completeModal = bootstrap.Modal.getInstance(elements.completeModal);
             if (completeModal) {
@@ -1027,6 +1216,29 @@ function saveRecord() {
     });
 }
 
+// 대기열로 접수된 기록이 DB에 저장될 때까지 상태 확인
+const PERSISTENCE_POLL_MS = 1000;
+const PERSISTENCE_MAX_POLLS = 15;
+
+function waitForPersistence(data, attempt = 0) {
+    return new Promise(resolve => setTimeout(resolve, PERSISTENCE_POLL_MS))
+        .then(() => fetch(data.status_url))
+        .then(response => response.json())
+        .then(status => {
+            if (status.status === 'done') {
+                return { ...data, success: true, id: status.record_id };
+            }
+            if (status.status === 'failed' || !status.success) {
+                return { success: false, error: status.error || '기록 저장에 실패했습니다.' };
+            }
+            if (attempt + 1 >= PERSISTENCE_MAX_POLLS) {
+                // 서버 스풀에 안전하게 접수되었으므로 잠시 후 랭킹에 반영됨
+                return data;
+            }
+            return waitForPersistence(data, attempt + 1);
+        });
+}
+
 // 유틸리티 함수들
 function formatTime(seconds) {
     const minutes = Math.floor(seconds / 60);
@@ -1314,6 +1526,7 @@ function checkTextCompletion() {
         // 입력창 완전 클리어 및 커서 위치 초기화
         elements.userInput.value = '';
         userTypedText = '';
+        keylogText = '';
         elements.userInput.setSelectionRange(0, 0);
         
         // 새로운 텍스트 로드
@@ -1328,21 +1541,16 @@ function loadNextPracticeText() {
     // 로딩 표시
     elements.practiceText.textContent = '다음 텍스트를 불러오는 중...';
     
-    // API에서 새로운 연습 텍스트 가져오기
-    fetch(`/api/practice-text/${window.currentMode}`)
-        .then(response => response.json())
-        .then(data => {
-            if (data.success) {
-                currentText = data.text;
-                renderPracticeText();
-            } else {
-                elements.practiceText.textContent = '다음 텍스트를 불러올 수 없습니다.';
-                console.error('API 오류:', data.error);
-            }
+    // 다음 번호의 연습 텍스트 (대부분 미리 받아 둔 묶음에서 바로 꺼냄)
+    textIndex++;
+    fetchPracticeText(textIndex)
+        .then(text => {
+            currentText = text;
+            renderPracticeText();
         })
         .catch(error => {
             elements.practiceText.textContent = '텍스트를 불러오는 중 오류가 발생했습니다.';
-            console.error('네트워크 오류:', error);
+            console.error('연습 텍스트 오류:', error);
         });
 }
 
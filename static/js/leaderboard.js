@@ -4,6 +4,22 @@ class Leaderboard {
         this.currentMode = '자리';
         this.modes = ['자리', '낱말', '문장', '문단'];
         this.viewMode = 'top10'; // 'top10' 또는 'all'
+        this.pageSize = 100; // 전체 보기에서 한 번에 불러올 기록 수
+        this.pages = {}; // 모드별 전체 보기 페이지 상태 {records, nextCursor, loading}
+        
+        // Top10 실시간 갱신 (서버가 SSE를 켠 경우에만)
+        this.streamEnabled = Boolean(window.leaderboardStream) && 'EventSource' in window;
+        this.stream = null; // 현재 EventSource
+        this.streamRecords = null; // 스트림으로 받은 현재 상위 기록
+        this.streamVersion = null; // 현재 상위 기록의 랭킹 버전
+        this.streamRetryDelay = 1000; // 재연결 대기 시간 (실패할 때마다 두 배, 최대 30초)
+        this.streamRetryTimer = null;
+        
+        // 서버가 Top10을 미리 렌더링한 모드 (첫 표시 때는 API를 다시 부르지 않음)
+        this.prerendered = new Set(
+            Array.from(document.querySelectorAll('#modeTabContent [data-prerendered]'))
+                .map(pane => pane.id.replace(/-pane$/, ''))
+        );
         
         this.init();
     }
@@ -34,6 +50,15 @@ class Leaderboard {
     }
 
     async loadModeData(mode) {
+        // 이전 모드/보기의 실시간 연결 정리
+        this.closeStream();
+        
+        // 서버가 렌더링한 Top10은 그대로 쓰고 이후 변경분만 받음
+        if (this.viewMode === 'top10' && this.prerendered.delete(mode)) {
+            this.openStream(mode);
+            return;
+        }
+        
         try {
             const loadingEl = document.getElementById(`${mode}-loading`);
             const contentEl = document.getElementById(`${mode}-content`);
@@ -47,15 +72,13 @@ class Leaderboard {
             emptyEl.style.display = 'none';
             tbodyEl.innerHTML = '';
 
-            // API 호출 (Top10 또는 전체)
+            // API 호출 (Top10 또는 전체 보기 첫 페이지)
             let response;
             if (this.viewMode === 'top10') {
                 response = await fetch(`/api/records/top?mode=${encodeURIComponent(mode)}`);
             } else {
-                // 전체 보기 모드에서는 모든 기록을 가져옴
-                const limit = 10000; // 충분히 큰 수로 모든 기록 확보
-                const offset = 0;
-                response = await fetch(`/api/records?mode=${encodeURIComponent(mode)}&limit=${limit}&offset=${offset}`);
+                // 전체 보기는 첫 페이지만 불러오고 스크롤 시 커서로 이어서 불러옴
+                response = await fetch(`/api/records?mode=${encodeURIComponent(mode)}&limit=${this.pageSize}&format=columnar`);
             }
             
             if (!response.ok) {
@@ -63,7 +86,7 @@ class Leaderboard {
             }
             
             const data = await response.json();
-            const records = data.records || [];
+            const records = this.parseRecords(data);
             const pagination = data.pagination;
 
             // 기록 수 업데이트
@@ -79,7 +102,15 @@ class Leaderboard {
                 emptyEl.style.display = 'block';
             } else {
                 // 테이블 채우기
-                this.renderRecords(tbodyEl, records);
+                const rankedRecords = this.renderRecords(tbodyEl, records);
+                
+                if (this.viewMode === 'all') {
+                    this.pages[mode] = {
+                        records: rankedRecords,
+                        nextCursor: pagination ? pagination.next_cursor : null,
+                        loading: false
+                    };
+                }
                 
                 loadingEl.style.display = 'none';
                 contentEl.style.display = 'block';
@@ -90,12 +121,26 @@ class Leaderboard {
                     tableContainer.style.maxHeight = '600px';
                     tableContainer.style.overflowY = 'auto';
                     tableContainer.classList.add('dashboard-scroll');
+                    
+                    // 스크롤이 끝에 가까워지면 다음 페이지 로드
+                    tableContainer.onscroll = () => {
+                        const remaining = tableContainer.scrollHeight - tableContainer.scrollTop - tableContainer.clientHeight;
+                        if (remaining < 200) {
+                            this.loadNextPage(mode);
+                        }
+                    };
                 } else {
+                    tableContainer.onscroll = null;
                     tableContainer.style.maxHeight = 'none';
                     tableContainer.style.overflowY = 'visible';
                     tableContainer.classList.remove('dashboard-scroll');
                 }
             }
+            
+            // Top10 보기는 이후 변경분을 서버에서 받아 갱신
+            if (this.viewMode === 'top10') {
+                this.openStream(mode);
+            }
 
         } catch (error) {
             console.error(`${mode} 모드 데이터 로딩 실패:`, error);
@@ -118,6 +163,152 @@ class Leaderboard {
         }
     }
 
+    parseRecords(data) {
+        // format=columnar 응답 {columns, data: {열: 값 배열}}을 기록 객체 배열로 변환
+        if (!data.data) return data.records || [];
+        const columns = data.columns;
+        const count = columns.length ? data.data[columns[0]].length : 0;
+        const records = new Array(count);
+        for (let i = 0; i < count; i++) {
+            const record = {};
+            columns.forEach((column) => {
+                record[column] = data.data[column][i];
+            });
+            records[i] = record;
+        }
+        return records;
+    }
+
+    async loadNextPage(mode) {
+        const page = this.pages[mode];
+        if (!page || page.loading || !page.nextCursor || this.viewMode !== 'all') return;
+        
+        page.loading = true;
+        try {
+            const response = await fetch(`/api/records?mode=${encodeURIComponent(mode)}&limit=${this.pageSize}&after=${encodeURIComponent(page.nextCursor)}&format=columnar`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            
+            const data = await response.json();
+            const records = this.parseRecords(data);
+            
+            // 이전 페이지에 이어서 등수 계산 후 행 추가
+            const tbodyEl = document.getElementById(`${mode}-tbody`);
+            const rankedRecords = this.calculateRanks(records, page.records);
+            rankedRecords.forEach((record) => {
+                tbodyEl.appendChild(this.createRecordRow(record));
+            });
+            
+            page.records = page.records.concat(rankedRecords);
+            page.nextCursor = data.pagination ? data.pagination.next_cursor : null;
+        } catch (error) {
+            console.error(`${mode} 모드 다음 페이지 로딩 실패:`, error);
+        } finally {
+            page.loading = false;
+        }
+    }
+
+    openStream(mode) {
+        if (!this.streamEnabled) return;
+        this.closeStream();
+        
+        const source = new EventSource(`/api/records/stream?mode=${encodeURIComponent(mode)}`);
+        this.stream = source;
+        
+        source.addEventListener('open', () => {
+            this.streamRetryDelay = 1000;
+        });
+        
+        // 연결 직후 현재 상위 기록 전체
+        source.addEventListener('snapshot', (event) => {
+            const data = JSON.parse(event.data);
+            this.streamRecords = data.records;
+            this.streamVersion = data.version;
+            this.renderStreamRecords(mode, []);
+        });
+        
+        // 기록이 저장될 때마다 순위 변경분
+        source.addEventListener('delta', (event) => {
+            this.applyDelta(mode, JSON.parse(event.data));
+        });
+        
+        source.addEventListener('error', () => {
+            // 연결이 정상 종료되면 브라우저가 retry 간격 뒤 자동으로 다시 연결함
+            // 서버 오류 등으로 완전히 닫힌 경우에만 간격을 늘려 가며 직접 다시 연결
+            if (source.readyState !== EventSource.CLOSED || this.stream !== source) return;
+            this.stream = null;
+            this.streamRetryTimer = setTimeout(() => {
+                this.streamRetryTimer = null;
+                if (this.viewMode === 'top10' && this.currentMode === mode) {
+                    this.openStream(mode);
+                }
+            }, this.streamRetryDelay);
+            this.streamRetryDelay = Math.min(this.streamRetryDelay * 2, 30000);
+        });
+    }
+
+    closeStream() {
+        if (this.streamRetryTimer) {
+            clearTimeout(this.streamRetryTimer);
+            this.streamRetryTimer = null;
+        }
+        if (this.stream) {
+            this.stream.close();
+            this.stream = null;
+        }
+        this.streamRecords = null;
+        this.streamVersion = null;
+    }
+
+    applyDelta(mode, delta) {
+        // 스냅샷 전이거나 이미 반영한 버전이면 무시
+        if (this.streamRecords === null || delta.version <= this.streamVersion) return;
+        
+        const recordsById = new Map(this.streamRecords.map(record => [record.id, record]));
+        delta.inserted.forEach(item => recordsById.set(item.record.id, item.record));
+        const records = delta.order.map(id => recordsById.get(id));
+        
+        // 모르는 기록이 있으면 (중간 변경을 놓침) 다시 연결해서 스냅샷부터 받음
+        if (records.some(record => record === undefined)) {
+            this.openStream(mode);
+            return;
+        }
+        
+        this.streamRecords = records;
+        this.streamVersion = delta.version;
+        this.renderStreamRecords(mode, delta.inserted.map(item => item.position));
+    }
+
+    // highlightPositions: 새로 들어온 기록의 위치 (잠시 강조)
+    renderStreamRecords(mode, highlightPositions) {
+        const loadingEl = document.getElementById(`${mode}-loading`);
+        const contentEl = document.getElementById(`${mode}-content`);
+        const emptyEl = document.getElementById(`${mode}-empty`);
+        const tbodyEl = document.getElementById(`${mode}-tbody`);
+        const countEl = document.getElementById(`${mode}-count`);
+        
+        countEl.textContent = this.streamRecords.length;
+        loadingEl.style.display = 'none';
+        if (this.streamRecords.length === 0) {
+            contentEl.style.display = 'none';
+            emptyEl.style.display = 'block';
+            return;
+        }
+        
+        this.renderRecords(tbodyEl, this.streamRecords);
+        emptyEl.style.display = 'none';
+        contentEl.style.display = 'block';
+        
+        highlightPositions.forEach((position) => {
+            const row = tbodyEl.children[position];
+            if (row) {
+                row.classList.add('table-success');
+                setTimeout(() => row.classList.remove('table-success'), 3000);
+            }
+        });
+    }
+
     renderRecords(tbody, records) {
         tbody.innerHTML = '';
         
@@ -128,23 +319,27 @@ class Leaderboard {
             const row = this.createRecordRow(record);
             tbody.appendChild(row);
         });
+        
+        return rankedRecords;
     }
 
-    calculateRanks(records) {
+    // previous: 앞 페이지까지의 등수 계산된 기록 (이어서 계산할 때)
+    calculateRanks(records, previous = []) {
         const rankedRecords = [];
-        let currentRank = 1;
+        const offset = previous.length;
+        let currentRank = offset > 0 ? previous[offset - 1].rank : 1;
         
         for (let i = 0; i < records.length; i++) {
             const record = records[i];
             
             // 이전 기록과 비교하여 등수 결정
-            if (i > 0) {
-                const prevRecord = records[i - 1];
+            const prevRecord = i > 0 ? records[i - 1] : previous[offset - 1];
+            if (prevRecord) {
                 // 점수, 정확도, WPM이 모두 다르면 등수 증가
                 if (record.score !== prevRecord.score || 
                     record.accuracy !== prevRecord.accuracy || 
                     record.wpm !== prevRecord.wpm) {
-                    currentRank = i + 1;
+                    currentRank = offset + i + 1;
                 }
             }
             
@@ -217,6 +412,8 @@ class Leaderboard {
 
     toggleViewMode() {
         this.viewMode = this.viewMode === 'top10' ? 'all' : 'top10';
+        // 보기를 바꾸면 표 내용이 달라지므로 서버 렌더링 결과는 더 쓰지 않음
+        this.prerendered.clear();
         
         // 현재 활성 탭 다시 로드
         this.loadModeData(this.currentMode);
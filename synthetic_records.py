@@ -0,0 +1,217 @@
+"""대량 합성 기록 생성과 일괄 적재 (개발/벤치마크용)
+
+실제 규모(수백만 건)에서 랭킹/통계 조회를 재 보기 위한 records 행을 만든다.
+
+- 학번: ID_PATTERN 형식(학년 1자리 + 반 2자리 + 번호 2자리 + 공백 + 한글 이름 2~4자)
+- 네 연습 모드 모두, 학생마다 모드별 실력(속도/정확도)이 있고 학기 동안 조금씩 늘어남
+- 점수는 validate_data_integrity()의 공식과 같고, 비현실적인 조합은 같은 기준으로 잘라냄
+- 날짜는 start~end 사이 평일 수업 시간(KST, naive)에 날짜 순으로 배치 (id 순서 ≈ 시간 순서)
+
+행은 numpy로 배치(batch_size행 안팎, 하루 단위) 단위로 만들고, PostgreSQL이면 COPY, 그 밖의 DB는
+DBAPI executemany로 배치마다 적재/커밋한다. 보조 인덱스는 적재 뒤 한 번에 다시 만들 수 있다.
+통계 요약/최고 기록/랭킹 버전 갱신은 호출자가 한 번에 다시 계산한다.
+
+numpy가 필요하다 (pip install '.[bench]').
+"""
+import csv
+import io
+import math
+from datetime import timedelta
+
+RECORD_COLUMNS = ('student_id', 'mode', 'wpm', 'accuracy', 'score', 'duration_sec', 'created_at')
+MODE_WEIGHTS = {'자리': 0.55, '낱말': 0.25, '문장': 0.12, '문단': 0.08}
+MODE_SPEED = {'자리': 1.0, '낱말': 0.9, '문장': 0.8, '문단': 0.7}  # 자리 연습 대비 속도
+GRADES = 3
+STUDENTS_PER_CLASS = 30
+MAX_STUDENTS = GRADES * 99 * STUDENTS_PER_CLASS  # 반 번호는 2자리
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍전고문양손배백허유남심노하곽성차주우구민진나지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용'
+COMPOUND_SURNAMES = ('남궁', '황보', '제갈', '선우', '독고')
+GIVEN_SYLLABLES = '민서지현준도윤하은수예우주원시연유진채성영호재건승아다태나혜정동희가인소율리한결'
+CLASS_HOURS = (9, 16)  # 기록 시각 범위 (시)
+DEFAULT_BATCH_SIZE = 50000
+
+# validate_data_integrity()와 같은 범위
+MAX_WPM = 500
+FAST_WPM_LIMIT = (85, 300)  # 정확도가 85%를 넘으면 300타 이하
+CARELESS_WPM_LIMIT = (50, 200)  # 정확도가 50% 미만이면 200타 이하
+DURATION_RANGE = (300, 1200)
+
+
+def make_student_id(index, rng):
+    """index번째 학생 학번 (1학년 1반 1번부터 반마다 STUDENTS_PER_CLASS명)"""
+    class_index, number = divmod(index, STUDENTS_PER_CLASS)
+    grade = class_index % GRADES + 1
+    class_number = class_index // GRADES + 1
+    surname = rng.choice(COMPOUND_SURNAMES) if rng.random() < 0.01 else rng.choice(SURNAMES)
+    given = ''.join(rng.choice(GIVEN_SYLLABLES) for _ in range(1 if rng.random() < 0.05 else 2))
+    return f'{grade}{class_number:02d}{number + 1:02d} {surname}{given}'
+
+
+def make_students(count, rng):
+    """학생별 (학번, {모드: (기본 속도, 기본 오타율)}) 목록"""
+    if not 1 <= count <= MAX_STUDENTS:
+        raise ValueError(f'학생 수는 1~{MAX_STUDENTS}명이어야 합니다.')
+    students = []
+    for index in range(count):
+        # 기본 속도는 로그정규 (중앙값 약 70타), 오타율은 학생마다 2~20% 정도
+        speed = rng.lognormvariate(math.log(70), 0.45)
+        error_rate = min(rng.lognormvariate(math.log(6), 0.55), 45)
+        skills = {mode: (speed * factor * rng.uniform(0.9, 1.1), error_rate * rng.uniform(0.9, 1.2))
+                  for mode, factor in MODE_SPEED.items()}
+        students.append((make_student_id(index, rng), skills))
+    return students
+
+
+def require_numpy():
+    """numpy 모듈 (없으면 RuntimeError) - 행 생성을 배치 단위 벡터 연산으로 함"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("합성 기록 생성에는 numpy 패키지가 필요합니다 (pip install '.[bench]').")
+    return numpy
+
+
+def school_days(start, end):
+    """start 이상 end 미만 평일 목록"""
+    days = []
+    day = start
+    while day < end:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def day_chunks(count, day_total, batch_size):
+    """하루 단위로 묶은 (첫 날 번호, 날짜별 기록 수 목록) - 하루가 두 배치에 걸치지 않게 (시간 순서 유지)"""
+    chunk_start, chunk, chunk_rows = 0, [], 0
+    produced = 0
+    for day_index in range(day_total):
+        # 남은 기록을 남은 날짜에 고르게 나눔
+        day_count = (count - produced) // (day_total - day_index)
+        produced += day_count
+        if chunk and chunk_rows + day_count > batch_size:
+            yield chunk_start, chunk
+            chunk_start, chunk, chunk_rows = day_index, [], 0
+        chunk.append(day_count)
+        chunk_rows += day_count
+    if chunk_rows:
+        yield chunk_start, chunk
+
+
+def generate_batches(count, students, start, end, seed=None, batch_size=DEFAULT_BATCH_SIZE):
+    """count개 기록을 배치(행 튜플 목록, RECORD_COLUMNS 순서)로 생성 - 날짜 순
+
+    created_at은 SQLAlchemy가 저장하는 형식의 문자열이다 (SQLite는 문자열 정렬로 비교하므로
+    자릿수를 고정하고, PostgreSQL COPY도 그대로 읽음). numpy나 기간 오류는 적재를 시작하기 전에
+    바로 예외로 알린다.
+    """
+    np = require_numpy()
+    days = school_days(start, end)
+    if not days:
+        raise ValueError('기간 안에 평일이 없습니다.')
+    rng = np.random.default_rng(seed)
+    modes = list(MODE_WEIGHTS)
+    student_ids = [student_id for student_id, _ in students]
+    speeds = np.array([[skills[mode][0] for mode in modes] for _, skills in students])
+    error_rates = np.array([[skills[mode][1] for mode in modes] for _, skills in students])
+    class_start = np.array([day.replace(hour=CLASS_HOURS[0], minute=0, second=0, microsecond=0) for day in days],
+                           dtype='datetime64[us]')
+    class_length_us = (CLASS_HOURS[1] - CLASS_HOURS[0]) * 3600 * 1000000
+    cumulative_weights = np.cumsum(list(MODE_WEIGHTS.values()))
+
+    def batches():
+        for first_day, day_counts in day_chunks(count, len(days), batch_size):
+            size = sum(day_counts)
+            day_index = np.repeat(np.arange(first_day, first_day + len(day_counts)), day_counts)
+            # 날짜별 수업 시간 안의 무작위 시각 - 정렬해서 id 순서가 시간 순서가 되게
+            offsets = rng.integers(0, class_length_us, size).astype('timedelta64[us]')
+            created_at = np.sort(class_start[day_index] + offsets)
+            student = rng.integers(0, len(student_ids), size)
+            mode = np.searchsorted(cumulative_weights, rng.random(size) * cumulative_weights[-1], side='right')
+
+            growth = 1 + 0.25 * day_index / len(days)  # 학기 진행에 따라 실력 향상 (최대 약 25%)
+            wpm = (speeds[student, mode] * growth * rng.lognormal(0, 0.15, size)).astype(np.int64)
+            wpm = np.clip(wpm, 1, MAX_WPM)
+            errors = error_rates[student, mode] * rng.lognormal(0, 0.3, size)
+            accuracy = np.maximum(np.round(100 - errors, 1), 30.0)
+            wpm = np.where(accuracy > FAST_WPM_LIMIT[0], np.minimum(wpm, FAST_WPM_LIMIT[1]), wpm)
+            wpm = np.where(accuracy < CARELESS_WPM_LIMIT[0], np.minimum(wpm, CARELESS_WPM_LIMIT[1]), wpm)
+            # validate_data_integrity()와 같은 점수 공식 (round와 np.round 모두 짝수 반올림)
+            score = np.round(wpm * ((accuracy / 100) ** 2) * 100).astype(np.int64)
+            # 5분 연습 + 학번 입력 시간
+            duration_sec = DURATION_RANGE[0] + (rng.random(size) * rng.random(size) * 120).astype(np.int64)
+
+            yield list(zip(
+                [student_ids[index] for index in student.tolist()],
+                [modes[index] for index in mode.tolist()],
+                wpm.tolist(), accuracy.tolist(), score.tolist(), duration_sec.tolist(),
+                [value.replace('T', ' ') for value in np.datetime_as_string(created_at, unit='us').tolist()]
+            ))
+
+    return batches()
+
+
+def _copy_batch(cursor, table, batch):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(batch)
+    buffer.seek(0)
+    sql = f"COPY {table} ({', '.join(RECORD_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    if hasattr(cursor, 'copy_expert'):  # psycopg2
+        cursor.copy_expert(sql, buffer)
+    else:  # psycopg 3
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _insert_sql(table, paramstyle):
+    placeholder = {'qmark': '?', 'format': '%s', 'pyformat': '%s'}.get(paramstyle)
+    if placeholder is None:
+        raise RuntimeError(f'지원하지 않는 DB 드라이버 파라미터 형식입니다: {paramstyle}')
+    return f"INSERT INTO {table} ({', '.join(RECORD_COLUMNS)}) VALUES ({', '.join([placeholder] * len(RECORD_COLUMNS))})"
+
+
+def bulk_load(engine, batches, table='records', progress=None, deferred_indexes=()):
+    """행 튜플 배치를 차례로 적재 (PostgreSQL은 COPY, 그 밖은 executemany) - 적재한 행 수 반환
+
+    progress(적재한 행 수)는 배치를 커밋할 때마다 호출된다. deferred_indexes(SQLAlchemy Index)는
+    적재 전에 지우고 끝난 뒤(실패해도) 다시 만든다 - 행마다 인덱스를 갱신하는 것보다 한 번에 정렬해
+    만드는 편이 훨씬 빠르지만, 그동안 이 인덱스를 쓰는 조회는 느려진다.
+    """
+    for index in deferred_indexes:
+        with engine.begin() as connection:
+            index.drop(connection, checkfirst=True)
+    try:
+        return _load_batches(engine, batches, table, progress)
+    finally:
+        for index in deferred_indexes:
+            with engine.begin() as connection:
+                index.create(connection, checkfirst=True)
+        # 플래너 통계 갱신 (대량 적재 직후 랭킹 쿼리가 인덱스를 쓰도록)
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'ANALYZE {table}')
+
+
+def _load_batches(engine, batches, table, progress):
+    loaded = 0
+    use_copy = engine.dialect.name == 'postgresql'
+    insert_sql = None if use_copy else _insert_sql(table, engine.dialect.paramstyle)
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for batch in batches:
+            if use_copy:
+                _copy_batch(cursor, table, batch)
+            else:
+                cursor.executemany(insert_sql, batch)
+            connection.commit()
+            loaded += len(batch)
+            if progress is not None:
+                progress(loaded)
+        cursor.close()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return loaded
@@ -0,0 +1,127 @@
+"""키 입력 간격 이상 패턴 점수 (NumPy)
+
+세션 타임라인의 최근 입력 간격(링 버퍼)으로 사람이 친 것 같지 않은 리듬을 찾는다.
+직렬화된 타임라인 여러 개를 (세션 수, RING_SIZE) 행렬 하나로 읽어 모든 특징을 행 단위
+벡터 연산으로 한 번에 계산하므로, 세션 하나를 검사할 때와 저장소 전체를 훑을 때
+같은 코드를 쓴다.
+
+특징
+- cv: 간격 표준편차 / 평균 (일정한 간격의 스크립트는 0에 가까움)
+- entropy: 로그 구간(10ms~3초)별 간격 분포의 정규화 엔트로피 (0~1)
+- burst_ratio / pause_ratio: 평균의 BURST_FACTOR배보다 짧은 / PAUSE_FACTOR배보다 긴 간격 비율
+- mean_burst_length: 짧은 간격이 연속된 구간의 평균 길이
+
+numpy는 가져오는 데 시간이 걸리므로 처음 점수를 계산할 때 불러온다.
+"""
+from keystroke_timeline import RING_SIZE, SERIALIZED_FIELDS, KeystrokeTimeline
+
+MIN_INTERVALS = 50  # 이보다 간격이 적으면 판단하지 않음
+MIN_CV = 0.2  # 사람의 입력 간격 변동계수는 보통 0.4 이상
+MIN_ENTROPY = 0.35
+MIN_RHYTHM_RATIO = 0.02  # 빠른 연타와 멈춤을 합친 최소 비율
+BURST_FACTOR = 0.6
+PAUSE_FACTOR = 3.0
+ENTROPY_BINS = 24
+ENTROPY_RANGE_MS = (10, 3000)
+BATCH_ROWS = 2048  # 한 번에 행렬로 만들 세션 수 (메모리 사용량 제한)
+
+_numpy = None
+_dtype = None
+_bin_table = None
+
+
+def require_numpy():
+    """numpy 모듈 (없으면 RuntimeError)"""
+    global _numpy, _dtype, _bin_table
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise RuntimeError("키 입력 이상 패턴 검사를 사용하려면 numpy 패키지가 필요합니다 (pip install '.[anomaly]').")
+        _dtype = numpy.dtype(list(SERIALIZED_FIELDS))
+        if _dtype.itemsize != KeystrokeTimeline.nbytes():
+            raise RuntimeError('타임라인 직렬화 형식이 이상 패턴 검사와 맞지 않습니다.')
+        # ms 정수 -> 로그 구간 번호 (ENTROPY_RANGE_MS 밖은 양 끝 구간)
+        low, high = numpy.log(ENTROPY_RANGE_MS)
+        table = (numpy.log(numpy.maximum(numpy.arange(ENTROPY_RANGE_MS[1] + 1), 1)) - low) * ENTROPY_BINS / (high - low)
+        _bin_table = numpy.clip(table, 0, ENTROPY_BINS - 1).astype(numpy.int64)
+        _numpy = numpy
+    return _numpy
+
+
+def timeline_features(blobs):
+    """직렬화된 타임라인 목록의 특징 - {특징 이름: 세션별 배열}"""
+    np = require_numpy()
+    empty = KeystrokeTimeline().to_bytes()
+    data = np.frombuffer(b''.join(blob or empty for blob in blobs), dtype=_dtype)
+    rows = len(data)
+
+    # 링 버퍼의 유효 간격: 아직 한 바퀴를 돌지 않았으면 앞쪽 n개(나머지 칸은 0), 돌았으면 전체
+    # (순서를 다시 맞추지 않으므로 연타 구간 수는 링 버퍼 경계에서 하나 더 셀 수 있음)
+    n = np.minimum(np.maximum(data['count'].astype(np.int64) - 1, 0), RING_SIZE)
+    ring = data['ring']
+    intervals = ring.astype(np.float64)
+    mask = np.arange(RING_SIZE) < n[:, None]
+    divisor = np.maximum(n, 1)
+
+    # 빈 칸은 0이므로 마스크 없이 합/제곱합으로 평균과 분산 계산
+    mean = intervals.sum(axis=1) / divisor
+    squares = np.einsum('ij,ij->i', intervals, intervals)
+    variance = np.maximum(squares - n * mean * mean, 0.0) / np.maximum(n - 1, 1)
+    cv = np.divide(np.sqrt(variance), mean, out=np.zeros(rows), where=mean > 0)
+
+    # 로그 구간 분포 엔트로피 - ms 정수를 조회표로 구간 번호로 바꾸고, 행 번호를 더해 bincount 한 번
+    bins = _bin_table[np.minimum(ring, ENTROPY_RANGE_MS[1])]
+    counts = np.bincount(
+        (np.arange(rows)[:, None] * ENTROPY_BINS + bins)[mask], minlength=rows * ENTROPY_BINS
+    ).reshape(rows, ENTROPY_BINS)
+    share = counts / divisor[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropy = np.where(share > 0, share * np.log(1 / share), 0.0).sum(axis=1) / np.log(ENTROPY_BINS)
+
+    burst = (intervals < mean[:, None] * BURST_FACTOR) & mask
+    pause = intervals > mean[:, None] * PAUSE_FACTOR
+    burst_count = burst.sum(axis=1)
+    burst_runs = burst[:, 0].astype(np.int64) + (burst[:, 1:] & ~burst[:, :-1]).sum(axis=1)
+
+    return {
+        'intervals': n,
+        'mean_ms': mean,
+        'cv': cv,
+        'entropy': entropy,
+        'burst_ratio': burst_count / divisor,
+        'pause_ratio': pause.sum(axis=1) / divisor,
+        'mean_burst_length': burst_count / np.maximum(burst_runs, 1)
+    }
+
+
+def anomaly_reasons(features):
+    """특징 배열에서 이상 사유별 세션 마스크 - {사유: bool 배열}"""
+    enough = features['intervals'] >= MIN_INTERVALS
+    return {
+        'low_variation': enough & (features['cv'] < MIN_CV),
+        'low_entropy': enough & (features['entropy'] < MIN_ENTROPY),
+        'flat_rhythm': enough & (features['burst_ratio'] + features['pause_ratio'] < MIN_RHYTHM_RATIO)
+    }
+
+
+def score_blobs(blobs):
+    """직렬화된 타임라인 여러 개의 점수 - 입력 순서대로 결과 딕셔너리 목록"""
+    results = []
+    for offset in range(0, len(blobs), BATCH_ROWS):
+        features = timeline_features(blobs[offset:offset + BATCH_ROWS])
+        reasons = anomaly_reasons(features)
+        columns = {name: values.tolist() for name, values in features.items()}
+        flags = {name: values.tolist() for name, values in reasons.items()}
+        for row in range(len(columns['intervals'])):
+            row_reasons = [name for name, values in flags.items() if values[row]]
+            result = {name: round(values[row], 3) for name, values in columns.items()}
+            result['reasons'] = row_reasons
+            result['suspicious'] = bool(row_reasons)
+            results.append(result)
+    return results
+
+
+def score_timeline(timeline):
+    """KeystrokeTimeline 하나의 점수"""
+    return score_blobs([timeline.to_bytes()])[0]
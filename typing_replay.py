@@ -0,0 +1,145 @@
+"""키 입력 기록 재생 채점
+
+클라이언트가 연습 중 입력창에 들어간 문자와 입력 간격을 고정 폭 이진 기록으로 보내면,
+서버가 발급한 연습 텍스트에 다시 입력해 보며 WPM, 정확도, 점수를 직접 계산한다.
+
+기록 형식 (리틀 엔디언 uint16):
+    헤더  [버전, 첫 텍스트 번호]
+    이벤트 [이전 입력 후 경과 ms (최대 65535), UTF-16 코드 단위] * N
+코드 단위 8(백스페이스)은 마지막 문자 삭제를 뜻한다. 입력 길이가 텍스트 길이에 닿으면
+클라이언트와 같이 입력창을 비우고 다음 텍스트로 넘어간다.
+
+디코딩은 array, 재생은 백스페이스 사이의 구간 단위 문자열 연산, 정타 수 비교는
+문자열 접두사 비교(틀린 글자가 있는 텍스트만 map(operator.eq))로 처리해 파이썬 반복이
+문자 수가 아니라 백스페이스와 텍스트 수에 비례한다.
+"""
+import math
+import operator
+import sys
+from array import array
+
+KEYLOG_VERSION = 1
+BACKSPACE = '\b'
+MAX_DELTA_MS = 0xFFFF  # 이보다 긴 간격은 이 값으로 잘라서 기록
+MAX_KEYLOG_EVENTS = 20000  # 5분 동안 나올 수 없는 입력 수 (요청 크기 제한)
+HEADER_UNITS = 2
+
+
+class KeylogError(ValueError):
+    """형식이 잘못된 키 입력 기록"""
+
+
+def decode_keylog(data):
+    """이진 기록 해석 - (첫 텍스트 번호, 입력 간격 배열(ms), 입력 문자열)"""
+    if len(data) < HEADER_UNITS * 2 or len(data) % 4:
+        raise KeylogError('키 입력 기록의 길이가 올바르지 않습니다.')
+    units = array('H')
+    units.frombytes(data)
+    if sys.byteorder == 'big':
+        units.byteswap()
+    if units[0] != KEYLOG_VERSION:
+        raise KeylogError('지원하지 않는 키 입력 기록 버전입니다.')
+    if (len(units) - HEADER_UNITS) // 2 > MAX_KEYLOG_EVENTS:
+        raise KeylogError('키 입력 기록이 너무 깁니다.')
+
+    events = units[HEADER_UNITS:]
+    typed = events[1::2].tobytes()
+    if sys.byteorder == 'big':
+        typed = array('H', typed)
+        typed.byteswap()
+        typed = typed.tobytes()
+    return units[1], events[0::2], typed.decode('utf-16-le', 'replace')
+
+
+def replay(typed, text_at, first_index=0):
+    """입력 문자열을 텍스트에 다시 입력 - 텍스트별 최종 입력 [(텍스트, 입력), ...]
+
+    text_at(번호)는 번호별로 발급된 연습 텍스트를 반환해야 한다.
+    """
+    index = first_index
+    text = text_at(index)
+    buffer = ''
+    results = []
+    for position, segment in enumerate(typed.split(BACKSPACE)):
+        if position:
+            # 구간 사이마다 백스페이스 한 번 (빈 입력창에서는 효과 없음)
+            buffer = buffer[:-1]
+        while segment:
+            needed = len(text) - len(buffer)
+            if len(segment) < needed:
+                buffer += segment
+                break
+            # 텍스트 끝까지 입력 - 입력창을 비우고 다음 텍스트로
+            results.append((text, buffer + segment[:needed]))
+            segment = segment[needed:]
+            buffer = ''
+            index += 1
+            text = text_at(index)
+    if buffer:
+        results.append((text, buffer))
+    return results
+
+
+def correct_chars(text, entry):
+    """같은 위치의 글자가 맞은 수 (틀린 글자가 없으면 문자열 비교 한 번으로 끝냄)"""
+    if text.startswith(entry):
+        return len(entry)
+    return sum(map(operator.eq, text, entry))
+
+
+def banded_wpm(chars_per_minute):
+    """분당 정타 수를 화면에 표시하는 타수로 보정 (클라이언트 updateStats와 같은 구간)"""
+    if chars_per_minute <= 0:
+        return 0
+    if chars_per_minute <= 10:
+        factor = 8
+    elif chars_per_minute <= 20:
+        factor = 6
+    elif chars_per_minute <= 40:
+        factor = 4
+    elif chars_per_minute <= 65:
+        factor = 3
+    else:
+        factor = 2.5
+    return max(30, _round_half_up(chars_per_minute * factor))
+
+
+def _round_half_up(value):
+    """JavaScript Math.round와 같은 반올림"""
+    return int(math.floor(value + 0.5))
+
+
+def score_keylog(data, text_at, elapsed_sec):
+    """키 입력 기록 채점 - wpm, accuracy, score와 근거 수치
+
+    elapsed_sec: WPM 계산에 쓰는 연습 시간 (초). 기록의 입력 시각이 이 시간을 넘으면 KeylogError.
+
+    WPM/정확도는 저장된 기록, 개인 최고 기록과 비교할 수 있도록 클라이언트의 기존 공식을 그대로
+    따른다: 마지막으로 입력 중이던 텍스트의 정타 수 / 연습 시간(분), 정확도도 그 텍스트 기준.
+    correct_chars/typed_chars는 연습 전체 합계(참고용)다.
+    """
+    first_index, deltas, typed = decode_keylog(data)
+    span_ms = sum(deltas)
+    if span_ms > elapsed_sec * 1000 + MAX_DELTA_MS:
+        raise KeylogError('키 입력 기록이 연습 시간을 벗어났습니다.')
+
+    results = replay(typed, text_at, first_index)
+    typed_chars = sum(len(entry) for _, entry in results)
+    correct = sum(correct_chars(text, entry) for text, entry in results)
+
+    last_text, last_entry = results[-1] if results else ('', '')
+    last_correct = correct_chars(last_text, last_entry)
+    minutes = elapsed_sec / 60
+    wpm = banded_wpm(last_correct / minutes) if minutes > 0.1 else 0
+    accuracy = _round_half_up(last_correct / len(last_entry) * 100) if last_entry else 100
+    score = round(max(0, wpm) * ((accuracy / 100) ** 2) * 100)
+    return {
+        'wpm': wpm,
+        'accuracy': float(accuracy),
+        'score': score,
+        'correct_chars': correct,
+        'typed_chars': typed_chars,
+        'keystrokes': len(deltas),
+        'texts': len(results),
+        'span_ms': span_ms
+    }
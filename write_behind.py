@@ -0,0 +1,277 @@
+"""기록 저장 write-behind 큐
+
+검증을 통과한 기록을 로컬 SQLite(WAL) 스풀 파일에 먼저 내구성 있게 적어 두고 바로
+응답한 뒤, 백그라운드 작성기가 모아서 본 DB에 일괄 저장한다. 수업 끝에 학생들이
+동시에 저장해도 DB 커넥션 풀을 기다리지 않는다.
+
+같은 스풀 파일을 여러 워커가 공유할 수 있다. 작성기는 행을 먼저 선점(claim)한 뒤
+저장하고, 저장 도중 워커가 죽어 선점이 오래되면 다른 작성기가 다시 가져간다.
+본 DB 쪽에서는 티켓 번호로 중복 저장을 막아야 한다 (flush 함수의 책임).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from sqlalchemy import exc
+
+DEFAULT_BATCH_SIZE = 50  # 한 번에 본 DB에 저장할 기록 수
+DEFAULT_INTERVAL = 0.5  # 대기 기록이 없을 때 확인 간격 (초)
+DEFAULT_CLAIM_TIMEOUT = 60  # 이 시간 안에 끝나지 않은 선점은 다시 가져감 (초)
+MAX_ATTEMPTS = 8  # 이 횟수만큼 실패하면 failed 상태로 둠 (DB 연결 오류는 세지 않고 계속 재시도)
+RETRY_BASE_DELAY = 1.0  # 재시도 대기 시간 (지수 증가, 초)
+MAX_RETRY_DELAY = 60.0  # 재시도 대기 시간 상한 (초)
+DONE_RETENTION = 24 * 3600  # 저장 완료 행 보관 시간 (상태 조회용, 초)
+
+# 본 DB에 닿지 못한 오류 - 기록 내용과 무관하므로 DB가 돌아올 때까지 재시도
+CONNECTION_ERRORS = (exc.OperationalError, exc.DisconnectionError, exc.TimeoutError)
+
+
+class RecordSpool:
+    """대기 기록 스풀 (상태: pending → writing → done / failed)"""
+
+    def __init__(self, path, claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+        self.path = path
+        self.claim_timeout = claim_timeout
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS pending_records (
+                ticket TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                claimed_at REAL,
+                record_id INTEGER,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_pending_records_status
+                ON pending_records (status, next_attempt_at);
+        """)
+
+    def _connection(self):
+        """스레드별 연결 (WAL 모드, 응답 전에 디스크에 남도록 synchronous=FULL)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=FULL')
+            self._local.conn = conn
+        return conn
+
+    def _write(self, func):
+        """쓰기 잠금을 먼저 잡은 트랜잭션에서 func(conn) 실행"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = func(conn)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return result
+
+    def enqueue(self, payload):
+        """기록 하나를 스풀에 저장하고 티켓 번호 반환"""
+        ticket = uuid.uuid4().hex
+        now = time.time()
+        self._write(lambda conn: conn.execute(
+            'INSERT INTO pending_records (ticket, payload, created_at, updated_at) VALUES (?, ?, ?, ?)',
+            (ticket, json.dumps(payload, ensure_ascii=False), now, now)
+        ))
+        return ticket
+
+    def claim(self, limit):
+        """저장할 기록을 최대 limit개 선점 - [(티켓, payload), ...]"""
+        now = time.time()
+
+        def claim_rows(conn):
+            rows = conn.execute(
+                "SELECT ticket, payload FROM pending_records "
+                "WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                "   OR (status = 'writing' AND claimed_at <= ?) "
+                "ORDER BY created_at LIMIT ?",
+                (now, now - self.claim_timeout, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE pending_records SET status = 'writing', claimed_at = ?, updated_at = ? WHERE ticket = ?",
+                [(now, now, ticket) for ticket, _ in rows]
+            )
+            return rows
+
+        return [(ticket, json.loads(payload)) for ticket, payload in self._write(claim_rows)]
+
+    def mark_done(self, record_ids):
+        """{티켓: 기록 id} 저장 완료 처리"""
+        now = time.time()
+        self._write(lambda conn: conn.executemany(
+            "UPDATE pending_records SET status = 'done', record_id = ?, error = NULL, updated_at = ? "
+            "WHERE ticket = ?",
+            [(record_id, now, ticket) for ticket, record_id in record_ids.items()]
+        ))
+
+    def mark_failed(self, tickets, error):
+        """저장 실패 - 재시도 예약 (MAX_ATTEMPTS를 넘으면 failed)"""
+        now = time.time()
+
+        def update(conn):
+            for ticket in tickets:
+                (attempts,) = conn.execute(
+                    'SELECT attempts FROM pending_records WHERE ticket = ?', (ticket,)
+                ).fetchone()
+                attempts += 1
+                status = 'failed' if attempts >= MAX_ATTEMPTS else 'pending'
+                delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+                conn.execute(
+                    'UPDATE pending_records SET status = ?, attempts = ?, next_attempt_at = ?, '
+                    'claimed_at = NULL, error = ?, updated_at = ? WHERE ticket = ?',
+                    (status, attempts, now + delay, error, now, ticket)
+                )
+
+        self._write(update)
+
+    def postpone(self, tickets, error):
+        """본 DB 연결 실패 - 시도 횟수는 그대로 두고 다시 대기 (대기 간격은 기록이 쌓인 시간만큼, MAX_RETRY_DELAY 상한)"""
+        now = time.time()
+        self._write(lambda conn: conn.executemany(
+            "UPDATE pending_records SET status = 'pending', "
+            'next_attempt_at = ? + MIN(MAX(? - created_at, ?), ?), claimed_at = NULL, error = ?, updated_at = ? '
+            'WHERE ticket = ?',
+            [(now, now, RETRY_BASE_DELAY, MAX_RETRY_DELAY, error, now, ticket) for ticket in tickets]
+        ))
+
+    def requeue(self, tickets=None):
+        """failed 기록을 다시 대기 상태로 (원인을 고친 뒤 실행, tickets가 없으면 전체) - 되돌린 수 반환"""
+        now = time.time()
+        sql = ("UPDATE pending_records SET status = 'pending', attempts = 0, next_attempt_at = 0, "
+               "claimed_at = NULL, updated_at = ? WHERE status = 'failed'")
+        if tickets is None:
+            return self._write(lambda conn: conn.execute(sql, (now,)).rowcount)
+        return self._write(lambda conn: sum(
+            conn.execute(sql + ' AND ticket = ?', (now, ticket)).rowcount for ticket in tickets
+        ))
+
+    def status(self, ticket):
+        """티켓 상태 (없으면 None)"""
+        row = self._connection().execute(
+            'SELECT status, attempts, record_id, error, created_at, updated_at '
+            'FROM pending_records WHERE ticket = ?', (ticket,)
+        ).fetchone()
+        if row is None:
+            return None
+        status, attempts, record_id, error, created_at, updated_at = row
+        return {
+            'ticket': ticket,
+            'status': status,
+            'attempts': attempts,
+            'record_id': record_id,
+            'error': error,
+            'created_at': created_at,
+            'updated_at': updated_at
+        }
+
+    def counts(self):
+        """상태별 기록 수"""
+        return dict(self._connection().execute(
+            'SELECT status, COUNT(*) FROM pending_records GROUP BY status'
+        ).fetchall())
+
+    def purge(self, retention=DONE_RETENTION):
+        """오래된 저장 완료 행 정리"""
+        cutoff = time.time() - retention
+        self._write(lambda conn: conn.execute(
+            "DELETE FROM pending_records WHERE status = 'done' AND updated_at <= ?", (cutoff,)
+        ))
+
+
+class WriteBehindWriter:
+    """스풀에서 기록을 꺼내 flush(items)로 본 DB에 일괄 저장하는 백그라운드 스레드
+
+    flush([(티켓, payload), ...])는 {티켓: 기록 id}를 반환해야 한다. DB 연결 오류(CONNECTION_ERRORS)면
+    배치 전체를 상한이 있는 간격으로 계속 재시도하고, 그 밖의 오류면 기록마다 따로 다시 저장해서
+    잘못된 기록 하나 때문에 같은 배치의 다른 기록까지 실패로 남지 않게 한다.
+    """
+
+    def __init__(self, spool, flush, batch_size=DEFAULT_BATCH_SIZE, interval=DEFAULT_INTERVAL):
+        self.spool = spool
+        self.flush = flush
+        self.batch_size = batch_size
+        self.interval = interval
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._next_purge = 0.0
+
+    def start(self):
+        """작성기 스레드 시작 (이미 실행 중이면 무시, 여러 요청 스레드에서 동시에 불러도 됨)"""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+
+    def notify(self):
+        """새 기록이 들어왔음을 알려 대기 없이 바로 저장"""
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            try:
+                written = self.run_once()
+            except Exception as e:
+                logging.error(f"write-behind 저장 루프 오류: {e}")
+                written = 0
+            if written < self.batch_size:
+                # 남은 기록이 없으면 새 기록이나 재시도 시각까지 대기
+                self._wakeup.wait(self.interval)
+                self._wakeup.clear()
+
+    def run_once(self):
+        """한 배치 저장 - 저장한 기록 수 반환"""
+        now = time.time()
+        if now >= self._next_purge:
+            self._next_purge = now + 3600
+            self.spool.purge()
+
+        items = self.spool.claim(self.batch_size)
+        if not items:
+            return 0
+        try:
+            record_ids = self.flush(items)
+        except CONNECTION_ERRORS as e:
+            # 기록마다 다시 시도하면 연결 대기 시간이 기록 수만큼 쌓여 선점 시간을 넘기므로 배치째 미룸
+            logging.error(f"write-behind 본 DB 연결 실패 ({len(items)}건 재시도 예약): {e}")
+            self.spool.postpone([ticket for ticket, _ in items], str(e))
+            return 0
+        except Exception as e:
+            logging.error(f"write-behind 일괄 저장 실패 ({len(items)}건): {e}")
+            if len(items) == 1:
+                self.spool.mark_failed([items[0][0]], str(e))
+                return 0
+            record_ids = self._flush_each(items)
+        self.spool.mark_done(record_ids)
+        return len(record_ids)
+
+    def _flush_each(self, items):
+        """기록마다 따로 저장 - 실패한 기록만 재시도 예약하고 저장된 {티켓: 기록 id} 반환"""
+        record_ids = {}
+        for position, (ticket, payload) in enumerate(items):
+            try:
+                record_ids.update(self.flush([(ticket, payload)]))
+            except CONNECTION_ERRORS as e:
+                # 도중에 DB 연결이 끊기면 남은 기록은 따로 시도하지 않고 모두 미룸
+                logging.error(f"write-behind 본 DB 연결 실패 ({len(items) - position}건 재시도 예약): {e}")
+                self.spool.postpone([ticket for ticket, _ in items[position:]], str(e))
+                break
+            except Exception as e:
+                logging.error(f"write-behind 기록 저장 실패 ({ticket}): {e}")
+                self.spool.mark_failed([ticket], str(e))
+        return record_ids